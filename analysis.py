@@ -1,5 +1,5 @@
-import re
 from analyzers import (
+    ANALYZER_STAGES,
     check_contact_info,
     check_sections,
     check_work_experience,
@@ -13,33 +13,42 @@ from analyzers import (
     check_consistency,
     check_keyword_optimization,
 )
+from collections import Counter
+from config import ANALYZER_TIME_BUDGET
+from document import ResumeDocument
+from findings import Findings, finding_type
+from limits import TimeLimitExceeded, time_limit
+from metrics import NullTimer
 from tips import generate_tips
 
+CONFIDENCE_BULLETS = ("•", "●", "▪", "■", "–", "→", "◦", "‣", "►")
+CONFIDENCE_HEADINGS = frozenset(["work experience", "professional experience", "education",
+                                 "skills", "technical skills", "summary", "objective",
+                                 "certifications", "projects"])
 
-def _resume_confidence(text, text_lower):
-    """Score 0-1 indicating how likely this document is actually a resume."""
+
+def _confidence_features(doc):
+    matches = doc.matches
+    return {
+        "email": bool(matches.search("confidence_email")),
+        "phone": bool(matches.search("confidence_phone")),
+        "headings": sum(1 for _, _, keywords in doc.headings if keywords & CONFIDENCE_HEADINGS),
+        "date_ranges": len(matches.findall("confidence_date_range", "lower"))
+                       + len(matches.findall("confidence_year_range", "lower")),
+        "bullet_lines": sum(1 for l in doc.non_empty_lines_lower if l.startswith(CONFIDENCE_BULLETS)),
+    }
+
+
+def _confidence_score(features):
     signals = 0
     max_signals = 10
 
-    has_email = bool(re.search(r"[\w.+-]+\s*@\s*[\w-]+\s*\.\s*[\w.]+", text))
-    has_phone = bool(re.search(r"(?:\+?\d[\d\s\-().]{7,}\d)", text))
-    if has_email:
+    if features["email"]:
         signals += 1.5
-    if has_phone:
+    if features["phone"]:
         signals += 1.5
 
-    resume_headings = ["work experience", "professional experience", "education",
-                       "skills", "technical skills", "summary", "objective",
-                       "certifications", "projects"]
-    lines = text_lower.split("\n")
-    heading_count = 0
-    for line in lines:
-        stripped = line.strip().rstrip(":").strip()
-        if stripped and len(stripped) < 50:
-            for h in resume_headings:
-                if h in stripped:
-                    heading_count += 1
-                    break
+    heading_count = features["headings"]
     if heading_count >= 3:
         signals += 3
     elif heading_count >= 2:
@@ -47,17 +56,12 @@ def _resume_confidence(text, text_lower):
     elif heading_count >= 1:
         signals += 1
 
-    date_ranges = re.findall(
-        r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\w*\.?\s*\d{4}\s*[–\-—to]+",
-        text_lower)
-    year_ranges = re.findall(r"\b20\d{2}\s*[–\-—]\s*(?:20\d{2}|present|current)\b", text_lower)
-    if len(date_ranges) + len(year_ranges) >= 2:
+    if features["date_ranges"] >= 2:
         signals += 2
-    elif len(date_ranges) + len(year_ranges) >= 1:
+    elif features["date_ranges"] >= 1:
         signals += 1
 
-    bullet_chars = ["•", "●", "▪", "■", "–", "→", "◦", "‣", "►"]
-    bullet_lines = sum(1 for l in lines if any(l.strip().startswith(c) for c in bullet_chars))
+    bullet_lines = features["bullet_lines"]
     if bullet_lines >= 5:
         signals += 2
     elif bullet_lines >= 2:
@@ -66,32 +70,79 @@ def _resume_confidence(text, text_lower):
     return min(signals / max_signals, 1.0)
 
 
-def analyze_resume(text, num_pages, file_ext):
-    text_lower = text.lower()
-
-    confidence = _resume_confidence(text, text_lower)
-
-    checks = [
-        ("Contact Information", lambda: check_contact_info(text, text_lower)),
-        ("Resume Sections", lambda: check_sections(text_lower)),
-        ("Work Experience", lambda: check_work_experience(text, text_lower)),
-        ("Education", lambda: check_education(text, text_lower)),
-        ("Formatting & Structure", lambda: check_formatting(text, num_pages)),
-        ("ATS Compatibility", lambda: check_ats_compatibility(text, file_ext)),
-        ("Action Verbs", lambda: check_action_verbs(text_lower)),
-        ("Measurable Results", lambda: check_measurable_results(text, text_lower)),
-        ("Hard Skills", lambda: check_hard_skills(text_lower)),
-        ("Readability", lambda: check_readability(text)),
-        ("Writing Consistency", lambda: check_consistency(text)),
-        ("Keyword Optimization", lambda: check_keyword_optimization(text_lower)),
-    ]
+def _resume_confidence(doc):
+    """Score 0-1 indicating how likely this document is actually a resume."""
+    return _confidence_score(_confidence_features(doc))
+
+
+# (category, check, max score); the max is what a check that runs out of time is scored against.
+CHECKS = [
+    ("Contact Information", check_contact_info, 12),
+    ("Resume Sections", check_sections, 15),
+    ("Work Experience", check_work_experience, 12),
+    ("Education", check_education, 10),
+    ("Formatting & Structure", check_formatting, 13),
+    ("ATS Compatibility", check_ats_compatibility, 8),
+    ("Action Verbs", check_action_verbs, 10),
+    ("Measurable Results", check_measurable_results, 10),
+    ("Hard Skills", check_hard_skills, 12),
+    ("Readability", check_readability, 8),
+    ("Writing Consistency", check_consistency, 7),
+    ("Keyword Optimization", check_keyword_optimization, 10),
+]
+
+# Bump whenever any extract_features output changes; stored records with an
+# older version must be extracted again rather than rescored.
+FEATURE_VERSION = 2
+
+
+def _run_check(fn, doc):
+    """``fn(doc)`` within ANALYZER_TIME_BUDGET, or None if it ran out of time."""
+    try:
+        with time_limit(ANALYZER_TIME_BUDGET):
+            return fn(doc)
+    except TimeLimitExceeded:
+        return None
+
+
+def extract_features(doc, timer=None):
+    """Everything the scoring rules read from ``doc``, as a JSON-serialisable record.
+
+    This is the expensive half of the analysis. A check that runs out of time
+    has ``None`` features.
+    """
+    timer = timer or NullTimer()
+    with timer.stage("confidence"):
+        confidence = _confidence_features(doc)
+
+    checks = {}
+    for name, fn, _ in CHECKS:
+        with timer.stage(fn.__name__):
+            checks[name] = _run_check(ANALYZER_STAGES[fn.__name__][0], doc)
+
+    return {"version": FEATURE_VERSION, "confidence": confidence, "checks": checks}
+
+
+def score_features(record, timer=None):
+    """The analysis result for a record from ``extract_features``; no document needed."""
+    timer = timer or NullTimer()
+    confidence = _confidence_score(record["confidence"])
 
     total_score = 0
     total_max = 0
     categories = []
-
-    for name, fn in checks:
-        s, m, findings = fn()
+    timed_out = []
+
+    for name, fn, max_score in CHECKS:
+        features = record["checks"][name]
+        if features is None:
+            timed_out.append(name)
+            skipped = Findings()
+            skipped.add("warning", "check.timed_out")
+            outcome = 0, max_score, skipped
+        else:
+            outcome = ANALYZER_STAGES[fn.__name__][1](features)
+        s, m, findings = outcome
         total_score += s
         total_max += m
         pct = round((s / m) * 100) if m else 0
@@ -139,14 +190,18 @@ def analyze_resume(text, num_pages, file_ext):
     else:
         verdict = "Significant improvements needed. Your resume will likely be filtered out by most ATS systems. Start with the top recommendations."
 
-    tips = generate_tips(categories, overall, text_lower)
+    with timer.stage("tips"):
+        tips = generate_tips(categories, overall)
 
-    total_findings = sum(len(c["findings"]) for c in categories)
-    pass_count = sum(1 for c in categories for f in c["findings"] if f["type"] == "pass")
-    fail_count = sum(1 for c in categories for f in c["findings"] if f["type"] == "fail")
-    warn_count = sum(1 for c in categories for f in c["findings"] if f["type"] == "warning")
+    counts = Counter()
+    for cat in categories:
+        counts.update(cat["findings"].counts)
+    total_findings = sum(counts.values())
+    pass_count = counts["pass"]
+    fail_count = counts["fail"]
+    warn_count = counts["warning"]
 
-    return {
+    result = {
         "overall_score": overall,
         "verdict": verdict,
         "categories": categories,
@@ -162,3 +217,35 @@ def analyze_resume(text, num_pages, file_ext):
             "total_possible": total_max,
         }
     }
+    if timed_out:
+        result["timed_out"] = timed_out
+    return result
+
+
+def analyze_resume(doc, timer=None):
+    return score_features(extract_features(doc, timer), timer)
+
+
+def score_text(text, num_pages, file_ext, timer=None, layout_summary=None):
+    return score_document(ResumeDocument(text, num_pages, file_ext, layout_summary), timer)[0]
+
+
+def score_document(doc, timer=None):
+    """analyze_resume plus the file details returned by /api/check, and the feature record."""
+    record = extract_features(doc, timer)
+    result = score_features(record, timer)
+    result["file_type"] = doc.file_ext.upper()
+    result["word_count"] = len(doc.words)
+    result["page_count"] = doc.num_pages
+    return result, record
+
+
+def compact_result(result):
+    """``result`` without info-level findings or tip descriptions, for API and batch clients.
+
+    Returns a new dict; cached results are shared and left untouched.
+    """
+    categories = [{**cat, "findings": [f for f in cat["findings"] if finding_type(f) != "info"]}
+                  for cat in result["categories"]]
+    tips = [{"priority": tip["priority"], "title": tip["title"]} for tip in result["tips"]]
+    return {**result, "categories": categories, "tips": tips}
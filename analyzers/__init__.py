@@ -10,8 +10,28 @@ from .skills import check_hard_skills
 from .readability import check_readability
 from .consistency import check_consistency
 from .keywords import check_keyword_optimization
+from . import (compatibility, consistency, contact, education, experience, formatting,
+               keywords, readability, results, sections, skills, verbs)
+
+# Each check_* is score_features(extract_features(doc)) from its module; the
+# stages are exposed so features can be stored and rescored without the text.
+ANALYZER_STAGES = {
+    "check_contact_info": (contact.extract_features, contact.score_features),
+    "check_sections": (sections.extract_features, sections.score_features),
+    "check_work_experience": (experience.extract_features, experience.score_features),
+    "check_education": (education.extract_features, education.score_features),
+    "check_formatting": (formatting.extract_features, formatting.score_features),
+    "check_ats_compatibility": (compatibility.extract_features, compatibility.score_features),
+    "check_action_verbs": (verbs.extract_features, verbs.score_features),
+    "check_measurable_results": (results.extract_features, results.score_features),
+    "check_hard_skills": (skills.extract_features, skills.score_features),
+    "check_readability": (readability.extract_features, readability.score_features),
+    "check_consistency": (consistency.extract_features, consistency.score_features),
+    "check_keyword_optimization": (keywords.extract_features, keywords.score_features),
+}
 
 __all__ = [
+    "ANALYZER_STAGES",
     "check_contact_info",
     "check_sections",
     "check_work_experience",
@@ -1,51 +1,87 @@
-import re
 from constants import ATS_UNFRIENDLY_CHARS
+from findings import Findings
 
 
-def check_ats_compatibility(text, file_ext):
-    findings = []
+HEADER_FOOTER_KEYWORDS = ["page 1", "page 2", "page 3", "header", "footer",
+                          "confidential", "curriculum vitae"]
+
+
+def extract_features(doc):
+    text = doc.text
+    matches = doc.matches
+    features = {
+        "file_ext": doc.file_ext,
+        "special_chars": sum(1 for c in ATS_UNFRIENDLY_CHARS if c in text),
+        "layout": False,
+        "columns": None,
+        "tables": None,
+    }
+    layout = doc.layout_summary
+    if layout is None:
+        features["header_footer"] = sum(1 for kw in HEADER_FOOTER_KEYWORDS if kw in doc.lower)
+        features["images"] = len(matches.findall("image_reference"))
+    else:
+        # Lines in the real header/footer regions, and pictures in the file.
+        features.update(layout=True, header_footer=layout["header_footer"], images=layout["images"],
+                        columns=layout["columns"], tables=layout["tables"])
+    # PDFs do not mark tables, so they still go by the text.
+    features["table_indicators"] = len(matches.findall("table_layout")) if features["tables"] is None else 0
+    return features
+
+
+def score_features(features):
+    findings = Findings()
     score = 0
     max_score = 8
 
+    file_ext = features["file_ext"]
     if file_ext == "pdf":
         score += 2
-        findings.append({"type": "pass", "message": "PDF format — universally accepted by ATS systems"})
+        findings.add("pass", "compatibility.pdf")
     elif file_ext == "docx":
         score += 2
-        findings.append({"type": "pass", "message": "DOCX format — excellent ATS compatibility (preferred by many systems)"})
+        findings.add("pass", "compatibility.docx")
 
-    special_chars = [c for c in ATS_UNFRIENDLY_CHARS if c in text]
+    special_chars = features["special_chars"]
     if not special_chars:
         score += 2
-        findings.append({"type": "pass", "message": "No problematic special characters — clean text for ATS parsing"})
-    elif len(special_chars) <= 3:
+        findings.add("pass", "compatibility.special_chars_none")
+    elif special_chars <= 3:
         score += 1
-        findings.append({"type": "warning", "message": "Some special characters found that may not parse correctly in all ATS systems"})
+        findings.add("warning", "compatibility.special_chars_some")
     else:
-        findings.append({"type": "fail", "message": "Multiple special characters detected — replace symbols with standard text equivalents"})
+        findings.add("fail", "compatibility.special_chars_many")
 
-    header_footer_keywords = ["page 1", "page 2", "page 3", "header", "footer",
-                               "confidential", "curriculum vitae"]
-    found_hf = [kw for kw in header_footer_keywords if kw in text.lower()]
-    if not found_hf:
+    if not features["header_footer"]:
         score += 1.5
-        findings.append({"type": "pass", "message": "No headers/footers detected — ATS often misreads content in headers/footers"})
+        findings.add("pass", "compatibility.header_footer_none")
+    elif features["layout"]:
+        score += 0.5
+        findings.add("warning", "compatibility.header_footer_found", count=features["header_footer"])
     else:
         score += 0.5
-        findings.append({"type": "warning", "message": "Possible header/footer content — some ATS systems skip header/footer areas"})
+        findings.add("warning", "compatibility.header_footer_possible")
 
-    table_indicators = re.findall(r"\t{2,}|\s{4,}\S+\s{4,}\S+", text)
-    if len(table_indicators) > 5:
-        findings.append({"type": "warning", "message": "Possible table/column layout detected — ATS may scramble multi-column layouts; use single-column format"})
+    if features["columns"] and features["columns"] > 1:
+        findings.add("warning", "compatibility.columns", columns=features["columns"])
+    elif features["tables"]:
+        findings.add("warning", "compatibility.tables", count=features["tables"])
+    elif features["table_indicators"] > 5:
+        findings.add("warning", "compatibility.table_layout")
     else:
         score += 1.5
-        findings.append({"type": "pass", "message": "Layout appears ATS-friendly — no complex table structures detected"})
+        findings.add("pass", "compatibility.layout_ok")
 
-    image_indicators = re.findall(r"\[image\]|\[photo\]|\[logo\]|\.(?:png|jpg|jpeg|gif|svg)\b", text, re.IGNORECASE)
-    if image_indicators:
-        findings.append({"type": "warning", "message": "Image references detected — ATS cannot read images; ensure all info is in text form"})
-    else:
+    if not features["images"]:
         score += 1
-        findings.append({"type": "pass", "message": "No image-only content detected — all content is text-based and parseable"})
+        findings.add("pass", "compatibility.no_images")
+    elif features["layout"]:
+        findings.add("warning", "compatibility.images_found", count=features["images"])
+    else:
+        findings.add("warning", "compatibility.images")
 
     return round(min(score, max_score), 1), max_score, findings
+
+
+def check_ats_compatibility(doc):
+    return score_features(extract_features(doc))
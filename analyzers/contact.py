@@ -1,103 +1,118 @@
-import re
 from constants import UNPROFESSIONAL_EMAIL_WORDS
+from findings import Findings
+from patterns import PATTERNS
 
 
-def check_contact_info(text, text_lower):
-    findings = []
-    score = 0
-    max_score = 12
-
-    text_collapsed = re.sub(r"\s+", " ", text)
-    text_no_spaces = re.sub(r"\s+", "", text_lower)
+def extract_features(doc):
+    matches = doc.matches
 
-    email_match = re.search(r"[a-zA-Z0-9._%+\-]+\s*@\s*[a-zA-Z0-9.\-]+\.\s*[a-zA-Z]{2,}", text)
+    email_match = matches.search("email")
     if not email_match:
-        email_match = re.search(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}", text_collapsed)
-
-    phone_match = re.search(r"[\+]?[\d\s\-\(\)]{7,15}", text)
+        email_match = matches.search("email_strict", "collapsed")
 
     linkedin_match = (
-        re.search(r"linkedin\.com/in/[\w\-]+", text, re.IGNORECASE) or
-        re.search(r"linkedin\s*\.\s*com\s*/\s*in\s*/\s*[\w\-]+", text, re.IGNORECASE) or
-        re.search(r"linkedin\.com/in/[\w\-]+", text_collapsed, re.IGNORECASE) or
-        re.search(r"linkedin\.?com/?in/?[\w\-]+", text_no_spaces) or
-        re.search(r"\blinkedin\b", text_lower)
+        matches.search("linkedin_url") or
+        matches.search("linkedin_url_spaced") or
+        matches.search("linkedin_url", "collapsed") or
+        matches.search("linkedin_url_loose", "no_spaces") or
+        matches.search("linkedin_word", "lower")
     )
     linkedin_is_keyword_only = (
-        not re.search(r"linkedin\.com/in/[\w\-]+", text_collapsed, re.IGNORECASE)
-        and re.search(r"\blinkedin\b", text_lower)
+        not matches.search("linkedin_url", "collapsed")
+        and matches.search("linkedin_word", "lower")
     )
 
     github_match = (
-        re.search(r"github\.com/[\w\-]+", text, re.IGNORECASE) or
-        re.search(r"github\s*\.\s*com\s*/\s*[\w\-]+", text, re.IGNORECASE) or
-        re.search(r"github\.com/[\w\-]+", text_collapsed, re.IGNORECASE) or
-        re.search(r"github\.?com/?[\w\-]+", text_no_spaces) or
-        re.search(r"\bgithub\b", text_lower)
+        matches.search("github_url") or
+        matches.search("github_url_spaced") or
+        matches.search("github_url", "collapsed") or
+        matches.search("github_url_loose", "no_spaces") or
+        matches.search("github_word", "lower")
     )
     github_is_keyword_only = (
-        not re.search(r"github\.com/[\w\-]+", text_collapsed, re.IGNORECASE)
-        and re.search(r"\bgithub\b", text_lower)
+        not matches.search("github_url", "collapsed")
+        and matches.search("github_word", "lower")
     )
 
     website_match = (
-        re.search(r"(?:portfolio|website|http|www\.)\S+", text, re.IGNORECASE) or
-        re.search(r"(?:portfolio|website|http|www\.)\S+", text_collapsed, re.IGNORECASE) or
-        re.search(r"\b(?:portfolio|website)\b", text_lower)
+        matches.search("website_url") or
+        matches.search("website_url", "collapsed") or
+        matches.search("website_word", "lower")
     )
 
     location_match = (
-        re.search(r"\b(?:city|state|country|zip|located in|based in|remote|hybrid)\b", text_lower) or
-        re.search(r"\b[A-Z][a-z]+,\s*[A-Z]{2}\b", text) or
-        re.search(r"\b[A-Z][a-z]+,\s*[A-Z][a-z]+\b", text)
+        matches.search("location_word", "lower") or
+        matches.search("city_state") or
+        matches.search("city_country")
     )
 
-    if email_match:
+    return {
+        "email": PATTERNS["whitespace"].sub("", email_match.group()).lower() if email_match else None,
+        "phone": bool(matches.search("phone")),
+        "linkedin": bool(linkedin_match),
+        "linkedin_keyword_only": bool(linkedin_is_keyword_only),
+        "github": bool(github_match),
+        "github_keyword_only": bool(github_is_keyword_only),
+        "website": bool(website_match),
+        "location": bool(location_match),
+    }
+
+
+def score_features(features):
+    findings = Findings()
+    score = 0
+    max_score = 12
+
+    email_addr = features["email"]
+    if email_addr is not None:
         score += 3
-        email_addr = re.sub(r"\s+", "", email_match.group()).lower()
         domain = email_addr.split("@")[1] if "@" in email_addr else ""
         local = email_addr.split("@")[0] if "@" in email_addr else ""
 
         if any(w in local for w in UNPROFESSIONAL_EMAIL_WORDS):
-            findings.append({"type": "warning", "message": f"Email found ({email_addr}) but may seem unprofessional — use firstname.lastname format"})
+            findings.add("warning", "contact.email_unprofessional", email=email_addr)
         elif domain in ("gmail.com", "outlook.com", "yahoo.com", "hotmail.com", "protonmail.com"):
-            findings.append({"type": "pass", "message": f"Professional email found: {email_addr}"})
+            findings.add("pass", "contact.email_professional", email=email_addr)
         else:
-            findings.append({"type": "pass", "message": f"Email address found: {email_addr}"})
+            findings.add("pass", "contact.email_found", email=email_addr)
     else:
-        findings.append({"type": "fail", "message": "No email address found — this is critical for ATS systems to contact you"})
+        findings.add("fail", "contact.email_missing")
 
-    if phone_match:
+    if features["phone"]:
         score += 3
-        findings.append({"type": "pass", "message": "Phone number detected"})
+        findings.add("pass", "contact.phone_found")
     else:
-        findings.append({"type": "fail", "message": "No phone number found — recruiters need a way to call you"})
+        findings.add("fail", "contact.phone_missing")
 
-    if linkedin_match:
+    if features["linkedin"]:
         score += 2
-        if linkedin_is_keyword_only:
-            findings.append({"type": "pass", "message": "LinkedIn reference found (URL may be hyperlinked in original — PDF extraction can break links)"})
+        if features["linkedin_keyword_only"]:
+            findings.add("pass", "contact.linkedin_keyword")
         else:
-            findings.append({"type": "pass", "message": "LinkedIn profile URL detected"})
+            findings.add("pass", "contact.linkedin_url")
     else:
-        findings.append({"type": "warning", "message": "No LinkedIn URL — 87% of recruiters use LinkedIn; add your profile link"})
+        findings.add("warning", "contact.linkedin_missing")
 
-    if github_match:
+    if features["github"]:
         score += 2
-        if github_is_keyword_only:
-            findings.append({"type": "pass", "message": "GitHub reference found (URL may be hyperlinked in original — PDF extraction can break links)"})
+        if features["github_keyword_only"]:
+            findings.add("pass", "contact.github_keyword")
         else:
-            findings.append({"type": "pass", "message": "GitHub profile URL detected"})
-    elif website_match:
+            findings.add("pass", "contact.github_url")
+    elif features["website"]:
         score += 2
-        findings.append({"type": "pass", "message": "Portfolio/Website link detected"})
+        findings.add("pass", "contact.website_found")
     else:
-        findings.append({"type": "info", "message": "No portfolio/GitHub link — consider adding one to stand out"})
+        findings.add("info", "contact.portfolio_missing")
 
-    if location_match:
+    if features["location"]:
         score += 2
-        findings.append({"type": "pass", "message": "Location information detected"})
+        findings.add("pass", "contact.location_found")
     else:
-        findings.append({"type": "warning", "message": "No location detected — some employers filter by location, add city/state or 'Remote'"})
+        findings.add("warning", "contact.location_missing")
 
     return round(min(score, max_score), 1), max_score, findings
+
+
+def check_contact_info(doc):
+    return score_features(extract_features(doc))
@@ -1,86 +1,130 @@
-import re
+from findings import Findings
 
+# A font size counts once it sets this share of the text; smaller shares are
+# the odd footnote or symbol.
+FONT_SIZE_MIN_SHARE = 0.02
+MAX_FONT_SIZES = 4
+MIN_FONT_SIZE = 9
 
-def check_formatting(text, num_pages):
-    findings = []
+
+def _font_sizes(layout):
+    """Font sizes setting a real share of the text, smallest first; None without a layout."""
+    if layout is None:
+        return None
+    sizes = layout["font_sizes"]
+    total = sum(chars for _, chars in sizes)
+    return [size for size, chars in sizes if chars >= FONT_SIZE_MIN_SHARE * total]
+
+
+def extract_features(doc):
+    non_empty_lines = doc.non_empty_lines
+    matches = doc.matches
+    font_sizes = _font_sizes(doc.layout_summary)
+    return {
+        "num_pages": doc.num_pages,
+        "word_count": len(doc.words),
+        "lines": len(non_empty_lines),
+        "bullet_lines": len(doc.bullet_lines),
+        "years": len(matches.findall("year")),
+        "months": len(matches.findall("month")),
+        "present": len(matches.findall("present")),
+        "long_lines": sum(1 for l in non_empty_lines if len(l) > 120),
+        "caps_lines": sum(1 for l in non_empty_lines if l.isupper() and len(l) > 3),
+        "font_sizes": len(font_sizes) if font_sizes else None,
+        "min_font_size": font_sizes[0] if font_sizes else None,
+    }
+
+
+def score_features(features):
+    findings = Findings()
     score = 0
     max_score = 13
 
-    words = text.split()
-    word_count = len(words)
-    lines = text.strip().split("\n")
-    non_empty_lines = [l for l in lines if l.strip()]
+    num_pages = features["num_pages"]
+    word_count = features["word_count"]
 
     if num_pages == 1:
         score += 2
-        findings.append({"type": "pass", "message": "Single-page resume — ideal for most positions"})
+        findings.add("pass", "formatting.one_page")
     elif num_pages == 2:
         score += 2
-        findings.append({"type": "pass", "message": "Two-page resume — acceptable for experienced professionals"})
+        findings.add("pass", "formatting.two_pages")
     elif num_pages >= 3:
         score += 0.5
-        findings.append({"type": "warning", "message": f"{num_pages}-page resume detected — keep it to 1–2 pages unless you have 10+ years of experience"})
+        findings.add("warning", "formatting.too_many_pages", pages=num_pages)
 
     if 400 <= word_count <= 800:
         score += 2
-        findings.append({"type": "pass", "message": f"Optimal word count: {word_count} words (ideal range: 400–800)"})
+        findings.add("pass", "formatting.words_optimal", count=word_count)
     elif 300 <= word_count < 400:
         score += 1.5
-        findings.append({"type": "warning", "message": f"Slightly short ({word_count} words) — aim for 400–800 words to provide enough detail"})
+        findings.add("warning", "formatting.words_slightly_short", count=word_count)
     elif 800 < word_count <= 1100:
         score += 1.5
-        findings.append({"type": "warning", "message": f"Slightly long ({word_count} words) — consider trimming less relevant details"})
+        findings.add("warning", "formatting.words_slightly_long", count=word_count)
     elif word_count < 300:
         score += 0.5
-        findings.append({"type": "fail", "message": f"Too short ({word_count} words) — your resume needs more content to be competitive"})
+        findings.add("fail", "formatting.words_too_short", count=word_count)
     else:
         score += 0.5
-        findings.append({"type": "fail", "message": f"Too long ({word_count} words) — recruiters spend 7 seconds on initial scan, be concise"})
+        findings.add("fail", "formatting.words_too_long", count=word_count)
 
-    bullet_chars = ["•", "●", "▪", "■", "-", "–", "→", "*", "◦", "‣", "►"]
-    bullet_lines = sum(1 for l in non_empty_lines if any(l.strip().startswith(c) for c in bullet_chars))
-    bullet_ratio = bullet_lines / max(len(non_empty_lines), 1)
+    bullet_lines = features["bullet_lines"]
+    bullet_ratio = bullet_lines / max(features["lines"], 1)
 
     if bullet_ratio > 0.2:
         score += 3
-        findings.append({"type": "pass", "message": f"Excellent bullet point usage ({bullet_lines} bullet lines, {round(bullet_ratio * 100)}% of content)"})
+        findings.add("pass", "formatting.bullets_excellent", count=bullet_lines, percent=round(bullet_ratio * 100))
     elif bullet_ratio > 0.1:
         score += 2
-        findings.append({"type": "pass", "message": f"Good bullet usage ({bullet_lines} bullets) — could add a few more for readability"})
+        findings.add("pass", "formatting.bullets_good", count=bullet_lines)
     elif bullet_ratio > 0.03:
         score += 1
-        findings.append({"type": "warning", "message": f"Limited bullet points ({bullet_lines} found) — restructure experience as bullet points for better ATS parsing"})
+        findings.add("warning", "formatting.bullets_limited", count=bullet_lines)
     else:
-        findings.append({"type": "fail", "message": "Almost no bullet points — ATS systems and recruiters strongly prefer bulleted experience"})
+        findings.add("fail", "formatting.bullets_none")
 
-    year_dates = re.findall(r"\b(20\d{2}|19\d{2})\b", text)
-    month_names = re.findall(r"\b(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b", text, re.IGNORECASE)
-    date_ranges = re.findall(r"(?:present|current|ongoing)", text, re.IGNORECASE)
+    year_dates = features["years"]
+    month_names = features["months"]
 
     if year_dates and month_names:
         score += 3
-        findings.append({"type": "pass", "message": f"Proper date formatting ({len(year_dates)} years, {len(month_names)} months detected)"})
-        if date_ranges:
-            findings.append({"type": "pass", "message": "Current position indicated with 'Present' — ATS can parse employment timeline"})
+        findings.add("pass", "formatting.dates_proper", years=year_dates, months=month_names)
+        if features["present"]:
+            findings.add("pass", "formatting.dates_present")
     elif year_dates:
         score += 2
-        findings.append({"type": "warning", "message": f"Year dates found ({len(year_dates)}) but no month names — use 'Jan 2023 – Present' format for best ATS parsing"})
+        findings.add("warning", "formatting.dates_no_months", years=year_dates)
     else:
-        findings.append({"type": "fail", "message": "No date information detected — add employment and education dates (e.g., 'Sep 2021 – Jun 2024')"})
+        findings.add("fail", "formatting.dates_missing")
 
-    long_lines = sum(1 for l in non_empty_lines if len(l.strip()) > 120)
-    if long_lines > len(non_empty_lines) * 0.3:
+    long_lines = features["long_lines"]
+    if long_lines > features["lines"] * 0.3:
         score += 0.5
-        findings.append({"type": "warning", "message": f"{long_lines} very long lines detected — break up dense paragraphs into shorter bullet points"})
+        findings.add("warning", "formatting.long_lines", count=long_lines)
     else:
         score += 1.5
-        findings.append({"type": "pass", "message": "Content has good line-length distribution — readable for both ATS and humans"})
+        findings.add("pass", "formatting.line_length_ok")
 
-    caps_lines = sum(1 for l in non_empty_lines if l.strip().isupper() and len(l.strip()) > 3)
+    caps_lines = features["caps_lines"]
     if caps_lines > 6:
-        findings.append({"type": "warning", "message": f"Excessive ALL CAPS text ({caps_lines} lines) — use title case for headings instead"})
+        findings.add("warning", "formatting.excessive_caps", count=caps_lines)
     elif caps_lines > 0:
         score += 0.5
-        findings.append({"type": "pass", "message": "Appropriate use of capitalization for section headings"})
+        findings.add("pass", "formatting.caps_ok")
+
+    # Only known with a layout record; advice, not scored.
+    font_sizes = features["font_sizes"]
+    if font_sizes:
+        if font_sizes > MAX_FONT_SIZES:
+            findings.add("warning", "formatting.font_sizes_many", count=font_sizes)
+        else:
+            findings.add("pass", "formatting.fonts_consistent", count=font_sizes)
+        if features["min_font_size"] < MIN_FONT_SIZE:
+            findings.add("warning", "formatting.font_small", size=features["min_font_size"])
 
     return round(min(score, max_score), 1), max_score, findings
+
+
+def check_formatting(doc):
+    return score_features(extract_features(doc))
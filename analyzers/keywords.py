@@ -1,51 +1,55 @@
-from collections import Counter
-from constants import HARD_SKILLS, SOFT_SKILLS
+from findings import Findings
 
 
-def check_keyword_optimization(text_lower):
-    findings = []
+def extract_features(doc):
+    hits = doc.matches.keywords()
+    word_freq = doc.word_freq
+    # Keyword -> how often it appears as a word, in the order found.
+    return {"keywords": {kw: word_freq.get(kw, 0)
+                         for kw in set(hits.matched("hard_skills") + hits.matched("soft_skills"))}}
+
+
+def score_features(features):
+    findings = Findings()
     score = 0
     max_score = 10
 
-    all_keywords = []
-    for skills in HARD_SKILLS.values():
-        all_keywords.extend(skills)
-    for skills in SOFT_SKILLS.values():
-        all_keywords.extend(skills)
-
-    found_keywords = list(set(kw for kw in all_keywords if kw.lower() in text_lower))
+    word_freq = features["keywords"]
+    found_keywords = list(word_freq)
     keyword_count = len(found_keywords)
 
     if keyword_count >= 20:
         score = 10
-        findings.append({"type": "pass", "message": f"Outstanding keyword density — {keyword_count} ATS-relevant keywords detected"})
+        findings.add("pass", "keywords.outstanding", count=keyword_count)
     elif keyword_count >= 14:
         score = 8
-        findings.append({"type": "pass", "message": f"Strong keyword presence — {keyword_count} keywords that ATS systems scan for"})
+        findings.add("pass", "keywords.strong", count=keyword_count)
     elif keyword_count >= 8:
         score = 5
-        findings.append({"type": "warning", "message": f"Moderate keyword density ({keyword_count}) — tailor keywords to match specific job descriptions"})
+        findings.add("warning", "keywords.moderate", count=keyword_count)
     elif keyword_count >= 4:
         score = 3
-        findings.append({"type": "warning", "message": f"Low keyword density ({keyword_count}) — you may be filtered out by ATS keyword matching"})
+        findings.add("warning", "keywords.low", count=keyword_count)
     else:
-        findings.append({"type": "fail", "message": "Very few ATS keywords — your resume may not pass keyword-based screening"})
+        findings.add("fail", "keywords.very_few")
 
-    word_freq = Counter(text_lower.split())
     repeated_keywords = [(kw, word_freq.get(kw, 0)) for kw in found_keywords if word_freq.get(kw, 0) >= 3]
     repeated_keywords.sort(key=lambda x: x[1], reverse=True)
 
     if repeated_keywords:
         top = [f"{kw} ({count}x)" for kw, count in repeated_keywords[:5]]
-        findings.append({"type": "info", "message": f"Most emphasized keywords: {', '.join(top)}"})
+        findings.add("info", "keywords.top", keywords=", ".join(top))
 
     found_keywords.sort()
     chunk_size = 12
     for i in range(0, min(len(found_keywords), 24), chunk_size):
         chunk = found_keywords[i:i + chunk_size]
-        findings.append({"type": "info", "message": f"Keywords detected: {', '.join(chunk)}"})
+        findings.add("info", "keywords.detected", keywords=", ".join(chunk))
 
-    findings.append({"type": "info",
-                      "message": "Pro tip: Copy keywords directly from the job description you're applying to — ATS systems match exact phrases"})
+    findings.add("info", "keywords.pro_tip")
 
     return round(min(score, max_score), 1), max_score, findings
+
+
+def check_keyword_optimization(doc):
+    return score_features(extract_features(doc))
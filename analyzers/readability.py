@@ -1,62 +1,72 @@
-import re
+from findings import Findings
 
 
-def check_readability(text):
-    findings = []
+def extract_features(doc):
+    word_counts = doc.sentence_word_counts
+    words = doc.words_lower
+    return {
+        "sentences": len(word_counts),
+        "sentence_words": sum(word_counts),
+        "long_sentences": sum(1 for w in word_counts if w > 25),
+        "words": len(words),
+        "complex_words": sum(1 for w in words if len(w) > 12),
+        "long_paragraphs": sum(1 for p in doc.paragraphs if len(p.split()) > 60),
+    }
+
+
+def score_features(features):
+    findings = Findings()
     score = 0
     max_score = 8
 
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if len(s.strip().split()) > 2]
-
-    if not sentences:
-        findings.append({"type": "warning", "message": "Could not analyze sentence structure"})
+    if not features["sentences"]:
+        findings.add("warning", "readability.no_sentences")
         return 4, max_score, findings
 
-    word_counts = [len(s.split()) for s in sentences]
-    avg_sentence_len = sum(word_counts) / len(word_counts) if word_counts else 0
+    avg_sentence_len = features["sentence_words"] / features["sentences"]
 
     if 10 <= avg_sentence_len <= 20:
         score += 3
-        findings.append({"type": "pass", "message": f"Good sentence length — avg {round(avg_sentence_len, 1)} words per sentence (ideal: 10–20)"})
+        findings.add("pass", "readability.sentence_length_good", average=round(avg_sentence_len, 1))
     elif avg_sentence_len < 10:
         score += 2
-        findings.append({"type": "pass", "message": f"Concise writing — avg {round(avg_sentence_len, 1)} words per sentence (clear and scannable)"})
+        findings.add("pass", "readability.sentence_length_concise", average=round(avg_sentence_len, 1))
     else:
         score += 1
-        findings.append({"type": "warning", "message": f"Long sentences — avg {round(avg_sentence_len, 1)} words. Break complex sentences into shorter ones"})
+        findings.add("warning", "readability.sentence_length_long", average=round(avg_sentence_len, 1))
 
-    long_sentences = sum(1 for w in word_counts if w > 25)
+    long_sentences = features["long_sentences"]
     if long_sentences == 0:
         score += 2
-        findings.append({"type": "pass", "message": "No overly long sentences — maintains recruiter attention"})
+        findings.add("pass", "readability.no_long_sentences")
     elif long_sentences <= 3:
         score += 1
-        findings.append({"type": "warning", "message": f"{long_sentences} sentence(s) over 25 words — consider shortening for clarity"})
+        findings.add("warning", "readability.some_long_sentences", count=long_sentences)
     else:
-        findings.append({"type": "fail", "message": f"{long_sentences} sentences exceed 25 words — recruiters scan, not read; keep it concise"})
+        findings.add("fail", "readability.many_long_sentences", count=long_sentences)
 
-    words = text.lower().split()
-    complex_words = sum(1 for w in words if len(w) > 12)
-    complex_ratio = complex_words / max(len(words), 1)
+    complex_ratio = features["complex_words"] / max(features["words"], 1)
 
     if complex_ratio < 0.05:
         score += 1.5
-        findings.append({"type": "pass", "message": "Clear vocabulary — professional yet accessible language"})
+        findings.add("pass", "readability.vocabulary_clear")
     elif complex_ratio < 0.1:
         score += 1
-        findings.append({"type": "pass", "message": "Vocabulary is mostly clear with some technical jargon (appropriate for specialized roles)"})
+        findings.add("pass", "readability.vocabulary_technical")
     else:
         score += 0.5
-        findings.append({"type": "warning", "message": "Heavy use of complex words — ensure jargon is industry-standard and necessary"})
+        findings.add("warning", "readability.vocabulary_complex")
 
-    paragraphs = text.split("\n\n")
-    long_paras = sum(1 for p in paragraphs if len(p.split()) > 60)
+    long_paras = features["long_paragraphs"]
     if long_paras == 0:
         score += 1.5
-        findings.append({"type": "pass", "message": "Good content density — no large text blocks that overwhelm readers"})
+        findings.add("pass", "readability.density_ok")
     else:
         score += 0.5
-        findings.append({"type": "warning", "message": f"{long_paras} dense paragraph(s) found — break into bullet points for better readability"})
+        findings.add("warning", "readability.dense_paragraphs", count=long_paras)
 
     return round(min(score, max_score), 1), max_score, findings
+
+
+def check_readability(doc):
+    return score_features(extract_features(doc))
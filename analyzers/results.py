@@ -1,52 +1,65 @@
-import re
+from findings import Findings
 
 
-def check_measurable_results(text, text_lower):
-    findings = []
-    score = 0
-    max_score = 10
+METRIC_TYPES = [
+    ("Percentages", "percentage"),
+    ("Financial", "dollars"),
+    ("People/Scale", "people_metric"),
+    ("Time", "time_metric"),
+    ("Volume", "quantity_metric"),
+    ("Impact Statements", "improvement_phrase"),
+]
+
 
-    percentages = re.findall(r"\d+[\.\d]*\s*%", text)
-    dollars = re.findall(r"\$\s*[\d,]+[\.\d]*[KMBkmb]?|\d+[\.\d]*\s*(?:dollars|USD)", text, re.IGNORECASE)
-    people_metrics = re.findall(r"[\d,]+\s*(?:users|clients|customers|members|employees|people|students|attendees|team members|engineers)", text, re.IGNORECASE)
-    time_metrics = re.findall(r"[\d,]+\s*(?:hours|days|weeks|months|years|minutes)", text, re.IGNORECASE)
-    quantity_metrics = re.findall(r"[\d,]+\s*(?:projects|applications|features|tickets|deployments|releases|reports|repositories|systems|servers|databases)", text, re.IGNORECASE)
-    improvement_phrases = re.findall(r"\b(?:increased|decreased|reduced|improved|grew|saved|generated|boosted|cut|raised|doubled|tripled)\b[^.]*?\d+", text, re.IGNORECASE)
-
-    all_metrics = {
-        "Percentages": percentages,
-        "Financial": dollars,
-        "People/Scale": people_metrics,
-        "Time": time_metrics,
-        "Volume": quantity_metrics,
-        "Impact Statements": improvement_phrases,
+def extract_features(doc):
+    matches = doc.matches
+    counts = {}
+    examples = {}
+    for metric_type, pattern in METRIC_TYPES:
+        values = matches.findall(pattern)
+        counts[metric_type] = len(values)
+        examples[metric_type] = [v.strip()[:60] for v in values[:3]]
+    return {
+        "counts": counts,
+        "examples": examples,
+        "financial_words": any(w in doc.lower for w in ["revenue", "budget", "cost", "savings"]),
     }
 
-    total = sum(len(v) for v in all_metrics.values())
+
+def score_features(features):
+    findings = Findings()
+    score = 0
+    max_score = 10
+
+    counts = features["counts"]
+    total = sum(counts.values())
 
     if total >= 8:
         score = 10
-        findings.append({"type": "pass", "message": f"Exceptional quantification — {total} measurable results found across your resume"})
+        findings.add("pass", "results.exceptional", count=total)
     elif total >= 5:
         score = 8
-        findings.append({"type": "pass", "message": f"Strong metrics usage — {total} quantifiable results found"})
+        findings.add("pass", "results.strong", count=total)
     elif total >= 3:
         score = 5
-        findings.append({"type": "warning", "message": f"Moderate metrics ({total} found) — add numbers to at least 50% of your bullet points"})
+        findings.add("warning", "results.moderate", count=total)
     elif total >= 1:
         score = 2
-        findings.append({"type": "warning", "message": f"Only {total} measurable result(s) — quantify more achievements for stronger impact"})
+        findings.add("warning", "results.few", count=total)
     else:
-        findings.append({"type": "fail", "message": "No quantifiable results found — this is a major gap. Add numbers, percentages, and dollar amounts"})
+        findings.add("fail", "results.none")
 
-    for metric_type, values in all_metrics.items():
-        if values:
-            display = [v.strip()[:60] for v in values[:3]]
-            findings.append({"type": "info", "message": f"{metric_type}: {', '.join(display)}"})
+    for metric_type, _ in METRIC_TYPES:
+        if counts[metric_type]:
+            findings.add("info", "results.examples", metric=metric_type, examples=", ".join(features["examples"][metric_type]))
 
-    if not percentages:
-        findings.append({"type": "warning", "message": "Tip: Add percentages (e.g., 'Improved performance by 40%', 'Reduced costs by 25%')"})
-    if not dollars and not any(w in text_lower for w in ["revenue", "budget", "cost", "savings"]):
-        findings.append({"type": "warning", "message": "Tip: Include financial impact where possible (e.g., 'Managed $500K budget', 'Generated $2M revenue')"})
+    if not counts["Percentages"]:
+        findings.add("warning", "results.add_percentages")
+    if not counts["Financial"] and not features["financial_words"]:
+        findings.add("warning", "results.add_financial")
 
     return round(min(score, max_score), 1), max_score, findings
+
+
+def check_measurable_results(doc):
+    return score_features(extract_features(doc))
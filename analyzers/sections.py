@@ -1,25 +1,12 @@
-from constants import SECTION_KEYWORDS
+from findings import Findings
 
 
-def _find_section_heading(text_lower, keywords):
-    """Check if a keyword appears as a section heading (on its own line or near the start of a line)."""
-    lines = text_lower.split("\n")
-    for line in lines:
-        stripped = line.strip().rstrip(":").strip()
-        if not stripped:
-            continue
-        for kw in keywords:
-            if stripped == kw:
-                return True
-            if stripped.startswith(kw) and len(stripped) < len(kw) + 15:
-                return True
-            if kw in stripped and len(stripped) < 50:
-                return True
-    return False
+def extract_features(doc):
+    return {"sections": sorted(doc.section_spans)}
 
 
-def check_sections(text_lower):
-    findings = []
+def score_features(features):
+    findings = Findings()
     score = 0
     max_score = 15
 
@@ -29,28 +16,29 @@ def check_sections(text_lower):
                     "languages": 0.3, "volunteer": 0.2}
 
     found_sections = []
+    present = set(features["sections"])
 
     for section, pts in critical.items():
-        found = _find_section_heading(text_lower, SECTION_KEYWORDS[section])
+        found = section in present
         if found:
             score += pts
             found_sections.append(section.title())
-            findings.append({"type": "pass", "message": f"'{section.title()}' section found"})
+            findings.add("pass", "sections.essential_found", section=section.title())
         else:
-            findings.append({"type": "fail", "message": f"Missing '{section.title()}' section — this is essential for ATS parsing"})
+            findings.add("fail", "sections.essential_missing", section=section.title())
 
     for section, pts in important.items():
-        found = _find_section_heading(text_lower, SECTION_KEYWORDS[section])
+        found = section in present
         if found:
             score += pts
             found_sections.append(section.title())
-            findings.append({"type": "pass", "message": f"'{section.title()}' section found — helps recruiters quickly assess your profile"})
+            findings.add("pass", "sections.recommended_found", section=section.title())
         else:
-            findings.append({"type": "warning", "message": f"No '{section.title()}' section — a strong summary can boost recruiter interest by 36%"})
+            findings.add("warning", "sections.recommended_missing", section=section.title())
 
     nice_found = 0
     for section, pts in nice_to_have.items():
-        found = _find_section_heading(text_lower, SECTION_KEYWORDS[section])
+        found = section in present
         if found:
             score += pts
             nice_found += 1
@@ -59,10 +47,14 @@ def check_sections(text_lower):
     if nice_found > 0:
         names = [s for s in ["Certifications", "Projects", "Awards", "Languages", "Volunteer"]
                  if s in found_sections]
-        findings.append({"type": "pass", "message": f"Bonus sections found: {', '.join(names)}"})
+        findings.add("pass", "sections.bonus_found", names=", ".join(names))
     else:
-        findings.append({"type": "info", "message": "Consider adding: Certifications, Projects, Awards, or Languages to strengthen your resume"})
+        findings.add("info", "sections.bonus_missing")
 
-    findings.append({"type": "info", "message": f"Total sections detected: {len(found_sections)} ({', '.join(found_sections)})"})
+    findings.add("info", "sections.total", count=len(found_sections), names=", ".join(found_sections))
 
     return round(min(score, max_score), 1), max_score, findings
+
+
+def check_sections(doc):
+    return score_features(extract_features(doc))
@@ -1,43 +1,46 @@
 from constants import HARD_SKILLS
+from findings import Findings
 
 
-def check_hard_skills(text_lower):
-    findings = []
+def extract_features(doc):
+    return {"by_category": doc.matches.keywords().by_category("hard_skills")}
+
+
+def score_features(features):
+    findings = Findings()
     score = 0
     max_score = 12
 
-    found_by_category = {}
-    total_found = []
-
-    for cat, skills in HARD_SKILLS.items():
-        matched = [s for s in skills if s.lower() in text_lower]
-        if matched:
-            found_by_category[cat] = matched
-            total_found.extend(matched)
+    found_by_category = features["by_category"]
+    total_found = [s for skills in found_by_category.values() for s in skills]
 
     skill_count = len(total_found)
     cat_count = len(found_by_category)
 
     if skill_count >= 12:
         score = 12
-        findings.append({"type": "pass", "message": f"Excellent hard skill coverage — {skill_count} technical skills across {cat_count} categories"})
+        findings.add("pass", "skills.excellent", count=skill_count, categories=cat_count)
     elif skill_count >= 8:
         score = 10
-        findings.append({"type": "pass", "message": f"Strong technical skills — {skill_count} hard skills detected in {cat_count} categories"})
+        findings.add("pass", "skills.strong", count=skill_count, categories=cat_count)
     elif skill_count >= 5:
         score = 7
-        findings.append({"type": "warning", "message": f"Decent technical skills ({skill_count}) — add more relevant skills from job descriptions"})
+        findings.add("warning", "skills.decent", count=skill_count)
     elif skill_count >= 2:
         score = 4
-        findings.append({"type": "warning", "message": f"Limited hard skills ({skill_count}) — technical skills are crucial for ATS filtering"})
+        findings.add("warning", "skills.limited", count=skill_count)
     else:
-        findings.append({"type": "fail", "message": "Very few technical skills detected — ATS systems heavily weight hard skills for filtering"})
+        findings.add("fail", "skills.very_few")
 
     for cat, skills in found_by_category.items():
-        findings.append({"type": "info", "message": f"{cat}: {', '.join(skills)}"})
+        findings.add("info", "skills.category", category=cat, skills=", ".join(skills))
 
     missing_cats = [c for c in HARD_SKILLS if c not in found_by_category]
     if missing_cats:
-        findings.append({"type": "info", "message": f"Categories not represented: {', '.join(missing_cats[:4])}"})
+        findings.add("info", "skills.missing_categories", categories=", ".join(missing_cats[:4]))
 
     return round(min(score, max_score), 1), max_score, findings
+
+
+def check_hard_skills(doc):
+    return score_features(extract_features(doc))
@@ -1,40 +1,40 @@
-import re
-from constants import ACTION_VERBS_BY_CATEGORY, WEAK_VERBS
+from constants import ACTION_VERBS_BY_CATEGORY
+from findings import Findings
 
 
-def check_action_verbs(text_lower):
-    findings = []
+def extract_features(doc):
+    hits = doc.matches.keywords()
+    return {"by_category": hits.by_category("action_verbs"), "weak": hits.matched("weak_verbs")}
+
+
+def score_features(features):
+    findings = Findings()
     score = 0
     max_score = 10
 
-    found_by_category = {}
-    total_found = []
-    for cat, verbs in ACTION_VERBS_BY_CATEGORY.items():
-        matched = [v for v in verbs if re.search(r"\b" + v + r"\w*\b", text_lower)]
-        if matched:
-            found_by_category[cat] = matched
-            total_found.extend(matched)
+    found_by_category = features["by_category"]
+    total_found = [v for verbs in found_by_category.values() for v in verbs]
 
     verb_count = len(total_found)
     category_count = len(found_by_category)
 
     if verb_count >= 12:
         score = 10
-        findings.append({"type": "pass", "message": f"Outstanding use of action verbs — {verb_count} strong verbs across {category_count} categories"})
+        findings.add("pass", "verbs.outstanding", count=verb_count, categories=category_count)
     elif verb_count >= 8:
         score = 8
-        findings.append({"type": "pass", "message": f"Excellent action verb usage — {verb_count} verbs found in {category_count} categories"})
+        findings.add("pass", "verbs.excellent", count=verb_count, categories=category_count)
     elif verb_count >= 5:
         score = 6
-        findings.append({"type": "warning", "message": f"Good start with {verb_count} action verbs — aim for 10+ different verbs"})
+        findings.add("warning", "verbs.good_start", count=verb_count)
     elif verb_count >= 2:
         score = 3
-        findings.append({"type": "warning", "message": f"Only {verb_count} action verbs found — start every bullet point with a strong action verb"})
+        findings.add("warning", "verbs.few", count=verb_count)
     else:
-        findings.append({"type": "fail", "message": "Very few action verbs — replace 'was responsible for' with verbs like Developed, Led, Implemented"})
+        findings.add("fail", "verbs.very_few")
 
     for cat, verbs in found_by_category.items():
-        findings.append({"type": "info", "message": f"{cat}: {', '.join(verbs)}"})
+        findings.add("info", "verbs.category", category=cat, verbs=", ".join(verbs))
 
     missing_cats = [c for c in ACTION_VERBS_BY_CATEGORY if c not in found_by_category]
     if missing_cats and len(missing_cats) <= 5:
@@ -42,13 +42,17 @@ def check_action_verbs(text_lower):
         for cat in missing_cats[:3]:
             suggestions[cat] = ACTION_VERBS_BY_CATEGORY[cat][:3]
         parts = [f"{cat} ({', '.join(vs)})" for cat, vs in suggestions.items()]
-        findings.append({"type": "warning", "message": f"Missing verb categories — try adding: {'; '.join(parts)}"})
+        findings.add("warning", "verbs.missing_categories", suggestions="; ".join(parts))
 
-    weak_found = [v for v in WEAK_VERBS if v in text_lower]
+    weak_found = features["weak"]
     if weak_found:
         score = max(0, score - 1)
-        findings.append({"type": "fail", "message": f"Weak phrases detected: '{', '.join(weak_found)}' — replace with specific action verbs"})
+        findings.add("fail", "verbs.weak_phrases", phrases=", ".join(weak_found))
     else:
-        findings.append({"type": "pass", "message": "No weak/passive phrases detected — your language is strong"})
+        findings.add("pass", "verbs.no_weak_phrases")
 
     return round(min(score, max_score), 1), max_score, findings
+
+
+def check_action_verbs(doc):
+    return score_features(extract_features(doc))
@@ -1,15 +1,111 @@
+import gzip
 import os
-from flask import Flask
-from config import UPLOAD_DIR, MAX_CONTENT_LENGTH
+from tempfile import SpooledTemporaryFile
+from flask import Flask, Request, current_app, request
+from flask.json.provider import DefaultJSONProvider
+from analysis import score_text
+from config import UPLOAD_DIR, MAX_CONTENT_LENGTH, IN_MEMORY_UPLOAD_LIMIT, DEBUG_TIMINGS, COMPRESS_MIN_BYTES
+from findings import Finding
+from parsers import load_parsers
 from routes import bp
+from serialization import dumps
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# In order of preference when the client accepts several equally.
+ENCODINGS = {}
+if brotli is not None:
+    ENCODINGS["br"] = lambda data: brotli.compress(data, quality=5)
+ENCODINGS["gzip"] = lambda data: gzip.compress(data, compresslevel=6)
+
+
+class JSONProvider(DefaultJSONProvider):
+    @staticmethod
+    def default(o):
+        # Findings are stored compactly and rendered to messages only here.
+        if isinstance(o, Finding):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
+
+    def response(self, *args, **kwargs):
+        # jsonify() goes through the configured serialization backend.
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
+
+
+class UploadRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        # Keep uploads in memory up to the limit so parsers read them directly;
+        # larger files roll over to an anonymous temp file, so names never collide.
+        return SpooledTemporaryFile(max_size=current_app.config["IN_MEMORY_UPLOAD_LIMIT"],
+                                    mode="rb+", dir=current_app.config["UPLOAD_FOLDER"])
+
+
+def compress_response(response):
+    """Compress a buffered JSON response with the best encoding the client accepts."""
+    if (response.mimetype != "application/json" or response.is_streamed or response.direct_passthrough
+            or "Content-Encoding" in response.headers):
+        return response
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+    if len(data) < current_app.config["COMPRESS_MIN_BYTES"]:
+        return response
+    encoding = request.accept_encodings.best_match(list(ENCODINGS))
+    if encoding is None:
+        return response
+    response.set_data(ENCODINGS[encoding](data))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+# Touches every analyzer: contact details, headings, dated roles, bullets and skills.
+WARMUP_RESUME = """Jane Doe
+jane.doe@example.com | +1 555 010 0199 | linkedin.com/in/janedoe | Austin, TX
+
+Summary
+Backend engineer focused on reliable data services.
+
+Experience
+Senior Software Engineer, Acme Technologies Inc.
+Jan 2020 – Present
+• Led a team of 5 engineers and reduced API latency by 40%.
+• Developed Python and PostgreSQL services handling $2M in monthly revenue.
+
+Education
+Bachelor of Science in Computer Science, University of Texas, 2016
+
+Skills
+Python, Flask, Docker, AWS, SQL, Git
+"""
+
+
+def warmup():
+    """Do the one-off work the first request would otherwise pay for.
+
+    Loads the document parsers and runs a sample resume through the analysis
+    and the JSON encoder, so regexes and keyword automaton transitions are
+    built. ``gunicorn.conf.py`` calls this in the master before workers fork,
+    so they share the warmed state copy-on-write.
+    """
+    load_parsers()
+    dumps(score_text(WARMUP_RESUME, 1, "pdf"))
 
 
 def create_app():
     app = Flask(__name__)
+    app.request_class = UploadRequest
+    app.json = JSONProvider(app)
     app.config["MAX_CONTENT_LENGTH"] = MAX_CONTENT_LENGTH
     app.config["UPLOAD_FOLDER"] = UPLOAD_DIR
+    app.config["IN_MEMORY_UPLOAD_LIMIT"] = IN_MEMORY_UPLOAD_LIMIT
+    app.config["DEBUG_TIMINGS"] = DEBUG_TIMINGS
+    app.config["COMPRESS_MIN_BYTES"] = COMPRESS_MIN_BYTES
     os.makedirs(UPLOAD_DIR, exist_ok=True)
     app.register_blueprint(bp)
+    app.after_request(compress_response)
     return app
 
 
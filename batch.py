@@ -0,0 +1,220 @@
+"""Score many resumes at once and stream the results as JSON Lines.
+
+Used by ``POST /api/check/batch`` and from the command line::
+
+    python batch.py resumes/ --workers 8 --ordered > results.jsonl
+
+Each file produces one record as soon as it is scored; the last line is a
+``{"summary": ...}`` record with throughput and latency percentiles.
+With ``--features`` the extracted features of each file are stored as well,
+so ``features.py`` can rescore them after a scoring-rule change.
+"""
+import argparse
+import os
+import sys
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from analysis import compact_result, score_document
+from cache import digest_text
+from config import BATCH_WORKERS, FEATURE_STORE_PATH, MAX_DECOMPRESSED_BYTES
+from document import ResumeDocument
+from features import FeatureStore
+from layout import summarize
+from parsers import NO_TEXT_ERROR, UploadTooLarge, allowed_file, extract_text
+from sandbox import process_context
+from serialization import dumps_text
+
+
+def read_file(name, data):
+    """(text, num_pages, file_ext, truncated, layout summary) of one upload; ValueError if it has no usable text.
+
+    ``data`` may instead be the exception that stopped the upload being read
+    (see ``iter_zip``), which is raised here so it becomes that file's error.
+    """
+    if isinstance(data, Exception):
+        raise data
+    if not allowed_file(name):
+        raise ValueError("Only PDF and DOCX files are supported")
+    file_ext = name.rsplit(".", 1)[1].lower()
+    text, num_pages, truncated, layout = extract_text(data, file_ext, layout=True)
+    if not text.strip():
+        raise ValueError(NO_TEXT_ERROR)
+    return text, num_pages, file_ext, truncated, summarize(layout)
+
+
+_stores = {}
+
+
+def score_file(name, data, features_path=None, compact=False):
+    """Score one upload; errors are reported in the record instead of raised.
+
+    With ``features_path`` the extracted features are also kept there for rescoring.
+    ``compact`` applies ``analysis.compact_result`` to the result.
+    """
+    started = time.perf_counter()
+    record = {"file": name}
+    try:
+        text, num_pages, file_ext, truncated, layout_summary = read_file(name, data)
+        record["status"] = "ok"
+        record["result"], features = score_document(ResumeDocument(text, num_pages, file_ext, layout_summary))
+        if truncated:
+            record["result"]["truncated"] = True
+        if features_path:
+            if features_path not in _stores:
+                _stores[features_path] = FeatureStore(features_path)
+            _stores[features_path].put(f"{digest_text(text)}:{num_pages}:{file_ext}", name, features)
+        if compact:
+            record["result"] = compact_result(record["result"])
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = str(e) or type(e).__name__
+    record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return record
+
+
+def iter_directory(path):
+    """(name, bytes) for every PDF/DOCX under ``path``, in sorted order."""
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for filename in sorted(files):
+            if allowed_file(filename):
+                full = os.path.join(root, filename)
+                with open(full, "rb") as f:
+                    yield os.path.relpath(full, path), f.read()
+
+
+def iter_zip(fileobj, name="archive.zip"):
+    """(name, bytes) for every file in the zip archive ``name``.
+
+    Members are inflated only while the archive stays within
+    ``MAX_DECOMPRESSED_BYTES`` in total; past that, and for members that fail
+    to read, the bytes are replaced by the error, for ``read_file`` to report.
+    An archive that cannot be opened is one such error, under its own name.
+    """
+    expanded = 0
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except (zipfile.BadZipFile, EOFError):
+        yield name, ValueError("Not a valid zip archive")
+        return
+    with archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            # Declared sizes are binding: zipfile stops at them and fails the CRC check.
+            if MAX_DECOMPRESSED_BYTES and expanded + info.file_size > MAX_DECOMPRESSED_BYTES:
+                yield info.filename, UploadTooLarge(
+                    f"This zip expands to more than {MAX_DECOMPRESSED_BYTES // (1024 * 1024)} MB — "
+                    "send its files in smaller archives")
+                continue
+            expanded += info.file_size
+            try:
+                data = archive.read(info)
+            except Exception as e:
+                data = e
+            yield info.filename, data
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def _take(pending, ordered):
+    if ordered:
+        yield pending.popleft().result()
+        return
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        pending.remove(future)
+        yield future.result()
+
+
+def map_files(fn, items, workers, ordered=False):
+    """Yield ``fn(name, data)`` for each item, across ``workers`` processes.
+
+    ``fn`` must be picklable (a module-level function or a partial of one).
+    """
+    if workers <= 1:
+        for name, data in items:
+            yield fn(name, data)
+        return
+    # Keep a bounded number of files in flight so a large batch never sits in memory at once.
+    window = workers * 2
+    # Started per request, so not forked from the web worker and its client socket.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=process_context()) as pool:
+        pending = deque() if ordered else set()
+        for name, data in items:
+            future = pool.submit(fn, name, data)
+            if ordered:
+                pending.append(future)
+            else:
+                pending.add(future)
+            while len(pending) >= window:
+                yield from _take(pending, ordered)
+        while pending:
+            yield from _take(pending, ordered)
+
+
+def iter_batch(items, workers=BATCH_WORKERS, ordered=False, features_path=None, compact=False):
+    """Yield a record per ``(name, bytes)`` item, then a summary record.
+
+    With ``ordered=False`` records arrive in completion order.
+    """
+    started = time.perf_counter()
+    latencies = []
+    failed = 0
+    fn = partial(score_file, features_path=features_path, compact=compact) if features_path or compact else score_file
+    for record in map_files(fn, items, workers, ordered):
+        latencies.append(record["elapsed_ms"])
+        if record["status"] != "ok":
+            failed += 1
+        yield record
+
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    yield {"summary": {
+        "files": len(latencies),
+        "succeeded": len(latencies) - failed,
+        "failed": failed,
+        "elapsed_s": round(elapsed, 3),
+        "docs_per_sec": round(len(latencies) / elapsed, 2) if elapsed else 0,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+    }}
+
+
+def iter_jsonl(records):
+    for record in records:
+        yield dumps_text(record) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a directory of PDF/DOCX resumes as JSON Lines.")
+    parser.add_argument("directory")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS)
+    parser.add_argument("--ordered", action="store_true", help="emit records in file order")
+    parser.add_argument("-o", "--output", help="write to this file instead of stdout")
+    parser.add_argument("--features", metavar="PATH", nargs="?", const=FEATURE_STORE_PATH,
+                        help="also store extracted features in this SQLite file for features.py")
+    parser.add_argument("--compact", action="store_true", help="omit info findings and tip descriptions")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        records = iter_batch(iter_directory(args.directory), args.workers, args.ordered, args.features, args.compact)
+        for line in iter_jsonl(records):
+            out.write(line)
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Synthetic resume corpus for the benchmarks.
+
+Every document is generated from a fixed seed, so runs on the same code are
+comparable. ``CORPUS`` maps a name to the document's lines; ``to_pdf`` and
+``to_docx`` render those lines into bytes for the parser benchmarks.
+"""
+import io
+import random
+from docx import Document
+from constants import ACTION_VERBS_BY_CATEGORY, HARD_SKILLS, SOFT_SKILLS
+
+_rng = random.Random(2024)
+_SKILLS = [s for skills in HARD_SKILLS.values() for s in skills] + \
+          [s for skills in SOFT_SKILLS.values() for s in skills]
+_VERBS = [v for verbs in ACTION_VERBS_BY_CATEGORY.values() for v in verbs]
+_FILLER = "the a of and to for with on across team system data platform customer product new".split()
+
+
+def _bullet():
+    words = [_rng.choice(_FILLER + _SKILLS) for _ in range(_rng.randint(8, 22))]
+    metric = _rng.choice(["", f" by {_rng.randint(5, 90)}%", f" for {_rng.randint(10, 5000)} users",
+                          f" saving ${_rng.randint(10, 900)}K"])
+    return f"• {_rng.choice(_VERBS).capitalize()} {' '.join(words)}{metric}."
+
+
+def _job(year):
+    return [f"Senior Software Engineer, Acme Technologies  Jan {year} – Mar {year + 2}"] + \
+        [_bullet() for _ in range(_rng.randint(4, 7))]
+
+
+def _resume(jobs, bullets_per_job=None):
+    lines = ["Jane Doe", "jane.doe@gmail.com | +1 (555) 123-4567 | San Francisco, CA",
+             "linkedin.com/in/janedoe | github.com/janedoe", "", "Professional Summary",
+             "Engineer with a decade of experience building data platforms and web services.", "",
+             "Work Experience"]
+    for i in range(jobs):
+        job = _job(2000 + i)
+        if bullets_per_job:
+            job = job[:1] + [_bullet() for _ in range(bullets_per_job)]
+        lines += job + [""]
+    lines += ["Education", "Bachelor of Science in Computer Science, Stanford University, 2012, GPA 3.8/4.0", "",
+              "Skills", ", ".join(_rng.sample(_SKILLS, 30)), "", "Certifications", "AWS Certified Solutions Architect"]
+    return lines
+
+
+CORPUS = {
+    "short": _resume(1)[:20],
+    "typical": _resume(3),
+    "long": _resume(12),
+    "many_pages": _resume(60),
+    "many_bullets": _resume(4, bullets_per_job=40),
+    "huge_line": _resume(2) + [" ".join(_rng.choice(_FILLER + _SKILLS) for _ in range(10000))],
+    "regex_hostile": _resume(1) + [
+        "1 " * 5000,
+        "increased " * 2000,
+        "a" * 10000,
+        " " * 5000 + "x" + " " * 5000 + "y",
+        "9" * 5000,
+    ],
+}
+
+# Lines per PDF page, so long documents produce realistic page counts.
+_LINES_PER_PAGE = 45
+
+
+def to_pdf(lines):
+    """Render lines as a minimal Helvetica text PDF."""
+    pages = [lines[i:i + _LINES_PER_PAGE] for i in range(0, max(len(lines), 1), _LINES_PER_PAGE)]
+    objects = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>", None]
+    kids = []
+    for page in pages:
+        ops = ["BT /F1 10 Tf 12 TL 50 780 Td"]
+        for line in page:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(f"({escaped}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+                       b"/Resources << /Font << /F1 1 0 R >> >> >>" % (len(objects)))
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), len(kids))
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, len(objects), xref)
+    return bytes(out)
+
+
+def to_docx(lines):
+    doc = Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
@@ -0,0 +1,174 @@
+"""Benchmark the parsers, every analyzer and the full /api/check request.
+
+Run from the repository root::
+
+    python -m benchmarks.run                      # print a report
+    python -m benchmarks.run --save baseline.json # record a baseline
+    python -m benchmarks.run --compare baseline.json --threshold 0.25
+
+Each stage is timed over the synthetic corpus in ``benchmarks.corpus``.
+``parse_pdf`` uses the configured ``PDF_BACKEND``; the ``parse_pdf:<name>``
+stages time every installed PDF backend on its own, to compare them.
+Latency is reported as mean/p50/p95 per call, allocations as the tracemalloc
+peak of one call, and throughput as calls per second. With ``--compare`` the
+exit status is 1 when any stage's mean latency grew by more than the
+threshold, so the run can gate CI.
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Measure real work on every request, not cache hits.
+os.environ["CACHE_BACKEND"] = "none"
+
+from analysis import CHECKS, _resume_confidence, analyze_resume  # noqa: E402
+from document import ResumeDocument  # noqa: E402
+from parsers import extract_text, extract_text_from_pdf  # noqa: E402
+from pdf_backends import BACKENDS  # noqa: E402
+from tips import generate_tips  # noqa: E402
+from benchmarks.corpus import CORPUS, to_docx, to_pdf  # noqa: E402
+
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def measure(fn, repeat):
+    """Time ``repeat`` calls of ``fn`` and the peak allocation of one more."""
+    fn()  # warm caches and lazy imports
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples.sort()
+    total = sum(samples)
+    return {
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "p50_ms": round(_percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(_percentile(samples, 95) * 1000, 3),
+        "calls_per_sec": round(repeat / total, 1) if total else 0,
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def _stages(name, lines):
+    """(stage, callable) pairs for one corpus document."""
+    text = "\n".join(lines)
+    pdf = to_pdf(lines)
+    docx = to_docx(lines)
+    num_pages = extract_text(pdf, "pdf")[1]
+
+    yield "parse_pdf", lambda: extract_text(pdf, "pdf")
+    yield "parse_pdf_layout", lambda: extract_text(pdf, "pdf", layout=True)
+    for backend in BACKENDS.values():
+        if backend.available():
+            yield (f"parse_pdf:{backend.name}",
+                   lambda backend=backend: extract_text_from_pdf(io.BytesIO(pdf), backends=[backend]))
+    yield "parse_docx", lambda: extract_text(docx, "docx")
+    yield "parse_docx_layout", lambda: extract_text(docx, "docx", layout=True)
+    # A fresh document per call, so each check pays for the views it builds.
+    for _, fn, _ in CHECKS:
+        yield fn.__name__, lambda fn=fn: fn(ResumeDocument(text, num_pages, "pdf"))
+    yield "_resume_confidence", lambda: _resume_confidence(ResumeDocument(text, num_pages, "pdf"))
+
+    result = analyze_resume(ResumeDocument(text, num_pages, "pdf"))
+    yield "generate_tips", lambda: generate_tips(result["categories"], result["overall_score"])
+    yield "analyze_resume", lambda: analyze_resume(ResumeDocument(text, num_pages, "pdf"))
+
+    client = _client()
+
+    def request():
+        response = client.post("/api/check", data={"resume": (io.BytesIO(pdf), f"{name}.pdf")},
+                               content_type="multipart/form-data")
+        assert response.status_code == 200, response.get_data(as_text=True)
+    yield "api_check", request
+
+
+_app = None
+
+
+def _client():
+    global _app
+    if _app is None:
+        from app import create_app
+        _app = create_app()
+    return _app.test_client()
+
+
+def run(repeat, only=None):
+    report = {}
+    for name, lines in CORPUS.items():
+        for stage, fn in _stages(name, lines):
+            if only and stage not in only:
+                continue
+            report[f"{name}/{stage}"] = measure(fn, repeat)
+            print(f"{name + '/' + stage:45} {_format(report[f'{name}/{stage}'])}", file=sys.stderr)
+    return report
+
+
+def _format(row):
+    return (f"mean {row['mean_ms']:9.3f} ms  p50 {row['p50_ms']:9.3f}  p95 {row['p95_ms']:9.3f}  "
+            f"{row['calls_per_sec']:9.1f}/s  peak {row['peak_kb']:9.1f} KB")
+
+
+def compare(report, baseline, threshold, min_delta_ms):
+    """Stages whose mean latency exceeds the baseline by more than ``threshold``.
+
+    Slowdowns under ``min_delta_ms`` are ignored; sub-millisecond stages jitter
+    by more than any sensible threshold.
+    """
+    regressions = []
+    for key, row in sorted(report.items()):
+        old = baseline.get(key)
+        if not old or not old["mean_ms"]:
+            continue
+        change = row["mean_ms"] / old["mean_ms"] - 1
+        if change > threshold and row["mean_ms"] - old["mean_ms"] >= min_delta_ms:
+            regressions.append((key, old["mean_ms"], row["mean_ms"], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark parsers, analyzers and /api/check.")
+    parser.add_argument("--repeat", type=int, default=10, help="timed calls per stage")
+    parser.add_argument("--stage", action="append", help="only run this stage (repeatable)")
+    parser.add_argument("--save", metavar="PATH", help="write the report as a baseline JSON")
+    parser.add_argument("--compare", metavar="PATH", help="fail if slower than this baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before a stage counts as a regression (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="ignore slowdowns smaller than this many milliseconds")
+    args = parser.parse_args(argv)
+
+    report = run(args.repeat, args.stage)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.min_delta_ms)
+        for key, old, new, change in regressions:
+            print(f"REGRESSION {key}: {old:.3f} ms -> {new:.3f} ms (+{change:.0%})", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions above {args.threshold:.0%} against {args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
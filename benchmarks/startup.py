@@ -0,0 +1,108 @@
+"""Benchmark cold start: importing the app and serving its first /api/check.
+
+Run from the repository root::
+
+    python -m benchmarks.startup                      # print a report
+    python -m benchmarks.startup --save startup.json  # record a baseline
+    python -m benchmarks.startup --compare startup.json --threshold 0.25
+
+Every sample is a fresh interpreter. ``cold`` serves the first request
+straight after ``import app``, as a serverless instance does; ``warm`` runs
+``app.warmup()`` first, as the gunicorn master does before forking. The report
+and baseline format match ``benchmarks.run``, so ``--compare`` gates CI the
+same way.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from benchmarks.corpus import CORPUS, to_pdf
+from benchmarks.run import _percentile, compare
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = """
+import io, json, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+if sys.argv[2] == "warm":
+    app.warmup()
+warmed = time.perf_counter()
+with open(sys.argv[1], "rb") as f:
+    pdf = f.read()
+response = app.app.test_client().post("/api/check", data={"resume": (io.BytesIO(pdf), "resume.pdf")},
+                                      content_type="multipart/form-data")
+assert response.status_code == 200, response.get_data(as_text=True)
+done = time.perf_counter()
+print(json.dumps({"import_app": imported - started, "warmup": warmed - imported,
+                  "first_response": done - warmed, "ready_to_first_response": done - started}))
+"""
+
+
+def sample(pdf_path, mode):
+    """Timings in seconds from one fresh interpreter."""
+    # Measure real work, not a cache left over from an earlier sample.
+    env = {**os.environ, "CACHE_BACKEND": "none"}
+    out = subprocess.run([sys.executable, "-c", _CHILD, pdf_path, mode], cwd=_ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out)
+
+
+def run(repeat):
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+        f.write(to_pdf(CORPUS["typical"]))
+    try:
+        report = {}
+        for mode in ("cold", "warm"):
+            samples = [sample(f.name, mode) for _ in range(repeat)]
+            for stage in samples[0]:
+                if mode == "cold" and stage == "warmup":
+                    continue
+                values = sorted(s[stage] for s in samples)
+                row = {
+                    "mean_ms": round(statistics.fmean(values) * 1000, 3),
+                    "p50_ms": round(_percentile(values, 50) * 1000, 3),
+                    "p95_ms": round(_percentile(values, 95) * 1000, 3),
+                }
+                report[f"{mode}/{stage}"] = row
+                print(f"{mode + '/' + stage:45} mean {row['mean_ms']:9.3f} ms  p50 {row['p50_ms']:9.3f}  "
+                      f"p95 {row['p95_ms']:9.3f}", file=sys.stderr)
+        return report
+    finally:
+        os.unlink(f.name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark app import and time to first response.")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per mode")
+    parser.add_argument("--save", metavar="PATH", help="write the report as a baseline JSON")
+    parser.add_argument("--compare", metavar="PATH", help="fail if slower than this baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before a stage counts as a regression (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0,
+                        help="ignore slowdowns smaller than this many milliseconds")
+    args = parser.parse_args(argv)
+
+    report = run(args.repeat)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.min_delta_ms)
+        for key, old, new, change in regressions:
+            print(f"REGRESSION {key}: {old:.3f} ms -> {new:.3f} ms (+{change:.0%})", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions above {args.threshold:.0%} against {args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Bounded caches for parsed text and analysis results.
+
+``make_cache`` picks the backend from ``config.CACHE_BACKEND``: ``memory`` keeps
+an LRU per process, ``sqlite`` shares entries between gunicorn workers through
+one database file, and ``none`` disables caching. Values must be JSON
+serialisable and are treated as read-only by callers.
+"""
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from config import CACHE_BACKEND, CACHE_PATH, CACHE_MAX_ENTRIES, CACHE_TTL
+from serialization import dumps_text
+
+_ANALYZER_SOURCES = ["analysis.py", "constants.py", "document.py", "findings.py", "layout.py", "matcher.py",
+                     "patterns.py", "tips.py", "analyzers/*.py"]
+
+
+def _analyzer_version():
+    root = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for pattern in _ANALYZER_SOURCES:
+        for path in sorted(glob.glob(os.path.join(root, pattern))):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+# Changes whenever analysis code or dictionaries change, so stale results are never served.
+ANALYZER_VERSION = _analyzer_version()
+
+
+def digest_stream(stream, chunk_size=64 * 1024):
+    """sha256 of a seekable binary stream, which is rewound afterwards."""
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def digest_text(text):
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class NullCache:
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+
+class MemoryCache:
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteCache:
+    def __init__(self, path=CACHE_PATH, table="cache", max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL):
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = threading.local()
+
+    def _connect(self):
+        # One connection per thread and per process; never shared across a fork.
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {self.table} "
+                         "(key TEXT PRIMARY KEY, value TEXT, expires REAL, used REAL)")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute(f"SELECT value FROM {self.table} WHERE key = ? AND expires > ?",
+                           (key, now)).fetchone()
+        if row is None:
+            return None
+        conn.execute(f"UPDATE {self.table} SET used = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        conn = self._connect()
+        now = time.time()
+        conn.execute(f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?)",
+                     (key, dumps_text(value), now + self.ttl, now))
+        conn.execute(f"DELETE FROM {self.table} WHERE expires <= ?", (now,))
+        conn.execute(f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} "
+                     "ORDER BY used DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+
+def make_cache(name):
+    if CACHE_BACKEND == "sqlite":
+        return SQLiteCache(table=f"{name}_cache")
+    if CACHE_BACKEND == "none":
+        return NullCache()
+    return MemoryCache()
@@ -3,4 +3,74 @@ import os
 IS_VERCEL = os.environ.get("VERCEL") or os.environ.get("AWS_LAMBDA_FUNCTION_NAME")
 UPLOAD_DIR = "/tmp/uploads" if IS_VERCEL else os.path.join(os.path.dirname(__file__), "uploads")
 MAX_CONTENT_LENGTH = 5 * 1024 * 1024
+# Uploads up to this size are parsed from memory; larger ones spill to a temp file in UPLOAD_DIR.
+IN_MEMORY_UPLOAD_LIMIT = int(os.environ.get("IN_MEMORY_UPLOAD_LIMIT", 2 * 1024 * 1024))
 ALLOWED_EXTENSIONS = {"pdf", "docx"}
+
+# Seconds one page may spend in text extraction before it is skipped.
+PDF_PAGE_TIME_BUDGET = float(os.environ.get("PDF_PAGE_TIME_BUDGET", 2.0))
+# "auto" tries every installed PDF library fastest first; or a comma-separated
+# preference list of pypdfium2, pypdf, pypdf2 and pdfminer (see pdf_backends.py).
+PDF_BACKEND = os.environ.get("PDF_BACKEND", "auto")
+
+# Guarded extraction; 0 disables a limit. Uploads are small, but compressed PDF
+# streams and DOCX archives can expand far past MAX_CONTENT_LENGTH. PDFs stop at
+# the limit and are scored on the text read so far; larger DOCX files are rejected.
+MAX_DECOMPRESSED_BYTES = int(os.environ.get("MAX_DECOMPRESSED_BYTES", 64 * 1024 * 1024))
+MAX_PDF_PAGES = int(os.environ.get("MAX_PDF_PAGES", 50))
+# Far more than any resume needs to be scored; longer text is cut here.
+MAX_EXTRACTED_CHARS = int(os.environ.get("MAX_EXTRACTED_CHARS", 200_000))
+
+# /api/check parses uploads in PARSER_WORKERS subprocesses per web worker (0 parses
+# in-process). Each parser gets PARSER_CPU_SECONDS of CPU and PARSER_TIMEOUT seconds
+# per document, at most PARSER_MAX_MEMORY bytes of address space, and is replaced
+# after PARSER_MAX_DOCUMENTS documents. Uploads reach it through PARSER_SPOOL_DIR.
+PARSER_WORKERS = int(os.environ.get("PARSER_WORKERS", 0 if IS_VERCEL else 2))
+PARSER_CPU_SECONDS = int(os.environ.get("PARSER_CPU_SECONDS", 10))
+PARSER_TIMEOUT = float(os.environ.get("PARSER_TIMEOUT", 20.0))
+PARSER_MAX_MEMORY = int(os.environ.get("PARSER_MAX_MEMORY", 1024 * 1024 * 1024))
+PARSER_MAX_DOCUMENTS = int(os.environ.get("PARSER_MAX_DOCUMENTS", 100))
+PARSER_SPOOL_DIR = os.environ.get("PARSER_SPOOL_DIR", "/dev/shm" if os.path.isdir("/dev/shm") else None)
+
+# Seconds each analyzer may run on one document before it is skipped with a warning.
+ANALYZER_TIME_BUDGET = float(os.environ.get("ANALYZER_TIME_BUDGET", 1.0))
+
+# Worker processes used by /api/check/batch and batch.py.
+BATCH_WORKERS = int(os.environ.get("BATCH_WORKERS", os.cpu_count() or 1))
+
+DATA_DIR = "/tmp/ats-data" if IS_VERCEL else os.path.join(os.path.dirname(__file__), "data")
+# "memory" (per worker), "sqlite" (shared by all workers on the host) or "none".
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+CACHE_PATH = os.environ.get("CACHE_PATH", os.path.join(DATA_DIR, "cache.sqlite3"))
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", 512))
+CACHE_TTL = int(os.environ.get("CACHE_TTL", 24 * 3600))
+# Where batch.py --features keeps extracted feature records for rescoring.
+FEATURE_STORE_PATH = os.environ.get("FEATURE_STORE_PATH", os.path.join(DATA_DIR, "features.sqlite3"))
+
+# "orjson", "json" (standard library) or "auto": orjson when it is installed.
+JSON_BACKEND = os.environ.get("JSON_BACKEND", "auto")
+# JSON responses at least this large are gzip/brotli compressed when the client accepts it.
+COMPRESS_MIN_BYTES = int(os.environ.get("COMPRESS_MIN_BYTES", 1024))
+
+# Adds a "timings" block (milliseconds per stage) to /api/check responses.
+DEBUG_TIMINGS = os.environ.get("DEBUG_TIMINGS", "").lower() in ("1", "true", "yes")
+
+# Compiled job descriptions kept per worker for /api/match, keyed by job ID. The
+# descriptions go through CACHE_BACKEND: with several workers, /api/match requests
+# that send only job_id need "sqlite" to find a posting another worker received.
+JOB_INDEX_CACHE_SIZE = int(os.environ.get("JOB_INDEX_CACHE_SIZE", 256))
+
+# /api/rank and ranking.py skip the full analysis for files below either bar:
+# resume confidence (0-1) or match score against the job (0-100).
+RANK_MIN_CONFIDENCE = float(os.environ.get("RANK_MIN_CONFIDENCE", 0.3))
+RANK_MIN_MATCH = int(os.environ.get("RANK_MIN_MATCH", 20))
+
+# Background jobs (POST /api/jobs): state lives in SQLite so every gunicorn
+# worker can report on any job; JOB_WORKERS processes per server do the work.
+JOB_DB_PATH = os.environ.get("JOB_DB_PATH", os.path.join(DATA_DIR, "jobs.sqlite3"))
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", min(2, os.cpu_count() or 1)))
+JOB_TTL = int(os.environ.get("JOB_TTL", 3600))
+# The web client sends uploads at least this large to /api/jobs instead of /api/check
+# (0 never does). Off on serverless runtimes, where a function is frozen once it has
+# answered and its job store in /tmp is not shared with the instance a poll reaches.
+ASYNC_UPLOAD_MIN_BYTES = int(os.environ.get("ASYNC_UPLOAD_MIN_BYTES", 0 if IS_VERCEL else 1024 * 1024))
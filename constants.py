@@ -89,3 +89,23 @@ UNPROFESSIONAL_EMAIL_WORDS = ["cute", "hot", "sexy", "babe", "cool", "princess",
 ATS_UNFRIENDLY_CHARS = ["\u2022", "\u25cf", "\u25aa", "\u25a0", "\u2192", "\u2190",
                          "\u2605", "\u2606", "\u2713", "\u2717", "\u25b6", "\u25c0",
                          "\u2764", "\u2603", "\u263a"]
+
+BULLET_CHARS = ("\u2022", "\u25cf", "\u25aa", "\u25a0", "-", "\u2013", "\u2192", "*",
+                "\u25e6", "\u2023", "\u25ba")
+
+# Words that never start or end a job-description term: function words and
+# posting boilerplate.
+STOP_WORDS = {
+    "ability", "able", "apply", "benefits", "bonus", "company", "employer", "environment", "excellent",
+    "experience", "good", "ideal", "job", "knowledge", "nice", "opportunity", "position", "preferred",
+    "qualifications", "required", "requirements", "responsibilities", "salary", "seeking", "skill",
+    "skills", "strong", "team", "understanding",
+    "a", "about", "above", "across", "after", "all", "also", "an", "and", "any", "are", "as", "at", "be",
+    "been", "being", "both", "but", "by", "can", "candidate", "could", "do", "does", "each", "etc", "for",
+    "from", "have", "has", "having", "how", "if", "in", "including", "into", "is", "it", "its", "join",
+    "looking", "may", "more", "most", "must", "new", "not", "of", "on", "or", "other", "our", "out",
+    "over", "per", "plus", "role", "should", "so", "some", "such", "than", "that", "the", "their", "them",
+    "then", "there", "these", "they", "this", "those", "through", "to", "up", "us", "using", "very",
+    "want", "was", "we", "well", "were", "what", "when", "where", "which", "while", "who", "will", "with",
+    "within", "work", "would", "year", "years", "you", "your",
+}
@@ -0,0 +1,178 @@
+"""Per-request document model shared by the analyzers.
+
+``ResumeDocument`` wraps the extracted text and computes each derived view
+(words, lines, sentences, section spans, pattern matches) the first time it is
+asked for, so a view shared by several checks is built once per request.
+``layout_summary`` is ``layout.summarize`` of the parser's ``layout`` records
+when the caller extracted them; checks fall back on text heuristics when it is
+None.
+"""
+import re
+from collections import Counter
+from functools import cached_property
+from constants import BULLET_CHARS, SECTION_KEYWORDS
+from patterns import PATTERNS, PatternMatches
+
+
+def _is_heading_for(stripped, keyword):
+    if stripped == keyword:
+        return True
+    if stripped.startswith(keyword) and len(stripped) < len(keyword) + 15:
+        return True
+    return keyword in stripped and len(stripped) < 50
+
+
+# No heading rule in _is_heading_for can match a line this long.
+_MAX_HEADING_LEN = max(50, max(len(kw) for kws in SECTION_KEYWORDS.values() for kw in kws) + 15)
+
+
+def heading_keywords(line_lower):
+    """(section, keyword) pairs of ``SECTION_KEYWORDS`` a lowercase line is a heading for."""
+    stripped = line_lower.strip().rstrip(":").strip()
+    if not stripped or len(stripped) >= _MAX_HEADING_LEN:
+        return []
+    return [(section, kw) for section, keywords in SECTION_KEYWORDS.items()
+            for kw in keywords if _is_heading_for(stripped, kw)]
+
+
+# Section text is cut only at lines shaped like a heading: short, mostly the
+# keyword, and free of the digits and punctuation of a sentence or a date.
+_SECTION_BREAK_MAX_LEN = 40
+_SENTENCE_MARKS = re.compile(r"[\d.,;!?@|/()]")
+
+
+def _is_section_break(line_lower, keywords):
+    stripped = line_lower.strip().rstrip(":").strip()
+    if len(stripped) > _SECTION_BREAK_MAX_LEN or _SENTENCE_MARKS.search(stripped):
+        return False
+    return 2 * max(len(kw) for kw in keywords) >= len(stripped)
+
+
+def _line_spans(headings, num_lines):
+    # Each heading runs to the line before the next one.
+    spans = {}
+    for n, (start, names, _) in enumerate(headings):
+        end = headings[n + 1][0] if n + 1 < len(headings) else num_lines
+        for name in names:
+            spans.setdefault(name, []).append((start, end))
+    return spans
+
+
+def heading_sections(line_lower):
+    """Names of the ``SECTION_KEYWORDS`` sections a lowercase line is a heading for."""
+    return list(dict.fromkeys(section for section, _ in heading_keywords(line_lower)))
+
+
+class ResumeDocument:
+    def __init__(self, text, num_pages=1, file_ext="", layout_summary=None):
+        self.text = text
+        self.num_pages = num_pages
+        self.file_ext = file_ext
+        self.layout_summary = layout_summary
+
+    @cached_property
+    def lower(self):
+        return self.text.lower()
+
+    @cached_property
+    def matches(self):
+        return PatternMatches(self.text, self.lower)
+
+    @cached_property
+    def words(self):
+        return self.text.split()
+
+    @cached_property
+    def words_lower(self):
+        return self.lower.split()
+
+    @cached_property
+    def word_freq(self):
+        return Counter(self.words_lower)
+
+    @cached_property
+    def lines(self):
+        return self.text.split("\n")
+
+    @cached_property
+    def lines_lower(self):
+        return self.lower.split("\n")
+
+    @cached_property
+    def non_empty_lines(self):
+        """Stripped lines, blank lines dropped."""
+        return [s for s in (line.strip() for line in self.lines) if s]
+
+    @cached_property
+    def non_empty_lines_lower(self):
+        return [line.lower() for line in self.non_empty_lines]
+
+    @cached_property
+    def bullet_lines(self):
+        return [line for line in self.non_empty_lines if line.startswith(BULLET_CHARS)]
+
+    @cached_property
+    def _counted_sentences(self):
+        # Sentences are filtered by word count, so keep the counts for readability.
+        parts = (s.strip() for s in PATTERNS["sentence_break"].split(self.text))
+        counted = [(s, len(s.split())) for s in parts]
+        return [(s, n) for s, n in counted if n > 2]
+
+    @cached_property
+    def sentences(self):
+        """Stripped sentences of more than two words."""
+        return [s for s, _ in self._counted_sentences]
+
+    @cached_property
+    def sentence_word_counts(self):
+        return [n for _, n in self._counted_sentences]
+
+    @cached_property
+    def paragraphs(self):
+        return self.text.split("\n\n")
+
+    @cached_property
+    def line_offsets(self):
+        """Character offset of the start of each line in ``text``."""
+        offsets = [0]
+        for line in self.lines[:-1]:
+            offsets.append(offsets[-1] + len(line) + 1)
+        return offsets
+
+    @cached_property
+    def headings(self):
+        """``(line, sections, keywords)`` for every heading line, found in one pass."""
+        found = []
+        for i, line in enumerate(self.lines_lower):
+            pairs = heading_keywords(line)
+            if pairs:
+                found.append((i, list(dict.fromkeys(s for s, _ in pairs)), {kw for _, kw in pairs}))
+        return found
+
+    @cached_property
+    def section_spans(self):
+        """Section name -> list of ``(start, end)`` line ranges, heading line included.
+
+        A section runs from its heading to the line before the next heading of
+        any section.
+        """
+        return _line_spans(self.headings, len(self.lines))
+
+    @cached_property
+    def _section_text_spans(self):
+        # Like section_spans, but a line such as "Graduated with honors, May 2019"
+        # stays inside its section instead of starting an "awards" one.
+        breaks = [heading for heading in self.headings
+                  if _is_section_break(self.lines_lower[heading[0]], heading[2])]
+        return _line_spans(breaks, len(self.lines))
+
+    def section_text(self, name):
+        """Text of every ``name`` section, heading lines included; "" if there is none.
+
+        Only heading-shaped lines (see ``_is_section_break``) end a section here.
+        """
+        parts = []
+        for start, end in self._section_text_spans.get(name, ()):
+            stop = self.line_offsets[end] - 1 if end < len(self.lines) else len(self.text)
+            parts.append(self.text[self.line_offsets[start]:stop])
+        return "\n".join(parts)
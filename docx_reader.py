@@ -0,0 +1,282 @@
+"""Stream a DOCX's text straight from the zip, without python-docx's object model.
+
+``paragraphs`` follows the package relationships to the main document part and
+its headers and footers, and iterparses each one into one line per paragraph:
+body text, table cells and text boxes in document order, with the headers
+before the body and the footers after it. Finished elements are dropped as it
+goes, so memory stays flat however long the document is. ``page_count`` reads
+the page count the editor saved in ``docProps/app.xml``.
+
+Given a ``layout`` record, the same pass fills it in: a span per body
+paragraph with its dominant font size and weight (resolved through
+``styles.xml``), the header and footer lines, tables, images, the column count
+and the page size.
+
+Run text follows python-docx's rules (tabs, line breaks and non-breaking
+hyphens), so plain paragraphs read the same through either path.
+"""
+import posixpath
+from collections import Counter
+from xml.etree.ElementTree import iterparse
+from layout import new_record, span
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_P = _W + "p"
+_R = _W + "r"
+_T = _W + "t"
+_BR = _W + "br"
+_BR_TYPE = _W + "type"
+_VAL = _W + "val"
+_RPR = _W + "rPr"
+_TBL = _W + "tbl"
+# Pictures: DrawingML, and VML in older documents.
+_IMAGES = {"{http://schemas.openxmlformats.org/drawingml/2006/main}blip",
+           "{urn:schemas-microsoft-com:vml}imagedata"}
+# Other run content with a text equivalent.
+_RUN_TEXT = {_W + "tab": "\t", _W + "ptab": "\t", _W + "cr": "\n", _W + "noBreakHyphen": "-"}
+# Repeats the mc:Choice content (e.g. a text box) for older readers.
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_RELATIONSHIP = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+_APP = "{http://schemas.openxmlformats.org/officeDocument/2006/extended-properties}"
+
+# Parsed styles parts by content. Documents made from one template share them,
+# and Word's styles.xml alone can take longer to parse than the document.
+_STYLES_CACHE_SIZE = 32
+_styles_cache = {}
+
+
+def _related_parts(archive, part, rel_type):
+    """Names of the parts ``part`` links to with relationships of ``rel_type`` ("" = the package)."""
+    folder, name = posixpath.split(part)
+    try:
+        rels = archive.open(posixpath.join(folder, "_rels", name + ".rels"))
+    except KeyError:
+        return []
+    targets = []
+    with rels:
+        for _, rel in iterparse(rels):
+            # Match on the last segment, which Transitional and Strict packages share.
+            if (rel.tag == _RELATIONSHIP and rel.get("Type", "").endswith("/" + rel_type)
+                    and rel.get("TargetMode") != "External"):
+                target = rel.get("Target", "")
+                if target.startswith("/"):
+                    targets.append(target[1:])
+                else:
+                    targets.append(posixpath.normpath(posixpath.join(folder, target)))
+    return targets
+
+
+def _run_properties(rpr):
+    """(size in points, bold) set by a w:rPr element; None for whatever it leaves unset."""
+    if rpr is None:
+        return None, None
+    size = rpr.find(_W + "sz")
+    bold = rpr.find(_W + "b")
+    if size is not None:
+        try:
+            size = int(size.get(_VAL)) / 2
+        except (TypeError, ValueError):
+            size = None
+    if bold is not None:
+        bold = bold.get(_VAL, "true") not in ("0", "false", "off")
+    return size, bold
+
+
+class _Styles:
+    """Font size and weight of runs, through the style hierarchy in ``styles.xml``."""
+
+    def __init__(self, archive, parts):
+        self.default = (None, None)
+        self.default_paragraph = None
+        self.styles = {}  # style id -> (based on, size, bold)
+        self._resolved = {}
+        for part in parts:
+            with archive.open(part) as stream:
+                for _, elem in iterparse(stream):
+                    if elem.tag == _W + "style":
+                        based_on = elem.find(_W + "basedOn")
+                        style_id = elem.get(_W + "styleId")
+                        self.styles[style_id] = (None if based_on is None else based_on.get(_VAL),
+                                                 *_run_properties(elem.find(_RPR)))
+                        if elem.get(_W + "type") == "paragraph" and elem.get(_W + "default") in ("1", "true", "on"):
+                            self.default_paragraph = style_id
+                        elem.clear()
+                    elif elem.tag == _W + "rPrDefault":
+                        self.default = _run_properties(elem.find(_RPR))
+
+    def resolve(self, size, bold, run_style, paragraph_style):
+        """(size, bold) of a run: its own properties, its character style, its paragraph's style, the defaults."""
+        key = (size, bold, run_style, paragraph_style)
+        if key not in self._resolved:
+            for style_id in (run_style, paragraph_style or self.default_paragraph):
+                for _ in range(10):  # basedOn chains are short; this also stops cycles
+                    if not style_id or (size is not None and bold is not None):
+                        break
+                    style_id, style_size, style_bold = self.styles.get(style_id, (None, None, None))
+                    size = style_size if size is None else size
+                    bold = style_bold if bold is None else bold
+            default_size, default_bold = self.default
+            size = size if size is not None else default_size or 10.0
+            bold = bold if bold is not None else bool(default_bold)
+            self._resolved[key] = size, bold
+        return self._resolved[key]
+
+
+def _styles(archive, main):
+    """The document's ``_Styles``, parsed once per distinct styles part."""
+    parts = _related_parts(archive, main, "styles")
+    # The CRC is checked whenever a part is read, so only genuine parts are cached.
+    key = tuple((info.CRC, info.file_size) for info in map(archive.getinfo, parts))
+    styles = _styles_cache.get(key)
+    if styles is None:
+        styles = _Styles(archive, parts)
+        if len(_styles_cache) >= _STYLES_CACHE_SIZE:
+            _styles_cache.pop(next(iter(_styles_cache)))
+        _styles_cache[key] = styles
+    return styles
+
+
+def _part_paragraphs(archive, part, record=None, styles=None, region="spans"):
+    """Text of each paragraph in a WordprocessingML part, in document order.
+
+    With a ``layout`` ``record``, also counts the part's tables and images into
+    it and adds each non-empty paragraph to ``record[region]``: a span with its
+    dominant font for the body, the plain line for a header or footer.
+    """
+    stack = []  # open elements
+    open_paragraphs = []  # text pieces of each open paragraph; text boxes nest them
+    fallback_depth = 0
+    # With a record: per open paragraph, its style and characters per (size, bold);
+    # per open run, its (size, bold, character style).
+    paragraph_styles = []
+    paragraph_fonts = []
+    runs = []
+    with archive.open(part) as stream:
+        for event, elem in iterparse(stream, events=("start", "end")):
+            if event == "start":
+                stack.append(elem)
+                if elem.tag == _MC_FALLBACK:
+                    fallback_depth += 1
+                elif fallback_depth:
+                    pass
+                elif elem.tag == _P:
+                    open_paragraphs.append([])
+                    if record is not None:
+                        paragraph_styles.append(None)
+                        paragraph_fonts.append(Counter())
+                elif record is not None:
+                    if elem.tag == _R:
+                        runs.append((None, None, None))
+                    elif elem.tag == _TBL:
+                        record["tables"] += 1
+                    elif elem.tag in _IMAGES:
+                        record["images"] += 1
+                continue
+            stack.pop()
+            tag = elem.tag
+            if tag == _MC_FALLBACK:
+                fallback_depth -= 1
+            elif fallback_depth:
+                pass
+            elif tag == _P:
+                text = "".join(open_paragraphs.pop())
+                if record is not None:
+                    fonts = paragraph_fonts.pop()
+                    paragraph_style = paragraph_styles.pop()
+                    if text.strip():
+                        if region != "spans":
+                            record[region].append(text.strip())
+                        else:
+                            size, bold = (fonts.most_common(1)[0][0] if fonts
+                                          else styles.resolve(None, None, None, paragraph_style))
+                            record["spans"].append(span(None, None, size, bold, text))
+                yield text
+                elem.clear()
+            elif open_paragraphs and stack and stack[-1].tag == _R:
+                if tag == _T:
+                    open_paragraphs[-1].append(elem.text or "")
+                    if record is not None and elem.text:
+                        size, bold, run_style = runs[-1]
+                        paragraph_fonts[-1][styles.resolve(size, bold, run_style, paragraph_styles[-1])] += len(elem.text)
+                elif tag == _BR:
+                    if elem.get(_BR_TYPE, "textWrapping") == "textWrapping":
+                        open_paragraphs[-1].append("\n")
+                elif tag in _RUN_TEXT:
+                    open_paragraphs[-1].append(_RUN_TEXT[tag])
+                elif tag == _RPR and record is not None:
+                    run_style = elem.find(_W + "rStyle")
+                    runs[-1] = (*_run_properties(elem), None if run_style is None else run_style.get(_VAL))
+            elif record is not None:
+                if tag == _R:
+                    runs.pop()
+                elif tag == _W + "pStyle" and open_paragraphs and len(stack) > 1 and stack[-2].tag == _P:
+                    paragraph_styles[-1] = elem.get(_VAL)
+                elif tag == _W + "cols":
+                    try:
+                        record["columns"] = max(record["columns"], min(int(elem.get(_W + "num", 1)), 3))
+                    except ValueError:
+                        pass
+                elif tag == _W + "pgSz" and record["width"] is None:
+                    try:
+                        # Twentieths of a point.
+                        record["width"] = int(elem.get(_W + "w")) / 20
+                        record["height"] = int(elem.get(_W + "h")) / 20
+                    except (TypeError, ValueError):
+                        pass
+            if 0 < len(stack) <= 2:
+                # A finished child of the root or of w:body; nothing refers to it again.
+                stack[-1].remove(elem)
+
+
+def _main_part(archive):
+    parts = _related_parts(archive, "", "officeDocument")
+    return parts[0] if parts else "word/document.xml"
+
+
+def _running_parts(archive, main, rel_type, record, styles):
+    """Lines of each distinct header or footer; with a record, counted into it too."""
+    seen = []
+    # Word keeps separate first-page, even-page and default headers; most are identical.
+    for part in _related_parts(archive, main, rel_type):
+        part_record = new_record(tables=0) if record is not None else None
+        lines = list(_part_paragraphs(archive, part, part_record, styles, rel_type))
+        if lines in seen:
+            continue
+        seen.append(lines)
+        if record is not None:
+            record[rel_type].extend(part_record[rel_type])
+            record["tables"] += part_record["tables"]
+            record["images"] += part_record["images"]
+        yield from lines
+
+
+def paragraphs(archive, record=None):
+    """Text of each paragraph in the DOCX open as ``archive`` (a ``zipfile.ZipFile``).
+
+    A ``layout`` ``record`` passed in is filled in as the paragraphs are read.
+    """
+    main = _main_part(archive)
+    styles = _styles(archive, main) if record is not None else None
+    headers = list(_running_parts(archive, main, "header", record, styles))
+    yield from headers
+    yield from _part_paragraphs(archive, main, record, styles)
+    yield from _running_parts(archive, main, "footer", record, styles)
+
+
+def page_count(archive):
+    """The page count saved in the document properties, or None when there is none to trust."""
+    for part in _related_parts(archive, "", "extended-properties"):
+        try:
+            with archive.open(part) as stream:
+                properties = {elem.tag: elem.text for _, elem in iterparse(stream)}
+        except KeyError:
+            return None
+        # Documents generated from a template keep its stale statistics: 1 page, 0 words.
+        if properties.get(_APP + "Words", "").strip() == "0":
+            return None
+        try:
+            pages = int(properties.get(_APP + "Pages") or 0)
+        except ValueError:
+            return None
+        return pages if pages > 0 else None
+    return None
@@ -0,0 +1,92 @@
+"""Stored feature records, so new scoring rules can be applied without re-parsing.
+
+``batch.py --features PATH`` keeps the ``analysis.extract_features`` record of
+every file it scores. Rescoring reads those records back and runs only the
+cheap ``score_features`` half::
+
+    python features.py data/features.sqlite3 > rescored.jsonl
+
+Records written by an older ``FEATURE_VERSION`` are skipped and counted as
+stale in the summary; their files need to go through batch.py again.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from analysis import FEATURE_VERSION, score_features
+from config import FEATURE_STORE_PATH
+from serialization import dumps_text
+
+
+class FeatureStore:
+    def __init__(self, path=FEATURE_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self):
+        # One connection per thread and per process; never shared across a fork.
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS features (key TEXT PRIMARY KEY, file TEXT, "
+                         "version INTEGER, record TEXT, stored REAL)")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def put(self, key, name, record):
+        """Store ``record`` under ``key`` (the document's text digest), replacing an older one."""
+        self._connect().execute("INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?, ?)",
+                                (key, name, record["version"], dumps_text(record), time.time()))
+
+    def records(self, version=FEATURE_VERSION):
+        """(key, file, record) for every stored record of ``version``."""
+        rows = self._connect().execute("SELECT key, file, record FROM features WHERE version = ? ORDER BY key",
+                                       (version,))
+        for key, name, record in rows:
+            yield key, name, json.loads(record)
+
+    def count_stale(self, version=FEATURE_VERSION):
+        return self._connect().execute("SELECT COUNT(*) FROM features WHERE version != ?",
+                                       (version,)).fetchone()[0]
+
+
+def iter_rescored(store):
+    """Yield a result per stored record, then a summary record."""
+    started = time.perf_counter()
+    count = 0
+    for key, name, record in store.records():
+        count += 1
+        yield {"file": name, "key": key, "result": score_features(record)}
+
+    elapsed = time.perf_counter() - started
+    yield {"summary": {
+        "rescored": count,
+        "stale": store.count_stale(),
+        "elapsed_s": round(elapsed, 3),
+        "docs_per_sec": round(count / elapsed, 2) if elapsed else 0,
+    }}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rescore stored feature records with the current scoring rules.")
+    parser.add_argument("database", nargs="?", default=FEATURE_STORE_PATH)
+    parser.add_argument("-o", "--output", help="write to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for record in iter_rescored(FeatureStore(args.database)):
+            out.write(dumps_text(record) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""Compact analyzer findings and the catalog their messages are rendered from.
+
+Analyzers record a finding as a message code, a severity and the values the
+message needs; the text is only produced when a result is serialized. Every
+message lives in ``MESSAGES``, so wording changes and translations happen in
+one place: pass another catalog to ``Finding.render``/``to_dict``.
+"""
+from collections import Counter
+
+MESSAGES = {
+    # Resume Sections
+    "sections.essential_found": "'{section}' section found",
+    "sections.essential_missing": "Missing '{section}' section — this is essential for ATS parsing",
+    "sections.recommended_found": "'{section}' section found — helps recruiters quickly assess your profile",
+    "sections.recommended_missing": "No '{section}' section — a strong summary can boost recruiter interest by 36%",
+    "sections.bonus_found": "Bonus sections found: {names}",
+    "sections.bonus_missing": "Consider adding: Certifications, Projects, Awards, or Languages to strengthen your resume",
+    "sections.total": "Total sections detected: {count} ({names})",
+
+    # Contact Information
+    "contact.email_unprofessional": "Email found ({email}) but may seem unprofessional — use firstname.lastname format",
+    "contact.email_professional": "Professional email found: {email}",
+    "contact.email_found": "Email address found: {email}",
+    "contact.email_missing": "No email address found — this is critical for ATS systems to contact you",
+    "contact.phone_found": "Phone number detected",
+    "contact.phone_missing": "No phone number found — recruiters need a way to call you",
+    "contact.linkedin_keyword": "LinkedIn reference found (URL may be hyperlinked in original — PDF extraction can break links)",
+    "contact.linkedin_url": "LinkedIn profile URL detected",
+    "contact.linkedin_missing": "No LinkedIn URL — 87% of recruiters use LinkedIn; add your profile link",
+    "contact.github_keyword": "GitHub reference found (URL may be hyperlinked in original — PDF extraction can break links)",
+    "contact.github_url": "GitHub profile URL detected",
+    "contact.website_found": "Portfolio/Website link detected",
+    "contact.portfolio_missing": "No portfolio/GitHub link — consider adding one to stand out",
+    "contact.location_found": "Location information detected",
+    "contact.location_missing": "No location detected — some employers filter by location, add city/state or 'Remote'",
+
+    # Keyword Optimization
+    "keywords.outstanding": "Outstanding keyword density — {count} ATS-relevant keywords detected",
+    "keywords.strong": "Strong keyword presence — {count} keywords that ATS systems scan for",
+    "keywords.moderate": "Moderate keyword density ({count}) — tailor keywords to match specific job descriptions",
+    "keywords.low": "Low keyword density ({count}) — you may be filtered out by ATS keyword matching",
+    "keywords.very_few": "Very few ATS keywords — your resume may not pass keyword-based screening",
+    "keywords.top": "Most emphasized keywords: {keywords}",
+    "keywords.detected": "Keywords detected: {keywords}",
+    "keywords.pro_tip": "Pro tip: Copy keywords directly from the job description you're applying to — ATS systems match exact phrases",
+
+    # Action Verbs
+    "verbs.outstanding": "Outstanding use of action verbs — {count} strong verbs across {categories} categories",
+    "verbs.excellent": "Excellent action verb usage — {count} verbs found in {categories} categories",
+    "verbs.good_start": "Good start with {count} action verbs — aim for 10+ different verbs",
+    "verbs.few": "Only {count} action verbs found — start every bullet point with a strong action verb",
+    "verbs.very_few": "Very few action verbs — replace 'was responsible for' with verbs like Developed, Led, Implemented",
+    "verbs.category": "{category}: {verbs}",
+    "verbs.missing_categories": "Missing verb categories — try adding: {suggestions}",
+    "verbs.weak_phrases": "Weak phrases detected: '{phrases}' — replace with specific action verbs",
+    "verbs.no_weak_phrases": "No weak/passive phrases detected — your language is strong",
+
+    # Measurable Results
+    "results.exceptional": "Exceptional quantification — {count} measurable results found across your resume",
+    "results.strong": "Strong metrics usage — {count} quantifiable results found",
+    "results.moderate": "Moderate metrics ({count} found) — add numbers to at least 50% of your bullet points",
+    "results.few": "Only {count} measurable result(s) — quantify more achievements for stronger impact",
+    "results.none": "No quantifiable results found — this is a major gap. Add numbers, percentages, and dollar amounts",
+    "results.examples": "{metric}: {examples}",
+    "results.add_percentages": "Tip: Add percentages (e.g., 'Improved performance by 40%', 'Reduced costs by 25%')",
+    "results.add_financial": "Tip: Include financial impact where possible (e.g., 'Managed $500K budget', 'Generated $2M revenue')",
+
+    # Formatting & Structure
+    "formatting.one_page": "Single-page resume — ideal for most positions",
+    "formatting.two_pages": "Two-page resume — acceptable for experienced professionals",
+    "formatting.too_many_pages": "{pages}-page resume detected — keep it to 1–2 pages unless you have 10+ years of experience",
+    "formatting.words_optimal": "Optimal word count: {count} words (ideal range: 400–800)",
+    "formatting.words_slightly_short": "Slightly short ({count} words) — aim for 400–800 words to provide enough detail",
+    "formatting.words_slightly_long": "Slightly long ({count} words) — consider trimming less relevant details",
+    "formatting.words_too_short": "Too short ({count} words) — your resume needs more content to be competitive",
+    "formatting.words_too_long": "Too long ({count} words) — recruiters spend 7 seconds on initial scan, be concise",
+    "formatting.bullets_excellent": "Excellent bullet point usage ({count} bullet lines, {percent}% of content)",
+    "formatting.bullets_good": "Good bullet usage ({count} bullets) — could add a few more for readability",
+    "formatting.bullets_limited": "Limited bullet points ({count} found) — restructure experience as bullet points for better ATS parsing",
+    "formatting.bullets_none": "Almost no bullet points — ATS systems and recruiters strongly prefer bulleted experience",
+    "formatting.dates_proper": "Proper date formatting ({years} years, {months} months detected)",
+    "formatting.dates_present": "Current position indicated with 'Present' — ATS can parse employment timeline",
+    "formatting.dates_no_months": "Year dates found ({years}) but no month names — use 'Jan 2023 – Present' format for best ATS parsing",
+    "formatting.dates_missing": "No date information detected — add employment and education dates (e.g., 'Sep 2021 – Jun 2024')",
+    "formatting.long_lines": "{count} very long lines detected — break up dense paragraphs into shorter bullet points",
+    "formatting.line_length_ok": "Content has good line-length distribution — readable for both ATS and humans",
+    "formatting.excessive_caps": "Excessive ALL CAPS text ({count} lines) — use title case for headings instead",
+    "formatting.caps_ok": "Appropriate use of capitalization for section headings",
+    "formatting.font_sizes_many": "{count} different font sizes in use — stick to one for body text and one or two for headings",
+    "formatting.fonts_consistent": "Consistent typography — {count} font size(s) in use, easy to scan for recruiters",
+    "formatting.font_small": "Some text is set in {size:g}pt — keep body text at 10–12pt so it stays readable",
+
+    # Readability
+    "readability.no_sentences": "Could not analyze sentence structure",
+    "readability.sentence_length_good": "Good sentence length — avg {average} words per sentence (ideal: 10–20)",
+    "readability.sentence_length_concise": "Concise writing — avg {average} words per sentence (clear and scannable)",
+    "readability.sentence_length_long": "Long sentences — avg {average} words. Break complex sentences into shorter ones",
+    "readability.no_long_sentences": "No overly long sentences — maintains recruiter attention",
+    "readability.some_long_sentences": "{count} sentence(s) over 25 words — consider shortening for clarity",
+    "readability.many_long_sentences": "{count} sentences exceed 25 words — recruiters scan, not read; keep it concise",
+    "readability.vocabulary_clear": "Clear vocabulary — professional yet accessible language",
+    "readability.vocabulary_technical": "Vocabulary is mostly clear with some technical jargon (appropriate for specialized roles)",
+    "readability.vocabulary_complex": "Heavy use of complex words — ensure jargon is industry-standard and necessary",
+    "readability.density_ok": "Good content density — no large text blocks that overwhelm readers",
+    "readability.dense_paragraphs": "{count} dense paragraph(s) found — break into bullet points for better readability",
+
+    # Hard Skills
+    "skills.excellent": "Excellent hard skill coverage — {count} technical skills across {categories} categories",
+    "skills.strong": "Strong technical skills — {count} hard skills detected in {categories} categories",
+    "skills.decent": "Decent technical skills ({count}) — add more relevant skills from job descriptions",
+    "skills.limited": "Limited hard skills ({count}) — technical skills are crucial for ATS filtering",
+    "skills.very_few": "Very few technical skills detected — ATS systems heavily weight hard skills for filtering",
+    "skills.category": "{category}: {skills}",
+    "skills.missing_categories": "Categories not represented: {categories}",
+
+    # Work Experience
+    "experience.full_ranges": "{count} proper date ranges found (Month Year – Month Year) — ideal for ATS",
+    "experience.ranges_no_months": "{count} date range(s) found but missing month names — use 'Jan 2022 – Mar 2024' format",
+    "experience.one_range": "Only 1 date range found — add start/end dates for every position",
+    "experience.no_ranges": "No employment date ranges detected — ATS needs dates to build your work timeline",
+    "experience.career_span": "Career spans {span} years ({first}–{last})",
+    "experience.years": "Year(s) found: {years}",
+    "experience.titles_clear": "Clear job titles detected ({count}): {titles}",
+    "experience.titles_some": "Job title(s) found: {titles} — ensure each position has a clear title",
+    "experience.titles_missing": "No recognizable job titles — use standard titles like 'Software Engineer', 'Project Manager'",
+    "experience.companies": "Companies identified ({count}): {names}",
+    "experience.one_company": "1 company found: {name} — make sure all employers are clearly listed",
+    "experience.companies_missing": "No clear company names detected — list full company names (e.g., 'Google LLC', 'Acme Technologies')",
+    "experience.current_role": "Current position indicated ('Present') — ATS understands you're currently employed",
+    "experience.no_current_role": "No 'Present' date found — if currently employed, mark your latest role as '... – Present'",
+    "experience.locations": "Work location(s) detected: {locations}",
+
+    # Education
+    "education.degree_found": "Degree level detected: {degrees}",
+    "education.degree_missing": "No degree type found — specify your degree (e.g., Bachelor of Science, Master of Arts, MBA)",
+    "education.field_found": "Field of study: {fields}",
+    "education.field_missing": "No field of study detected — include your major (e.g., 'BS in Computer Science')",
+    "education.institution_found": "Institution(s): {institutions}",
+    "education.institution_missing": "No institution name detected — include your university or college name",
+    "education.years_found": "Education year(s): {years}",
+    "education.years_missing": "No graduation year found in education section — add your graduation year or expected graduation",
+    "education.gpa": "GPA listed: {gpa}",
+    "education.honors": "Academic honors: {honors}",
+    "education.gpa_honors_missing": "No GPA or honors found — include GPA if 3.0+ or list academic honors",
+
+    # ATS Compatibility
+    "compatibility.pdf": "PDF format — universally accepted by ATS systems",
+    "compatibility.docx": "DOCX format — excellent ATS compatibility (preferred by many systems)",
+    "compatibility.special_chars_none": "No problematic special characters — clean text for ATS parsing",
+    "compatibility.special_chars_some": "Some special characters found that may not parse correctly in all ATS systems",
+    "compatibility.special_chars_many": "Multiple special characters detected — replace symbols with standard text equivalents",
+    "compatibility.header_footer_none": "No headers/footers detected — ATS often misreads content in headers/footers",
+    "compatibility.header_footer_possible": "Possible header/footer content — some ATS systems skip header/footer areas",
+    "compatibility.header_footer_found": "{count} lines in page headers/footers — some ATS systems skip these areas, so keep contact details in the body",
+    "compatibility.table_layout": "Possible table/column layout detected — ATS may scramble multi-column layouts; use single-column format",
+    "compatibility.columns": "{columns}-column layout detected — ATS may read across the columns and scramble your content; use a single column",
+    "compatibility.tables": "{count} table(s) found — ATS often reads table cells out of order; use plain paragraphs and bullets instead",
+    "compatibility.layout_ok": "Layout appears ATS-friendly — no complex table structures detected",
+    "compatibility.images": "Image references detected — ATS cannot read images; ensure all info is in text form",
+    "compatibility.images_found": "{count} image(s) in the file — ATS cannot read images; ensure all info is in text form",
+    "compatibility.no_images": "No image-only content detected — all content is text-based and parseable",
+
+    # Consistency
+    "consistency.mixed_tense": "Mixed verb tenses (past: ~{past}, present: ~{present}) — use past tense for previous roles, present for current",
+    "consistency.consistent_tense": "Consistent verb tense — primarily {tense} tense with appropriate variation",
+    "consistency.past_tense": "Consistent use of past tense — appropriate for describing completed work",
+    "consistency.present_tense": "Present tense usage — appropriate for current role",
+    "consistency.tense_unknown": "Could not determine verb tense pattern",
+    "consistency.no_first_person": "No first-person pronouns — correct resume writing style",
+    "consistency.some_first_person": "Found {count} first-person pronoun(s) (I/my/me) — resumes should omit these",
+    "consistency.many_first_person": "{count} first-person pronouns found — remove all 'I', 'my', 'me' from your resume",
+    "consistency.terminology_ok": "Consistent terminology — no mixed abbreviations detected",
+    "consistency.mixed_abbreviations": "Mixed abbreviations: {pairs} — pick one form and use it consistently",
+
+    # Any check
+    "check.timed_out": "This check took too long on your document and was skipped — very long lines or unusual symbols can cause this",
+}
+
+
+class Finding:
+    __slots__ = ("type", "code", "args")
+
+    def __init__(self, type, code, args=None):
+        self.type = type
+        self.code = code
+        self.args = args
+
+    def render(self, catalog=MESSAGES):
+        template = catalog[self.code]
+        return template.format(**self.args) if self.args else template
+
+    @property
+    def message(self):
+        return self.render()
+
+    def to_dict(self, catalog=MESSAGES):
+        return {"type": self.type, "message": self.render(catalog)}
+
+    def __eq__(self, other):
+        if not isinstance(other, Finding):
+            return NotImplemented
+        return (self.type, self.code, self.args) == (other.type, other.code, other.args)
+
+    def __repr__(self):
+        return f"Finding({self.type!r}, {self.code!r}, {self.args!r})"
+
+
+class Findings(list):
+    """A check's findings, with a running count per type.
+
+    ``counts`` follows every list method that adds, replaces or removes a
+    finding. Item and slice assignment, ``del`` and ``*=`` count again; the
+    others adjust the count of the one type they touch.
+    """
+    __slots__ = ("counts",)
+
+    def __init__(self, items=()):
+        super().__init__(items)
+        self._recount()
+
+    def _recount(self):
+        self.counts = Counter(f.type for f in self)
+
+    def add(self, type, code, **args):
+        self.append(Finding(type, code, args))
+
+    def append(self, finding):
+        super().append(finding)
+        self.counts[finding.type] += 1
+
+    def extend(self, findings):
+        findings = list(findings)
+        super().extend(findings)
+        self.counts.update(f.type for f in findings)
+
+    def __iadd__(self, findings):
+        self.extend(findings)
+        return self
+
+    def insert(self, index, finding):
+        super().insert(index, finding)
+        self.counts[finding.type] += 1
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._recount()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._recount()
+
+    def __imul__(self, n):
+        super().__imul__(n)
+        self._recount()
+        return self
+
+    def pop(self, index=-1):
+        finding = super().pop(index)
+        self.counts[finding.type] -= 1
+        return finding
+
+    def remove(self, finding):
+        super().remove(finding)
+        self.counts[finding.type] -= 1
+
+    def clear(self):
+        super().clear()
+        self.counts.clear()
+
+
+def finding_type(finding):
+    """Type of a ``Finding`` or of one already rendered to a dict, e.g. read back from a cache."""
+    return finding.type if isinstance(finding, Finding) else finding["type"]
+
+
+def json_default(o):
+    """``default`` hook for ``json.dumps``: renders findings to their message dicts."""
+    if isinstance(o, Finding):
+        return o.to_dict()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
@@ -0,0 +1,14 @@
+# Load the app once in the master and warm it before forking workers, so
+# every worker starts with the parsers imported and the analysis state built.
+preload_app = True
+
+
+def on_starting(server):
+    from app import warmup
+    warmup()
+
+
+def post_fork(server, worker):
+    # Each worker forks its own parser subprocesses, already warm, before serving.
+    from sandbox import start_pool
+    start_pool()
@@ -0,0 +1,157 @@
+"""Background analysis for large or slow uploads.
+
+``submit`` records a job in SQLite and hands the upload to a process pool, so
+the request that created it returns at once. Workers write their progress to
+the same database, which lets any gunicorn worker answer ``GET /api/jobs/<id>``.
+A job moves through ``queued`` -> ``running`` -> ``done`` or ``error``.
+
+The pool belongs to the server process that submitted the job: jobs still
+queued when that process exits are lost, and their records expire after
+``JOB_TTL`` seconds like every other job. Where no pool can be started, a
+job runs to completion inside the request that submits it.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from analysis import score_text
+from batch import read_file
+from config import JOB_DB_PATH, JOB_TTL, JOB_WORKERS
+from sandbox import process_context
+from serialization import dumps_text
+
+FINISHED = ("done", "error")
+
+
+class JobStore:
+    def __init__(self, path=JOB_DB_PATH, ttl=JOB_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+
+    def _connect(self):
+        # One connection per thread and per process; never shared across a fork.
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, file TEXT, "
+                         "status TEXT, result TEXT, error TEXT, created REAL, updated REAL)")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def create(self, name):
+        conn = self._connect()
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        conn.execute("INSERT INTO jobs VALUES (?, ?, 'queued', NULL, NULL, ?, ?)", (job_id, name, now, now))
+        conn.execute("DELETE FROM jobs WHERE updated <= ?", (now - self.ttl,))
+        return job_id
+
+    def update(self, job_id, status, result=None, error=None):
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, updated = ? WHERE id = ?",
+            (status, None if result is None else dumps_text(result), error, time.time(), job_id))
+
+    def get(self, job_id):
+        """The job as a response dict, or None if it is unknown or expired."""
+        row = self._connect().execute(
+            "SELECT file, status, result, error FROM jobs WHERE id = ? AND updated > ?",
+            (job_id, time.time() - self.ttl)).fetchone()
+        if row is None:
+            return None
+        name, status, result, error = row
+        job = {"id": job_id, "file": name, "status": status}
+        if result is not None:
+            job["result"] = json.loads(result)
+        if error is not None:
+            job["error"] = error
+        return job
+
+
+store = JobStore()
+
+
+def run_job(job_id, name, data):
+    """Parse and score one upload, recording the outcome on the job."""
+    store.update(job_id, "running")
+    try:
+        text, num_pages, file_ext, truncated, layout_summary = read_file(name, data)
+        result = score_text(text, num_pages, file_ext, layout_summary=layout_summary)
+        if truncated:
+            result["truncated"] = True
+    except Exception as e:
+        store.update(job_id, "error", error=str(e) or type(e).__name__)
+    else:
+        store.update(job_id, "done", result=result)
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """This process's job pool, or None where one cannot be started."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            try:
+                # Created inside a request, so never forked from this worker and its client socket.
+                _pool = ProcessPoolExecutor(max_workers=JOB_WORKERS, mp_context=process_context())
+            except (OSError, ValueError):
+                # e.g. serverless runtimes without /dev/shm.
+                return None
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+
+
+def submit(name, data):
+    """Queue an upload for analysis and return its job ID.
+
+    Without a pool the upload is analysed before this returns, so the job
+    is already finished when the client first polls it.
+    """
+    pool = _get_pool()
+    job_id = store.create(name)
+    if pool is None:
+        run_job(job_id, name, data)
+        return job_id
+
+    def _on_done(future):
+        # A worker that died never got to record its own failure.
+        if future.exception() is not None:
+            store.update(job_id, "error", error=type(future.exception()).__name__)
+            if isinstance(future.exception(), BrokenProcessPool):
+                _discard_pool(pool)
+
+    try:
+        pool.submit(run_job, job_id, name, data).add_done_callback(_on_done)
+    except BrokenProcessPool:
+        # A worker died and took the pool with it; later jobs get a new one.
+        _discard_pool(pool)
+        run_job(job_id, name, data)
+    return job_id
+
+
+def wait_for_change(job_id, status, timeout, interval=0.25):
+    """Poll until the job leaves ``status`` or ``timeout`` seconds pass; return the job."""
+    deadline = time.monotonic() + timeout
+    job = store.get(job_id)
+    while job is not None and job["status"] == status and time.monotonic() < deadline:
+        time.sleep(interval)
+        job = store.get(job_id)
+    return job
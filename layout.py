@@ -0,0 +1,161 @@
+"""Layout records: how and where each page's text is set.
+
+``parsers.extract_text(..., layout=True)`` builds one record per PDF page in the
+same pass that extracts its text; a DOCX, which has no fixed pages, gets one
+record for the whole document::
+
+    {"width": 612.0, "height": 792.0,           # points; None where unknown
+     "spans": [[x, y, size, bold, text], ...],  # x/y from the bottom left; None for DOCX
+     "columns": 1,
+     "tables": 0,                               # None where the format cannot tell (PDF)
+     "images": 0,
+     "header": ["..."], "footer": ["..."]}      # lines in the real header/footer regions
+
+Records are plain lists and dicts, so they cross the parser sandbox as they
+are. ``summarize`` reduces them to the figures the analyzers read; that
+summary, not the records, is what ``ResumeDocument`` and the text cache hold.
+"""
+import math
+import re
+from collections import Counter
+
+# Part of EXTRACTION_KEY; bump when records change shape or meaning.
+LAYOUT_VERSION = 2
+
+# Header and footer bands, as a share of the page height.
+_BAND = 0.08
+# A second column starts in this part of the page width...
+_COLUMN_RANGE = (0.2, 0.75)
+# ...with at least this many spans starting within _COLUMN_ALIGN points of each
+# other, holding at least this share of the page's characters.
+_COLUMN_MIN_SPANS = 5
+_COLUMN_MIN_SHARE = 0.15
+_COLUMN_ALIGN = 8
+# Rough average glyph width, in ems, for placing the end of a span.
+_GLYPH_WIDTH = 0.5
+_PAGE_NUMBER = re.compile(r"(?:page\s*)?#(?:\s*(?:of|/)\s*#)?")
+_BOLD_NAMES = ("bold", "black", "heavy", "semibold", "demi")
+
+
+def new_record(width=None, height=None, tables=None):
+    return {"width": width, "height": height, "spans": [], "columns": 1, "tables": tables, "images": 0,
+            "header": [], "footer": []}
+
+
+def span(x, y, size, bold, text):
+    return [None if x is None else round(x, 1), None if y is None else round(y, 1),
+            None if size is None else round(size * 2) / 2, bool(bold), text]
+
+
+def is_bold_font(name, weight=None):
+    return bool(weight and weight >= 600) or any(word in (name or "").lower() for word in _BOLD_NAMES)
+
+
+def _merge(spans):
+    """Join spans that continue one another on the same line in the same font."""
+    merged = []
+    for s in spans:
+        if merged:
+            x, y, size, bold, text = merged[-1]
+            if (s[2] == size and s[3] == bold and abs(s[1] - y) < 0.5 * (size or 1)
+                    and x <= s[0] <= x + (len(text) * _GLYPH_WIDTH + 2) * (size or 1)):
+                merged[-1][4] = f"{text} {s[4]}"
+                continue
+        merged.append(s)
+    return merged
+
+
+def _columns(spans, width):
+    """How many columns of text the page is set in (1-3), from aligned span starts."""
+    if not width:
+        return 1
+    total = sum(len(s[4]) for s in spans)
+    low, high = (width * share for share in _COLUMN_RANGE)
+    starts = sorted((s[0], len(s[4])) for s in spans if low < s[0] < high)
+    columns = 1
+    first = None
+    count = chars = 0
+    for x, n in starts + [(math.inf, 0)]:
+        if first is None or x - first > _COLUMN_ALIGN:
+            if count >= _COLUMN_MIN_SPANS and chars >= _COLUMN_MIN_SHARE * total:
+                columns += 1
+            first, count, chars = x, 0, 0
+        count += 1
+        chars += n
+    return min(columns, 3)
+
+
+def page_record(width, height, spans, images=0):
+    """The record of a PDF page from its positioned spans, in reading order."""
+    record = new_record(width and round(width, 1), height and round(height, 1))
+    record["spans"] = _merge([s for s in spans if s[4]])
+    record["columns"] = _columns(record["spans"], width)
+    record["images"] = images
+    return record
+
+
+def _band(record, s):
+    if not record["height"] or s[1] is None:
+        return None
+    if s[1] > record["height"] * (1 - _BAND):
+        return "header"
+    if s[1] < record["height"] * _BAND:
+        return "footer"
+    return None
+
+
+def _repeat_key(text):
+    return re.sub(r"\d+", "#", text.strip().lower())
+
+
+def mark_header_footer(records):
+    """Move PDF spans that belong to a running header or footer out of ``spans``.
+
+    A span in the top or bottom band of a page is header or footer text when the
+    same line (numbers aside) is in that band on another page too, or when it
+    is a bare page number. Anything else there, like the name at the top of
+    page one, stays in the body.
+    """
+    seen = Counter()  # (band, line) -> pages it is on
+    for record in records:
+        lines = set()
+        for s in record["spans"]:
+            band = _band(record, s)
+            if band:
+                lines.add((band, _repeat_key(s[4])))
+        seen.update(lines)
+    for record in records:
+        body = []
+        for s in record["spans"]:
+            band = _band(record, s)
+            key = _repeat_key(s[4])
+            if band and (seen[band, key] > 1 or _PAGE_NUMBER.fullmatch(key)):
+                record[band].append(s[4])
+            else:
+                body.append(s)
+        record["spans"] = body
+    return records
+
+
+def summarize(records):
+    """The figures the analyzers read from a document's layout records, or None without any.
+
+    The summary is a few hundred bytes whatever the document's size, and plain
+    JSON: ``font_sizes`` is ``[[size, characters], ...]``, smallest size first.
+    """
+    if not records:
+        return None
+    sizes = Counter()
+    for record in records:
+        for _, _, size, _, text in record["spans"]:
+            if size:
+                sizes[size] += len(text)
+    tables = [record["tables"] for record in records]
+    return {
+        "pages": len(records),
+        "columns": max((record["columns"] for record in records), default=1),
+        "tables": None if None in tables else sum(tables),
+        "images": sum(record["images"] for record in records),
+        "header_footer": sum(len(record["header"]) + len(record["footer"]) for record in records),
+        "font_sizes": sorted([size, chars] for size, chars in sizes.items()),
+    }
@@ -0,0 +1,35 @@
+"""Wall-clock limits for CPU-bound work such as PDF page parsing.
+
+``time_limit`` arms a SIGALRM timer, which only works in the main thread of a
+process on platforms with ``signal.setitimer``. Elsewhere it does nothing and
+the work runs unbounded, as before.
+"""
+import signal
+import threading
+from contextlib import contextmanager
+
+
+class TimeLimitExceeded(Exception):
+    pass
+
+
+def _raise_time_limit(signum, frame):
+    raise TimeLimitExceeded()
+
+
+def time_limits_available():
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+@contextmanager
+def time_limit(seconds):
+    if not seconds or not time_limits_available():
+        yield
+        return
+    previous = signal.signal(signal.SIGALRM, _raise_time_limit)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
@@ -0,0 +1,107 @@
+"""Aho-Corasick multi-keyword matcher.
+
+Keywords are added with a group (e.g. ``"hard_skills"``) and an optional
+category, then ``build()`` links the trie. ``scan()`` walks the text once and
+reports every keyword found, regardless of how many keywords are registered.
+"""
+from collections import deque
+
+
+def _is_word_char(ch):
+    # Same definition as \w in the re module for str patterns.
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordHits:
+    """Keywords found by one scan, kept in registration order."""
+
+    def __init__(self, automaton, tag_ids):
+        self._tags = automaton.tags
+        self._ids = sorted(tag_ids)
+
+    def matched(self, group):
+        return [self._tags[i][2] for i in self._ids if self._tags[i][0] == group]
+
+    def by_category(self, group):
+        found = {}
+        for i in self._ids:
+            tag_group, category, keyword = self._tags[i][:3]
+            if tag_group == group:
+                found.setdefault(category, []).append(keyword)
+        return found
+
+
+class KeywordAutomaton:
+    def __init__(self):
+        self.tags = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._built = False
+
+    def add(self, keyword, group, category=None, word_start=False, word_end=False):
+        """Register ``keyword`` (matched case-sensitively against the scanned text).
+
+        ``word_start`` requires the match to begin at a word boundary, like a
+        leading ``\\b`` in a regex, and ``word_end`` forbids a word character
+        right after it; otherwise any substring occurrence counts.
+        """
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(len(self.tags))
+        self.tags.append((group, category, keyword, word_start, word_end))
+        self._built = False
+
+    def build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._delta = [dict(row) for row in self._goto]
+        self._built = True
+        return self
+
+    def _step(self, state, ch):
+        # Resolve a transition through the failure links and memoise it.
+        origin = state
+        while state and ch not in self._goto[state]:
+            state = self._fail[state]
+        nxt = self._goto[state].get(ch, 0)
+        self._delta[origin][ch] = nxt
+        return nxt
+
+    def scan(self, text):
+        if not self._built:
+            self.build()
+        delta, out, tags = self._delta, self._out, self.tags
+        found = set()
+        state = 0
+        for i, ch in enumerate(text):
+            nxt = delta[state].get(ch)
+            state = nxt if nxt is not None else self._step(state, ch)
+            if out[state]:
+                for tag_id in out[state]:
+                    if tag_id in found:
+                        continue
+                    if tags[tag_id][3]:
+                        begin = i - len(tags[tag_id][2]) + 1
+                        if begin > 0 and _is_word_char(text[begin - 1]):
+                            continue
+                    if tags[tag_id][4] and i + 1 < len(text) and _is_word_char(text[i + 1]):
+                        continue
+                    found.add(tag_id)
+        return KeywordHits(self, found)
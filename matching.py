@@ -0,0 +1,185 @@
+"""Score resumes against one job description.
+
+``build_job_index`` reads a job description once: the dictionary skills it
+asks for (split into required and preferred by its headings) and its most
+frequent terms and phrases, compiled into one keyword automaton. Scoring a
+resume is then a single pass over its text for the terms and one for the
+skills, however many resumes are scored against the same index.
+
+Indexes are kept per process by job ID (``get_job_index``), so a posting is
+compiled once for all of its applicants. The description behind each ID also
+goes into a ``make_cache`` cache, so with ``CACHE_BACKEND=sqlite`` any gunicorn
+worker can rebuild an index it has not compiled yet.
+"""
+import re
+from collections import Counter
+from cache import MemoryCache, digest_text, make_cache
+from config import JOB_INDEX_CACHE_SIZE
+from constants import HARD_SKILLS, SOFT_SKILLS, STOP_WORDS
+from matcher import KeywordAutomaton
+
+# Lowercase tokens; keeps "c++", "c#", "node.js" and "ci-cd" whole.
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*")
+# N-grams never span punctuation or line breaks.
+_PHRASE_BREAK = re.compile(r"[\n,;:()\[\]|/•●▪■–—!?]|\.\s")
+_PREFERRED_HEADING = re.compile(r"\b(?:preferred|nice to have|bonus|plus|desirable|optional)\b")
+_REQUIRED_HEADING = re.compile(r"\b(?:requirements?|required|qualifications|must|responsibilities|what you)\b")
+_MAX_HEADING_LEN = 60
+
+MAX_TERMS = 30
+SKILL_GROUPS = ("hard_skills", "soft_skills")
+# Share of the match score given to each component when the posting has it.
+WEIGHTS = {"required_skills": 55, "preferred_skills": 15, "terms": 30}
+
+
+def _build_skills():
+    # Whole words only: the analyzers' substring KEYWORDS find "r " in "senior "
+    # and "java" in "javascript", which would be skills the posting never asked for.
+    automaton = KeywordAutomaton()
+    for group, skills in zip(SKILL_GROUPS, (HARD_SKILLS, SOFT_SKILLS)):
+        for names in skills.values():
+            for name in names:
+                automaton.add(name.lower().strip(), group, word_start=True, word_end=True)
+    return automaton.build()
+
+
+_SKILLS = _build_skills()
+
+
+def _find_skills(text_lower):
+    """Dictionary skills in ``text_lower`` as whole words, each once, in dictionary order."""
+    hits = _SKILLS.scan(text_lower)
+    return list(dict.fromkeys(skill for group in SKILL_GROUPS for skill in hits.matched(group)))
+
+
+def _skill_lines(lines_lower):
+    """Yield (line, preferred) with ``preferred`` set under a nice-to-have heading."""
+    preferred = False
+    for line in lines_lower:
+        stripped = line.strip()
+        if stripped and len(stripped) <= _MAX_HEADING_LEN:
+            if _PREFERRED_HEADING.search(stripped):
+                preferred = True
+            elif _REQUIRED_HEADING.search(stripped):
+                preferred = False
+        yield line, preferred
+
+
+def _terms(text_lower, skills):
+    """The MAX_TERMS most weighted 1-3 word terms of the posting, as {term: weight}.
+
+    Dictionary skills, and single words of multi-word skills, are left to the
+    skill components.
+    """
+    skill_words = {word for skill in skills for word in skill.split()}
+    counts = Counter()
+    for phrase in _PHRASE_BREAK.split(text_lower):
+        tokens = _TOKEN.findall(phrase)
+        for n in (1, 2, 3):
+            for i in range(len(tokens) - n + 1):
+                gram = tokens[i:i + n]
+                if gram[0] in STOP_WORDS or gram[-1] in STOP_WORDS:
+                    continue
+                if n == 1 and (len(gram[0]) < 3 or gram[0].isdigit() or gram[0] in skill_words):
+                    continue
+                counts[" ".join(gram)] += 1
+
+    # Drop parts of a repeated phrase that never occur without the rest of it.
+    redundant = set()
+    for term, count in counts.items():
+        words = term.split()
+        if count < 2:
+            continue
+        for n in range(1, len(words)):
+            for i in range(len(words) - n + 1):
+                part = " ".join(words[i:i + n])
+                if counts.get(part) == count:
+                    redundant.add(part)
+
+    # Phrases count for more than single words and must repeat to qualify.
+    weighted = [(count * len(term.split()), term) for term, count in counts.items()
+                if term not in skills and term not in redundant and (count > 1 or " " not in term)]
+    weighted.sort(key=lambda item: -item[0])
+    return {term: weight for weight, term in weighted[:MAX_TERMS]}
+
+
+class JobIndex:
+    def __init__(self, job_id, text):
+        self.job_id = job_id
+        self.digest = digest_text(text)
+        text_lower = text.lower()
+
+        required, preferred = {}, {}
+        for line, is_preferred in _skill_lines(text_lower.split("\n")):
+            for skill in _find_skills(line):
+                (preferred if is_preferred else required)[skill] = True
+        self.required_skills = list(required)
+        self.preferred_skills = [s for s in preferred if s not in required]
+
+        self.terms = _terms(text_lower, required.keys() | preferred.keys())
+        self._automaton = KeywordAutomaton()
+        for term in self.terms:
+            self._automaton.add(term, "terms", word_start=True, word_end=True)
+        self._automaton.build()
+
+    def score(self, doc):
+        """Match of one ResumeDocument against this posting."""
+        have = set(_find_skills(doc.lower))
+        matched_terms = self._automaton.scan(doc.lower).matched("terms")
+
+        components = []
+        result = {"job_id": self.job_id}
+        for name, skills in (("required_skills", self.required_skills), ("preferred_skills", self.preferred_skills)):
+            found = [s for s in skills if s in have]
+            result[name] = {"matched": found, "missing": [s for s in skills if s not in have]}
+            if skills:
+                components.append((WEIGHTS[name], len(found) / len(skills)))
+        if self.terms:
+            matched_weight = sum(self.terms[t] for t in matched_terms)
+            components.append((WEIGHTS["terms"], matched_weight / sum(self.terms.values())))
+        matched = set(matched_terms)
+        result["terms"] = {"matched": [t for t in self.terms if t in matched],
+                           "missing": [t for t in self.terms if t not in matched]}
+
+        total_weight = sum(weight for weight, _ in components)
+        result["match_score"] = round(100 * sum(w * c for w, c in components) / total_weight) if total_weight else 0
+        return result
+
+    def summary(self):
+        return {"job_id": self.job_id, "required_skills": self.required_skills,
+                "preferred_skills": self.preferred_skills, "terms": list(self.terms)}
+
+
+_indexes = MemoryCache(max_entries=JOB_INDEX_CACHE_SIZE)
+# Shared by every worker process with the sqlite backend, unlike the compiled indexes.
+_descriptions = make_cache("job_description")
+
+
+def build_job_index(text, job_id=None):
+    """Compile ``text`` and cache it under ``job_id`` (the text's digest by default)."""
+    index = JobIndex(job_id or digest_text(text)[:16], text)
+    _indexes.set(index.job_id, index)
+    _descriptions.set(index.job_id, text)
+    return index
+
+
+def get_job_index(job_id=None, text=None):
+    """The cached index for ``job_id``, rebuilt if ``text`` is given and has changed.
+
+    With only ``job_id``, an index another process built is rebuilt from its
+    stored description. Returns None when that description is unknown or expired.
+    """
+    if text is None:
+        if not job_id:
+            return None
+        index = _indexes.get(job_id)
+        if index is None:
+            text = _descriptions.get(job_id)
+            if text is not None:
+                index = JobIndex(job_id, text)
+                _indexes.set(job_id, index)
+        return index
+    index = _indexes.get(job_id or digest_text(text)[:16])
+    if index is None or index.digest != digest_text(text):
+        index = build_job_index(text, job_id)
+    return index
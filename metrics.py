@@ -0,0 +1,83 @@
+"""Per-stage latency for /api/check, exposed as Server-Timing and on /metrics.
+
+A ``StageTimer`` collects the stages of one request and feeds every duration
+into ``STAGE_LATENCY``, a Prometheus histogram rendered by ``render()``.
+Recording is a ``perf_counter`` pair, a bisect and a locked increment, so it
+stays on in production. Histograms are per process: with several gunicorn
+workers each scrape sees the worker that served it.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self, name, help_text, label, buckets=BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value, seconds):
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                # One count per bucket plus +Inf, then the running sum.
+                series = self._series[label_value] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += seconds
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {value: list(series) for value, series in self._series.items()}
+        for value, series in sorted(snapshot.items()):
+            label = f'{self.label}="{value}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{label}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+STAGE_LATENCY = Histogram("ats_stage_duration_seconds",
+                          "Time spent in each stage of /api/check.", "stage")
+
+
+def render():
+    return STAGE_LATENCY.render()
+
+
+class StageTimer:
+    def __init__(self):
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stages.append((name, elapsed))
+            STAGE_LATENCY.observe(name, elapsed)
+
+    def as_dict(self):
+        """Stage -> milliseconds, in the order the stages finished."""
+        return {name: round(seconds * 1000, 2) for name, seconds in self.stages}
+
+    def server_timing(self):
+        return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.stages)
+
+
+class NullTimer:
+    def stage(self, name):
+        return nullcontext()
@@ -1,34 +1,225 @@
-from PyPDF2 import PdfReader
-from docx import Document
-from config import ALLOWED_EXTENSIONS
+import io
+import re
+import zipfile
+import zlib
+from xml.etree import ElementTree
+from config import (ALLOWED_EXTENSIONS, PDF_PAGE_TIME_BUDGET, PDF_BACKEND, MAX_DECOMPRESSED_BYTES, MAX_PDF_PAGES,
+                    MAX_EXTRACTED_CHARS)
+import docx_reader
+from layout import LAYOUT_VERSION, mark_header_footer, new_record
+from limits import TimeLimitExceeded, time_limit
+from pdf_backends import select
+
+NO_TEXT_ERROR = "Could not extract text. The file may be image-based — use a text-based resume."
+DAMAGED_DOCX_ERROR = "This DOCX is damaged or is not a Word document — save it again and re-upload."
+
+# In the order they are tried; see pdf_backends.
+PDF_BACKENDS = select(PDF_BACKEND)
+
+# Part of the text cache key: text extracted under other limits, backends or layout
+# record formats is not reused.
+EXTRACTION_KEY = (f"{MAX_DECOMPRESSED_BYTES}-{MAX_PDF_PAGES}-{MAX_EXTRACTED_CHARS}-"
+                  f"{'+'.join(backend.name for backend in PDF_BACKENDS)}-layout{LAYOUT_VERSION}")
+
+# pdfminer writes "(cid:N)" for glyphs it cannot map to text.
+_UNMAPPED_GLYPHS = re.compile(r"\(cid:\d+\)|\ufffd")
+
+
+class UploadTooLarge(ValueError):
+    """The upload expands past ``MAX_DECOMPRESSED_BYTES`` and cannot be read in part."""
+
+
+def load_parsers():
+    """Import the PDF and DOCX libraries.
+
+    They are the slowest imports in the app, so they load on first use instead
+    of at startup; ``app.warmup`` calls this to load them ahead of time.
+    Returns the PDF backends in the order they are tried and the DOCX
+    ``Document`` class.
+    """
+    for backend in PDF_BACKENDS:
+        backend.load()
+    from docx import Document
+    return PDF_BACKENDS, Document
 
 
 def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
-def extract_text_from_pdf(filepath):
-    text = ""
-    reader = PdfReader(filepath)
-    num_pages = len(reader.pages)
-    for page in reader.pages:
-        page_text = page.extract_text()
-        if page_text:
-            text += page_text + "\n"
-    return text, num_pages
+def _page_text(backend, page, layout=False):
+    """(text, layout record or None) of one page."""
+    # A page that overruns its budget contributes no text instead of holding the worker.
+    try:
+        with time_limit(PDF_PAGE_TIME_BUDGET):
+            if layout:
+                return backend.page_layout(page)
+            return backend.page_text(page), None
+    except TimeLimitExceeded:
+        return "", new_record() if layout else None
+
+
+def _read_pages(backend, pages, max_bytes, max_chars, layout=False):
+    """(texts, records, truncated): page texts in order, stopping at either limit (0 = none).
+
+    ``records`` holds each page's ``layout`` record when ``layout`` is set, and
+    is empty otherwise. The byte limit applies only to backends with an
+    ``inflation_guard``.
+    """
+    texts = []
+    records = []
+    content_bytes = 0
+    chars = 0
+    for page in pages:
+        if max_chars and chars >= max_chars:
+            return texts, records, True
+        if max_bytes and backend.inflation_guard:
+            content_bytes += backend.content_size(page, max_bytes - content_bytes)
+            if content_bytes > max_bytes:
+                return texts, records, True
+        text, record = _page_text(backend, page, layout)
+        texts.append(text)
+        if layout:
+            records.append(record)
+        chars += len(text)
+    return texts, records, False
+
+
+def _cap_text(text, truncated):
+    if MAX_EXTRACTED_CHARS and len(text) > MAX_EXTRACTED_CHARS:
+        return text[:MAX_EXTRACTED_CHARS], True
+    return text, truncated
+
+
+def _usable(text):
+    return re.search(r"[^\W_]", _UNMAPPED_GLYPHS.sub("", text)) is not None
+
+
+def _extract_with(backend, source, layout=False):
+    doc = backend.open(source)
+    try:
+        num_pages = backend.page_count(doc)
+        pages = min(num_pages, MAX_PDF_PAGES) if MAX_PDF_PAGES else num_pages
+        extracted = _read_pages(backend, backend.pages(doc, 0, pages), MAX_DECOMPRESSED_BYTES,
+                                MAX_EXTRACTED_CHARS, layout)
+    finally:
+        backend.close(doc)
+    texts, records, truncated = extracted
+    text = "".join(t + "\n" for t in texts if t)
+    text, truncated = _cap_text(text, truncated or pages < num_pages)
+    return text, num_pages, truncated, mark_header_footer(records) if layout else None
+
+
+def extract_text_from_pdf(source, backends=None, layout=False):
+    """``(text, num_pages, truncated)`` from the first backend that finds usable text.
+
+    ``backends`` defaults to ``PDF_BACKENDS``. A backend that raises or finds
+    only whitespace or unmapped glyphs hands over to the next. If none finds
+    usable text, the first backend's result is returned, or its error raised.
+    ``layout=True`` tries backends that can build ``layout`` records first and
+    adds the records (or None) as a fourth item.
+    """
+    backends = backends or PDF_BACKENDS
+    if layout:
+        backends = sorted(backends, key=lambda backend: not backend.layout)
+    result = error = None
+    for backend in backends:
+        try:
+            extracted = _extract_with(backend, source, layout and backend.layout)
+        except MemoryError:
+            raise
+        except Exception as e:
+            error = error or e
+            continue
+        if _usable(extracted[0]):
+            return extracted if layout else extracted[:3]
+        result = result or extracted
+    if result is None:
+        raise error
+    return result if layout else result[:3]
+
+
+def _check_docx_size(archive):
+    # Declared sizes are binding: zipfile stops at them and fails the CRC check.
+    if MAX_DECOMPRESSED_BYTES:
+        expanded = sum(info.file_size for info in archive.infolist())
+        if expanded > MAX_DECOMPRESSED_BYTES:
+            raise UploadTooLarge("This DOCX expands to more than "
+                                 f"{MAX_DECOMPRESSED_BYTES // (1024 * 1024)} MB — save it again without embedded media")
+
+
+def _join_lines(lines):
+    """(text, truncated): ``lines`` joined up to ``MAX_EXTRACTED_CHARS``, read no further."""
+    parts = []
+    chars = 0
+    truncated = False
+    for line in lines:
+        if MAX_EXTRACTED_CHARS and chars > MAX_EXTRACTED_CHARS:
+            truncated = True
+            break
+        parts.append(line)
+        chars += len(line) + 1
+    return _cap_text("\n".join(parts), truncated)
+
+
+def _docx_object_model_text(source):
+    # python-docx sees body paragraphs only, but copes with some packages the stream reader cannot.
+    _, Document = load_parsers()
+    if not isinstance(source, str):
+        source.seek(0)
+    return _join_lines(paragraph.text for paragraph in Document(source).paragraphs)
+
+
+def extract_text_from_docx(source, layout=False):
+    """``(text, num_pages, truncated)``, streamed from the zip by ``docx_reader``.
+
+    Falls back to python-docx's object model if the stream reader fails on the
+    XML. A file that is not a zip, or has a part that fails its CRC check or
+    cannot be inflated, raises ValueError with ``DAMAGED_DOCX_ERROR``.
+    ``num_pages`` is the saved page count, or an estimate of 450 words a page.
+    ``layout=True`` adds the document's one ``layout`` record, in a list, or
+    None after the fallback.
+    """
+    record = new_record(tables=0) if layout else None
+    try:
+        with zipfile.ZipFile(source) as archive:
+            _check_docx_size(archive)
+            lines = docx_reader.paragraphs(archive, record)
+            try:
+                text, truncated = _join_lines(lines)
+                num_pages = docx_reader.page_count(archive)
+            except (ElementTree.ParseError, KeyError):
+                text, truncated = _docx_object_model_text(source)
+                num_pages = None
+                record = None
+            finally:
+                lines.close()
+    except (zipfile.BadZipFile, zlib.error, EOFError) as e:
+        raise ValueError(DAMAGED_DOCX_ERROR) from e
+    extracted = (text, num_pages or max(1, len(text.split()) // 450), truncated)
+    if layout:
+        return extracted + ([record] if record else None,)
+    return extracted
 
 
-def extract_text_from_docx(filepath):
-    doc = Document(filepath)
-    text = "\n".join(p.text for p in doc.paragraphs)
-    page_estimate = max(1, len(text.split()) // 450)
-    return text, page_estimate
+def extract_text(source, file_ext=None, layout=False):
+    """Extract text from a path, a seekable binary file object or raw bytes.
 
+    Returns ``(text, num_pages, truncated)``. ``truncated`` is True when a
+    ``MAX_*`` limit in config stopped extraction early; the text is then the
+    part read so far. A DOCX that expands past ``MAX_DECOMPRESSED_BYTES``
+    raises ``UploadTooLarge``.
 
-def extract_text(filepath):
-    ext = filepath.rsplit(".", 1)[1].lower()
+    ``file_ext`` is required unless ``source`` is a path with an extension.
+    ``layout=True`` adds a fourth item, the document's ``layout`` records,
+    built in the same pass; it is None when the parser that succeeded cannot
+    produce them.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    ext = (file_ext or source.rsplit(".", 1)[1]).lower()
     if ext == "pdf":
-        return extract_text_from_pdf(filepath)
+        return extract_text_from_pdf(source, layout=layout)
     elif ext == "docx":
-        return extract_text_from_docx(filepath)
-    return "", 0
+        return extract_text_from_docx(source, layout)
+    return ("", 0, False, None) if layout else ("", 0, False)
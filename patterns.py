@@ -0,0 +1,339 @@
+"""Regular expressions used by the analyzers, compiled once at import time.
+
+``PatternMatches`` is the per-request scan stage: each registered pattern runs
+at most once per source text, so checks that look for the same thing (years,
+LinkedIn URLs, email addresses) share one scan instead of repeating it.
+"""
+import re
+from constants import ACTION_VERBS_BY_CATEGORY, HARD_SKILLS, SOFT_SKILLS, WEAK_VERBS
+from matcher import KeywordAutomaton
+
+MONTH = r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+YEAR = r"(?:19|20)\d{2}"
+
+_STOP_OR_DIGIT = re.compile(r"[.\d]")
+_WHITESPACE_RUN = re.compile(r"\s{2,}")
+_TOKEN = re.compile(r"\S+")
+
+
+class KeywordThenNumber:
+    """``\\b(?:keywords)\\b[^.]*?\\d+`` without its quadratic worst case.
+
+    The plain regex rescans up to the next full stop from every keyword that
+    has no number after it. Here one such scan rules out every keyword before
+    the same full stop. Each match is still produced by the plain regex, so
+    results are identical.
+    """
+
+    def __init__(self, keywords, flags=0):
+        self.keyword = re.compile(rf"\b(?:{keywords})\b", flags)
+        self.pattern = re.compile(rf"\b(?:{keywords})\b[^.]*?\d+", flags)
+
+    def finditer(self, text):
+        pos = 0
+        while True:
+            keyword = self.keyword.search(text, pos)
+            if keyword is None:
+                return
+            stop = _STOP_OR_DIGIT.search(text, keyword.end())
+            if stop is None:
+                return
+            if stop.group() == ".":
+                pos = stop.end()
+                continue
+            match = self.pattern.match(text, keyword.start())
+            yield match
+            pos = match.end()
+
+    def search(self, text):
+        return next(self.finditer(text), None)
+
+    def findall(self, text):
+        return [m.group() for m in self.finditer(text)]
+
+
+class TableLayout:
+    """``\\t{2,}|\\s{4,}\\S+\\s{4,}\\S+`` without rescanning long whitespace runs.
+
+    Whether the second branch matches inside a whitespace run depends only on
+    how much of the run is left and on what follows the run, so each run is
+    inspected once instead of once per character. Matches come from the plain
+    regex at the starts found here.
+    """
+
+    def __init__(self):
+        self.pattern = re.compile(r"\t{2,}|\s{4,}\S+\s{4,}\S+")
+
+    def finditer(self, text):
+        # Single spaces can start neither branch, so only longer runs are visited.
+        runs = [m.span() for m in _WHITESPACE_RUN.finditer(text)]
+        pos = 0
+        for i, (start, end) in enumerate(runs):
+            if end <= pos:
+                continue
+            # A token, a run of 4+ whitespace and another token follow this run.
+            two_tokens_follow = False
+            if i + 1 < len(runs) and end < len(text):
+                next_start, next_end = runs[i + 1]
+                two_tokens_follow = next_end - next_start >= 4 and next_end < len(text) \
+                    and _TOKEN.match(text, end).end() == next_start
+            p = max(start, pos)
+            while p < end:
+                if text.startswith("\t\t", p) or (two_tokens_follow and end - p >= 4):
+                    match = self.pattern.match(text, p)
+                    yield match
+                    p = pos = match.end()
+                    continue
+                p = text.find("\t\t", p + 1, end)
+                if p < 0:
+                    break
+
+    def search(self, text):
+        return next(self.finditer(text), None)
+
+    def findall(self, text):
+        return [m.group() for m in self.finditer(text)]
+
+
+class AnchoredPattern:
+    """A regex that is only tried shortly before matches of a cheaper anchor.
+
+    Every match of ``pattern`` must contain an ``anchor`` match starting at
+    most ``reach`` characters after its own start. Text with no anchor in
+    range is skipped without running ``pattern`` at all.
+    """
+
+    def __init__(self, pattern, anchor, reach):
+        self.pattern = pattern
+        self.anchor = anchor
+        self.reach = reach
+
+    def finditer(self, text):
+        pos = 0
+        while True:
+            anchor = self.anchor.search(text, pos)
+            if anchor is None:
+                return
+            for start in range(max(pos, anchor.start() - self.reach), anchor.start() + 1):
+                match = self.pattern.match(text, start)
+                if match:
+                    yield match
+                    pos = match.end()
+                    break
+            else:
+                pos = anchor.start() + 1
+
+    def search(self, text):
+        return next(self.finditer(text), None)
+
+    def findall(self, text):
+        return [m.group() for m in self.finditer(text)]
+
+
+_COMPANY_SUFFIX = (r"Inc\.?|LLC|Ltd\.?|Corp\.?|Corporation|Company|Co\.|"
+                   r"Technologies|Solutions|Services|Group|Labs|Studio|Consulting|Partners|"
+                   r"Enterprises|Systems|Software|Digital|Media|Agency|Foundation|Institute")
+
+PATTERNS = {
+    # whitespace normalisation
+    "whitespace": re.compile(r"\s+"),
+
+    # contact
+    # Email matches only start at the beginning of a run of address characters.
+    # A match from inside a run implies one from its start, so the first match
+    # (these are only ever searched) is unchanged, while a run with no "@" after
+    # it is read once instead of once per character. The leading lookahead keeps
+    # the re module's fast scan for a first character. confidence_email likewise.
+    "email": re.compile(r"(?=[a-zA-Z0-9._%+\-])(?<![a-zA-Z0-9._%+\-])[a-zA-Z0-9._%+\-]+\s*@\s*[a-zA-Z0-9.\-]+\.\s*[a-zA-Z]{2,}"),
+    "email_strict": re.compile(r"(?=[a-zA-Z0-9._%+\-])(?<![a-zA-Z0-9._%+\-])[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}"),
+    "phone": re.compile(r"[\+]?[\d\s\-\(\)]{7,15}"),
+    "linkedin_url": re.compile(r"linkedin\.com/in/[\w\-]+", re.IGNORECASE),
+    "linkedin_url_spaced": re.compile(r"linkedin\s*\.\s*com\s*/\s*in\s*/\s*[\w\-]+", re.IGNORECASE),
+    "linkedin_url_loose": re.compile(r"linkedin\.?com/?in/?[\w\-]+"),
+    "linkedin_word": re.compile(r"\blinkedin\b"),
+    "github_url": re.compile(r"github\.com/[\w\-]+", re.IGNORECASE),
+    "github_url_spaced": re.compile(r"github\s*\.\s*com\s*/\s*[\w\-]+", re.IGNORECASE),
+    "github_url_loose": re.compile(r"github\.?com/?[\w\-]+"),
+    "github_word": re.compile(r"\bgithub\b"),
+    "website_url": re.compile(r"(?:portfolio|website|http|www\.)\S+", re.IGNORECASE),
+    "website_word": re.compile(r"\b(?:portfolio|website)\b"),
+    "location_word": re.compile(r"\b(?:city|state|country|zip|located in|based in|remote|hybrid)\b"),
+    "city_state": re.compile(r"\b[A-Z][a-z]+,\s*[A-Z]{2}\b"),
+    "city_country": re.compile(r"\b[A-Z][a-z]+,\s*[A-Z][a-z]+\b"),
+
+    # experience
+    "full_date_range": re.compile(
+        rf"{MONTH}\.?\s*{YEAR}\s*[–\-—to]+\s*(?:{MONTH}\.?\s*{YEAR}|present|current|now|ongoing)",
+        re.IGNORECASE),
+    "year_date_range": re.compile(
+        rf"\b{YEAR}\s*[–\-—to]+\s*(?:{YEAR}|present|current|now|ongoing)\b", re.IGNORECASE),
+    "year": re.compile(rf"\b({YEAR})\b"),
+    "job_title": re.compile(
+        r"\b(?:software engineer|web developer|data scientist|product manager|project manager|"
+        r"frontend developer|backend developer|full[- ]stack developer|devops engineer|"
+        r"ui/?ux designer|graphic designer|business analyst|data analyst|data engineer|"
+        r"machine learning engineer|cloud engineer|qa engineer|systems engineer|"
+        r"marketing manager|sales manager|operations manager|hr manager|account manager|"
+        r"cto|ceo|cfo|coo|vp of\s+\w+|vice president|team lead|tech lead|"
+        r"senior\s+\w+\s+\w+|junior\s+\w+|lead\s+\w+|principal\s+\w+|staff\s+\w+|"
+        r"head of\s+\w+|director of\s+\w+)\b",
+        re.IGNORECASE),
+    # A company name is at most 31 characters of words before its suffix.
+    "company": AnchoredPattern(
+        re.compile(rf"\b\w[\w\s&]{{1,30}}(?:{_COMPANY_SUFFIX})\b", re.IGNORECASE),
+        re.compile(_COMPANY_SUFFIX, re.IGNORECASE), reach=31),
+    "current_role": re.compile(r"\b(?:present|current|ongoing)\b", re.IGNORECASE),
+    "work_location": re.compile(r"\b[A-Z][a-z]+,\s*[A-Z]{2}\b|\b(?:remote|hybrid|on-?site)\b", re.IGNORECASE),
+
+    # education
+    "field_of_study": re.compile(
+        r"\b(?:computer science|information technology|software engineering|"
+        r"electrical engineering|mechanical engineering|civil engineering|"
+        r"data science|mathematics|statistics|physics|chemistry|biology|"
+        r"business administration|finance|accounting|economics|marketing|"
+        r"communications|psychology|political science|english|history|"
+        r"graphic design|information systems|cybersecurity|"
+        r"business analytics|data analytics|data engineering|data science|"
+        r"software engineering|web development|mobile development|"
+        r"artificial intelligence|machine learning)\b",
+        re.IGNORECASE),
+    "institution": re.compile(
+        r"\b(?:university|college|institute|school|academy|polytechnic)\s+(?:of\s+)?[A-Z][\w\s,]{2,40}",
+        re.IGNORECASE),
+    "named_institution": re.compile(
+        r"\b(?:MIT|Stanford|Harvard|Oxford|Cambridge|Berkeley|UCLA|NYU|Georgia Tech|"
+        r"Carnegie Mellon|Caltech|Princeton|Yale|Columbia|Cornell|UPenn|"
+        r"IIT|LUMS|NUST|FAST|COMSATS|NED|UET|GIKI|PIEAS)\b",
+        re.IGNORECASE),
+    "education_heading": re.compile(r"\b(?:education|academic|qualification)\b"),
+    "gpa": re.compile(r"\b(?:gpa|cgpa|grade)[:\s]*(\d+\.?\d*)\s*/?\s*(\d+\.?\d*)?\b", re.IGNORECASE),
+    "honors": re.compile(
+        r"\b(?:cum laude|magna cum laude|summa cum laude|dean'?s list|honor(?:s|'s)?\s*(?:roll|society)?|"
+        r"distinction|first class|second class|merit)\b",
+        re.IGNORECASE),
+
+    # formatting
+    "month": re.compile(rf"\b({MONTH})\b", re.IGNORECASE),
+    "present": re.compile(r"(?:present|current|ongoing)", re.IGNORECASE),
+
+    # ATS compatibility
+    "table_layout": TableLayout(),
+    "image_reference": re.compile(r"\[image\]|\[photo\]|\[logo\]|\.(?:png|jpg|jpeg|gif|svg)\b", re.IGNORECASE),
+
+    # measurable results
+    # A number starts at the first digit of its run of digits and dots; the
+    # group drops any leading dots so findall returns what it always has.
+    "percentage": re.compile(r"(?=[\d.])(?<![\d.])\.*(\d[\d.]*\s*%)"),
+    "dollars": re.compile(
+        r"(?=[\d.$])(?:(?<![\d.])\.*|(?=\$))(\$\s*[\d,]+[\.\d]*[KMBkmb]?|\d[\d.]*\s*(?:dollars|USD))", re.IGNORECASE),
+    "people_metric": re.compile(
+        r"(?=[\d,])(?<![\d,])[\d,]+\s*(?:users|clients|customers|members|employees|people|students|attendees|team members|engineers)",
+        re.IGNORECASE),
+    "time_metric": re.compile(r"(?=[\d,])(?<![\d,])[\d,]+\s*(?:hours|days|weeks|months|years|minutes)", re.IGNORECASE),
+    "quantity_metric": re.compile(
+        r"(?=[\d,])(?<![\d,])[\d,]+\s*(?:projects|applications|features|tickets|deployments|releases|reports|repositories|"
+        r"systems|servers|databases)",
+        re.IGNORECASE),
+    "improvement_phrase": KeywordThenNumber(
+        r"increased|decreased|reduced|improved|grew|saved|generated|boosted|cut|raised|doubled|tripled",
+        re.IGNORECASE),
+
+    # readability
+    "sentence_break": re.compile(r"[.!?]+"),
+
+    # consistency
+    "past_tense": re.compile(r"\b\w+ed\b"),
+    "present_tense": re.compile(
+        r"\b(?:manage|develop|lead|create|design|implement|build|maintain|coordinate|optimize|analyze|deliver|"
+        r"support|organize)\b",
+        re.IGNORECASE),
+    "first_person": re.compile(r"\b(?:I|my|me|myself)\b"),
+
+    # resume confidence
+    "confidence_email": re.compile(r"(?=[\w.+-])(?<![\w.+-])[\w.+-]+\s*@\s*[\w-]+\s*\.\s*[\w.]+"),
+    "confidence_phone": re.compile(r"(?:\+?\d[\d\s\-().]{7,}\d)"),
+    "confidence_date_range": re.compile(
+        r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\w*\.?\s*\d{4}\s*[–\-—to]+"),
+    "confidence_year_range": re.compile(r"\b20\d{2}\s*[–\-—]\s*(?:20\d{2}|present|current)\b"),
+}
+
+DEGREE_PATTERNS = {
+    "Doctorate/PhD": re.compile(r"\b(?:ph\.?d\.?|doctorate|doctor of)\b", re.IGNORECASE),
+    "Master's": re.compile(
+        r"\b(?:master(?:'?s)?\s+(?:of|in|degree)|msc|mba|m\.?eng\.?|m\.?tech\.?)\b", re.IGNORECASE),
+    "Bachelor's": re.compile(
+        r"\b(?:bachelor(?:'?s)?\s+(?:of|in|degree)|bsc|b\.?eng\.?|b\.?tech\.?|b\.?s\.?\s+in)\b", re.IGNORECASE),
+    "Associate's": re.compile(r"\b(?:associate(?:'?s)?\s+(?:of|in|degree))\b", re.IGNORECASE),
+    "Diploma": re.compile(r"\b(?:diploma\s+in|diploma\s+of)\b", re.IGNORECASE),
+    "MS": re.compile(r"\b(?:master of science|master of science in)\b", re.IGNORECASE),
+    "MBA": re.compile(
+        r"\b(?:master of business administration|master of business administration in)\b", re.IGNORECASE),
+    "MEng": re.compile(r"\b(?:master of engineering|master of engineering in)\b", re.IGNORECASE),
+    "MTECH": re.compile(r"\b(?:master of technology|master of technology in)\b", re.IGNORECASE),
+}
+
+
+def _build_keywords():
+    automaton = KeywordAutomaton()
+    for cat, skills in HARD_SKILLS.items():
+        for skill in skills:
+            automaton.add(skill.lower(), "hard_skills", cat)
+    for cat, skills in SOFT_SKILLS.items():
+        for skill in skills:
+            automaton.add(skill.lower(), "soft_skills", cat)
+    # Action verbs match at the start of a word, so "led" also counts "leading".
+    for cat, verbs in ACTION_VERBS_BY_CATEGORY.items():
+        for verb in verbs:
+            automaton.add(verb, "action_verbs", cat, word_start=True)
+    for phrase in WEAK_VERBS:
+        automaton.add(phrase, "weak_verbs")
+    return automaton.build()
+
+
+KEYWORDS = _build_keywords()
+
+
+class PatternMatches:
+    """Memoised scan results for one document.
+
+    Sources are ``text`` (as extracted), ``lower``, ``collapsed`` (whitespace
+    runs folded to one space) and ``no_spaces`` (lowercase, whitespace removed).
+    """
+
+    def __init__(self, text, text_lower=None):
+        self._sources = {"text": text, "lower": text_lower if text_lower is not None else text.lower()}
+        self._results = {}
+
+    def source(self, name):
+        if name not in self._sources:
+            if name == "collapsed":
+                self._sources[name] = PATTERNS["whitespace"].sub(" ", self._sources["text"])
+            elif name == "no_spaces":
+                self._sources[name] = PATTERNS["whitespace"].sub("", self._sources["lower"])
+            else:
+                raise KeyError(f"Unknown scan source: {name}")
+        return self._sources[name]
+
+    def search(self, key, source="text"):
+        cache_key = ("search", key, source)
+        if cache_key not in self._results:
+            self._results[cache_key] = PATTERNS[key].search(self.source(source))
+        return self._results[cache_key]
+
+    def findall(self, key, source="text"):
+        cache_key = ("findall", key, source)
+        if cache_key not in self._results:
+            self._results[cache_key] = PATTERNS[key].findall(self.source(source))
+        return self._results[cache_key]
+
+    def keywords(self):
+        """Every dictionary keyword in the lowercase text, from a single automaton pass."""
+        if "keywords" not in self._results:
+            self._results["keywords"] = KEYWORDS.scan(self._sources["lower"])
+        return self._results["keywords"]
+
+    def degrees(self):
+        if "degrees" not in self._results:
+            text = self._sources["text"]
+            self._results["degrees"] = [name for name, pattern in DEGREE_PATTERNS.items() if pattern.search(text)]
+        return self._results["degrees"]
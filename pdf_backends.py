@@ -0,0 +1,513 @@
+"""PDF text extraction backends and the order they are tried in.
+
+Each backend wraps one library behind the same small interface and declares
+what it can do:
+
+* ``speed``: relative cost on text-heavy resumes, lowest first, as measured
+  by the ``parse_pdf:<name>`` stages of ``python -m benchmarks.run``,
+* ``inflation_guard``: page content and form XObject streams can be sized
+  before they are decoded, so ``MAX_DECOMPRESSED_BYTES`` is enforced page by page. Backends
+  without it rely on the parser sandbox's memory limit.
+* ``layout``: ``page_layout`` returns a ``layout`` record of the page (font
+  sizes, weights and positions) in the same pass as its text.
+
+``PDF_BACKEND`` is ``auto`` (every installed backend, fastest first) or a
+comma-separated list in order of preference, e.g. ``pdfminer,pypdf2``.
+``parsers.extract_text_from_pdf`` moves on to the next backend when one raises
+or finds no usable text. Only PyPDF2 is a hard requirement; the others are
+used when installed.
+"""
+import base64
+import ctypes
+import importlib
+import importlib.util
+import io
+import math
+import threading
+import zlib
+from layout import is_bold_font, page_record, span
+
+
+_CHUNK = 64 * 1024
+
+
+def _flate(chunks):
+    inflater = zlib.decompressobj()
+    for data in chunks:
+        while data and not inflater.eof:
+            try:
+                yield inflater.decompress(data, _CHUNK)
+            except zlib.error:
+                return  # the PDF library reports the broken stream itself
+            data = inflater.unconsumed_tail
+
+
+def _ascii_hex(chunks):
+    carry = b""
+    for data in chunks:
+        data = carry + bytes(data).translate(None, b" \t\r\n\f\x00")
+        end = data.find(b">")
+        if end >= 0:
+            data = data[:end] + (b"0" if end % 2 else b"")
+        carry = data[len(data) - len(data) % 2:]
+        try:
+            yield bytes.fromhex(data[:len(data) - len(carry)].decode("latin-1"))
+        except ValueError:
+            return
+        if end >= 0:
+            return
+
+
+def _ascii_85(chunks):
+    carry = b""
+    for data in chunks:
+        data = carry + bytes(data).translate(None, b" \t\r\n\f\x00")
+        if data.startswith(b"<~"):
+            data = data[2:]
+        end = data.find(b"~")
+        if end >= 0:
+            data = data[:end]
+        # Decode up to the last whole group; "z" stands for a group on its own.
+        i = 0
+        while i < len(data):
+            if data[i] == 0x7a:
+                i += 1
+            elif i + 5 <= len(data):
+                i += 5
+            else:
+                break
+        if end >= 0:
+            i = len(data)
+        data, carry = data[:i], data[i:]
+        try:
+            yield base64.a85decode(data)
+        except ValueError:
+            return
+        if end >= 0:
+            return
+
+
+def _run_length(chunks):
+    carry = b""
+    for data in chunks:
+        data = carry + bytes(data)
+        out = bytearray()
+        i = 0
+        while i < len(data):
+            length = data[i]
+            if length == 128:
+                yield bytes(out)
+                return
+            if length < 128:
+                if i + length + 2 > len(data):
+                    break
+                out += data[i + 1:i + length + 2]
+                i += length + 2
+            else:
+                if i + 2 > len(data):
+                    break
+                out += data[i + 1:i + 2] * (257 - length)
+                i += 2
+            if len(out) >= _CHUNK:
+                yield bytes(out)
+                out.clear()
+        carry = data[i:]
+        yield bytes(out)
+
+
+def _lzw(chunks):
+    # EarlyChange 1, the PDF default: codes widen one entry before the table needs it.
+    initial = [bytes([i]) for i in range(256)] + [b"", b""]
+    table = list(initial)
+    previous = None
+    width = 9
+    buffer = bits = 0
+    out = bytearray()
+    for data in chunks:
+        for byte in data:
+            buffer = (buffer << 8) | byte
+            bits += 8
+            while bits >= width:
+                bits -= width
+                code = buffer >> bits
+                buffer &= (1 << bits) - 1
+                if code == 256:
+                    table = list(initial)
+                    previous = None
+                    width = 9
+                    continue
+                if code == 257:
+                    yield bytes(out)
+                    return
+                if code < len(table):
+                    entry = table[code]
+                    if previous is not None and len(table) < 4096:
+                        table.append(previous + entry[:1])
+                elif code == len(table) and previous is not None:
+                    entry = previous + previous[:1]
+                    table.append(entry)
+                else:
+                    yield bytes(out)
+                    return  # corrupt; the PDF library reports it
+                out += entry
+                previous = entry
+                if len(table) + 1 >= 1 << width and width < 12:
+                    width += 1
+            if len(out) >= _CHUNK:
+                yield bytes(out)
+                out.clear()
+    yield bytes(out)
+
+
+# Decoders of the filters a page content stream can use, each from an iterable
+# of byte chunks to one of decoded chunks, so a chain is decoded a piece at a time.
+_DECODERS = {
+    "/FlateDecode": _flate, "/Fl": _flate,
+    "/ASCIIHexDecode": _ascii_hex, "/AHx": _ascii_hex,
+    "/ASCII85Decode": _ascii_85, "/A85": _ascii_85,
+    "/RunLengthDecode": _run_length, "/RL": _run_length,
+    "/LZWDecode": _lzw, "/LZW": _lzw,
+}
+
+
+def _decoded_size(stream, limit):
+    """Size of a stream once its filters are applied, counted no further than ``limit``.
+
+    Streams with a filter that cannot be decoded here count as over the limit.
+    """
+    filters = stream.get("/Filter")
+    if filters is None:
+        filters = []
+    else:
+        filters = filters.get_object()
+        filters = list(filters) if isinstance(filters, list) else [filters]
+    data = getattr(stream, "_data", None) or b""
+    chunks = (data[i:i + _CHUNK] for i in range(0, len(data), _CHUNK))
+    for name in filters:
+        decoder = _DECODERS.get(str(name.get_object()))
+        if decoder is None:
+            return limit + 1
+        chunks = decoder(chunks)
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        if size > limit:
+            break
+    return size
+
+
+def _page_streams(page):
+    """The content streams of a PyPDF2/pypdf page, and of every form XObject it can draw."""
+    contents = page.get("/Contents")
+    if contents is not None:
+        contents = contents.get_object()
+        for stream in contents if isinstance(contents, list) else [contents]:
+            yield stream.get_object()
+    seen = set()
+    resources = [page.get("/Resources")]
+    while resources:
+        resource = resources.pop()
+        xobjects = resource.get_object().get("/XObject") if resource is not None else None
+        if xobjects is None:
+            continue
+        for ref in xobjects.get_object().values():
+            key = (ref.idnum, ref.generation) if hasattr(ref, "idnum") else id(ref)
+            if key in seen:
+                continue
+            seen.add(key)
+            xobject = ref.get_object()
+            if xobject.get("/Subtype") == "/Form":
+                yield xobject
+                resources.append(xobject.get("/Resources"))
+
+
+def _content_size(page, limit):
+    """Decoded size of a PyPDF2/pypdf page's content and form XObject streams, counted no further than ``limit``.
+
+    Both libraries decode a whole stream in one call, so a bomb is caught here
+    first: filter chains are decoded a chunk at a time and only as far as the limit.
+    """
+    size = 0
+    for stream in _page_streams(page):
+        size += _decoded_size(stream, limit - size)
+        if size > limit:
+            break
+    return size
+
+
+def _read_bytes(source):
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read()
+    source.seek(0)
+    return source.read()
+
+
+def _pypdf_span(text, cm, tm, font, size):
+    # Text space to page space: the text matrix, then the current transformation matrix.
+    x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+    y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+    scale = math.hypot(tm[2] * cm[0] + tm[3] * cm[2], tm[2] * cm[1] + tm[3] * cm[3])
+    name = weight = None
+    if font is not None:
+        name = str(font.get("/BaseFont", ""))
+        descriptor = font.get("/FontDescriptor")
+        if descriptor is not None:
+            weight = descriptor.get_object().get("/FontWeight")
+    return span(x, y, size * scale, is_bold_font(name, weight), text)
+
+
+def _pypdf_images(page):
+    resources = page.get("/Resources")
+    xobjects = resources.get_object().get("/XObject") if resources is not None else None
+    if xobjects is None:
+        return 0
+    return sum(1 for obj in xobjects.get_object().values() if obj.get_object().get("/Subtype") == "/Image")
+
+
+class PdfBackend:
+    name = None
+    module = None
+    speed = None
+    inflation_guard = False
+    layout = False
+
+    def available(self):
+        return importlib.util.find_spec(self.module) is not None
+
+    def load(self):
+        """Import the library ahead of the first document."""
+        importlib.import_module(self.module)
+
+    def open(self, source):
+        """A document for a path or a seekable binary file object."""
+        raise NotImplementedError
+
+    def close(self, doc):
+        pass
+
+    def page_count(self, doc):
+        raise NotImplementedError
+
+    def pages(self, doc, start, stop):
+        """Pages ``start`` to ``stop`` of ``doc``, for ``page_text``."""
+        raise NotImplementedError
+
+    def page_text(self, page):
+        raise NotImplementedError
+
+    def page_layout(self, page):
+        """``(text, record)``: ``page_text`` and the page's ``layout`` record, from one pass; needs ``layout``."""
+        raise NotImplementedError
+
+    def content_size(self, page, limit):
+        """Decoded size of the page, counted no further than ``limit``; needs ``inflation_guard``."""
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"<PdfBackend {self.name}>"
+
+
+class PyPDF2Backend(PdfBackend):
+    name = "pypdf2"
+    module = "PyPDF2"
+    speed = 2
+    inflation_guard = True
+    layout = True
+
+    def open(self, source):
+        return importlib.import_module(self.module).PdfReader(source)
+
+    def page_count(self, doc):
+        return len(doc.pages)
+
+    def pages(self, doc, start, stop):
+        return (doc.pages[i] for i in range(start, stop))
+
+    def page_text(self, page):
+        return page.extract_text() or ""
+
+    def page_layout(self, page):
+        spans = []
+
+        def visit(text, cm, tm, font, size):
+            text = " ".join(text.split())
+            if text:
+                spans.append(_pypdf_span(text, cm, tm, font, size))
+
+        text = page.extract_text(visitor_text=visit) or ""
+        box = page.mediabox
+        return text, page_record(float(box.width), float(box.height), spans, _pypdf_images(page))
+
+    def content_size(self, page, limit):
+        return _content_size(page, limit)
+
+
+class PypdfBackend(PyPDF2Backend):
+    # PyPDF2's maintained successor: the same API, and fixes for many malformed files.
+    name = "pypdf"
+    module = "pypdf"
+    speed = 3
+
+
+class PdfiumBackend(PdfBackend):
+    name = "pypdfium2"
+    module = "pypdfium2"
+    speed = 1
+    layout = True
+    # PDFium is not thread-safe, so calls into it are serialised per process.
+    _lock = threading.Lock()
+
+    def open(self, source):
+        pdfium = importlib.import_module(self.module)
+        # PDFium takes paths and bytes, but not every file-like source (e.g. mmap).
+        data = source if isinstance(source, str) else _read_bytes(source)
+        with self._lock:
+            return pdfium.PdfDocument(data)
+
+    def close(self, doc):
+        with self._lock:
+            doc.close()
+
+    def page_count(self, doc):
+        return len(doc)
+
+    def pages(self, doc, start, stop):
+        return ((doc, i) for i in range(start, stop))
+
+    def page_text(self, page):
+        doc, index = page
+        with self._lock:
+            page = doc[index]
+            textpage = page.get_textpage()
+            try:
+                text = textpage.get_text_range()
+            finally:
+                textpage.close()
+                page.close()
+        return text.replace("\r\n", "\n")
+
+    def page_layout(self, page):
+        pdfium = importlib.import_module(self.module)
+        doc, index = page
+        with self._lock:
+            page = doc[index]
+            textpage = page.get_textpage()
+            try:
+                text = textpage.get_text_range()
+                spans = []
+                font_name = ctypes.create_string_buffer(128)
+                # PDFium splits the text into rectangles of one font on one line.
+                for i in range(textpage.count_rects()):
+                    left, bottom, right, top = textpage.get_rect(i)
+                    char = textpage.get_index(left + 1, (bottom + top) / 2, 2, 2)
+                    size = weight = name = None
+                    if char is not None and char >= 0:
+                        size = pdfium.raw.FPDFText_GetFontSize(textpage, char)
+                        weight = pdfium.raw.FPDFText_GetFontWeight(textpage, char)
+                        pdfium.raw.FPDFText_GetFontInfo(textpage, char, font_name, len(font_name), None)
+                        name = font_name.value.decode("latin-1")
+                    words = " ".join(textpage.get_text_bounded(left, bottom, right, top).split())
+                    spans.append(span(left, bottom, size, is_bold_font(name, weight), words))
+                width, height = page.get_size()
+                images = sum(1 for _ in page.get_objects(filter=[pdfium.raw.FPDF_PAGEOBJ_IMAGE]))
+            finally:
+                textpage.close()
+                page.close()
+        return text.replace("\r\n", "\n"), page_record(width, height, spans, images)
+
+
+class PdfminerBackend(PdfBackend):
+    # Slowest, but often reads multi-column layouts in a better order.
+    name = "pdfminer"
+    module = "pdfminer"
+    speed = 4
+    layout = True
+
+    def open(self, source):
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfinterp import PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfparser import PDFParser
+        if isinstance(source, str):
+            source = io.BytesIO(_read_bytes(source))
+        document = PDFDocument(PDFParser(source))
+        # One resource manager per document, so fonts are parsed once.
+        return PDFResourceManager(caching=True), list(PDFPage.create_pages(document))
+
+    def page_count(self, doc):
+        return len(doc[1])
+
+    def pages(self, doc, start, stop):
+        resources, pages = doc
+        return ((resources, page) for page in pages[start:stop])
+
+    def page_text(self, page):
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter
+        resources, page = page
+        out = io.StringIO()
+        device = TextConverter(resources, out, laparams=LAParams())
+        try:
+            PDFPageInterpreter(resources, device).process_page(page)
+        finally:
+            device.close()
+        return out.getvalue().rstrip("\x0c")
+
+    def page_layout(self, page):
+        from pdfminer.converter import PDFPageAggregator
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter
+        resources, page = page
+        device = PDFPageAggregator(resources, laparams=LAParams())
+        try:
+            PDFPageInterpreter(resources, device).process_page(page)
+            result = device.get_result()
+        finally:
+            device.close()
+        pieces = []
+        spans = []
+        images = _pdfminer_render(result, pieces, spans)
+        return "".join(pieces), page_record(result.width, result.height, spans, images)
+
+
+def _pdfminer_render(item, pieces, spans):
+    """Text pieces as ``TextConverter`` writes them, plus a span per line; returns the image count."""
+    from pdfminer.layout import LTChar, LTContainer, LTImage, LTText, LTTextBox, LTTextLine
+    images = 0
+    if isinstance(item, LTTextLine):
+        line = item.get_text()
+        pieces.append(line)
+        first = next((c for c in item if isinstance(c, LTChar)), None)
+        if first is not None and line.strip():
+            spans.append(span(item.x0, item.y0, first.size, is_bold_font(first.fontname), " ".join(line.split())))
+    elif isinstance(item, LTContainer):
+        for child in item:
+            images += _pdfminer_render(child, pieces, spans)
+    elif isinstance(item, LTText):
+        pieces.append(item.get_text())
+    elif isinstance(item, LTImage):
+        images += 1
+    if isinstance(item, LTTextBox):
+        pieces.append("\n")
+    return images
+
+
+BACKENDS = {backend.name: backend
+            for backend in (PdfiumBackend(), PypdfBackend(), PyPDF2Backend(), PdfminerBackend())}
+
+
+def select(setting):
+    """The installed backends for a ``PDF_BACKEND`` setting, in the order to try them."""
+    if setting == "auto":
+        return sorted((b for b in BACKENDS.values() if b.available()), key=lambda b: b.speed)
+    names = [name.strip().lower() for name in setting.split(",") if name.strip()]
+    unknown = [name for name in names if name not in BACKENDS]
+    if unknown or not names:
+        raise ValueError(f"Unknown PDF_BACKEND {setting!r}; use 'auto' or a comma-separated list of "
+                         f"{', '.join(BACKENDS)}")
+    chosen = [BACKENDS[name] for name in names if BACKENDS[name].available()]
+    if not chosen:
+        raise RuntimeError(f"PDF_BACKEND is {setting!r} but none of those libraries is installed")
+    return chosen
@@ -0,0 +1,119 @@
+"""Rank many resumes against one job description and keep the top k.
+
+Used by ``POST /api/rank`` and from the command line::
+
+    python ranking.py job.txt resumes/ -k 20 --workers 8
+
+Each file is screened before the full analysis: documents that do not look
+like resumes (``_resume_confidence``) or barely overlap the job's skills and
+terms (``JobIndex.score``) are counted and dropped. Survivors are analysed
+and only a compact record of the best ``k`` is kept, in a bounded heap, so
+memory stays flat however many files stream through.
+"""
+import argparse
+import heapq
+import json
+import sys
+import time
+from functools import partial
+from analysis import _resume_confidence, analyze_resume
+from batch import iter_directory, map_files, read_file
+from config import BATCH_WORKERS, RANK_MIN_CONFIDENCE, RANK_MIN_MATCH
+from document import ResumeDocument
+from matching import get_job_index
+
+# Share of the rank score taken by the job match; the rest is the ATS score.
+MATCH_WEIGHT = 0.75
+
+
+def screen_file(name, data, job_id, description, min_confidence=RANK_MIN_CONFIDENCE, min_match=RANK_MIN_MATCH):
+    """Compact ranking record for one file; ``status`` says whether it was scored."""
+    record = {"file": name}
+    try:
+        text, num_pages, file_ext, truncated, layout_summary = read_file(name, data)
+        doc = ResumeDocument(text, num_pages, file_ext, layout_summary)
+        confidence = _resume_confidence(doc)
+        if confidence < min_confidence:
+            record["status"] = "not_resume"
+            return record
+        # The index is cached per worker process, so it is compiled once per worker.
+        match = get_job_index(job_id, description).score(doc)
+        if match["match_score"] < min_match:
+            record["status"] = "low_match"
+            return record
+
+        result = analyze_resume(doc)
+        record.update({
+            "status": "ok",
+            "rank_score": round(MATCH_WEIGHT * match["match_score"] + (1 - MATCH_WEIGHT) * result["overall_score"], 1),
+            "match_score": match["match_score"],
+            "overall_score": result["overall_score"],
+            "confidence": round(confidence, 2),
+            "matched_skills": match["required_skills"]["matched"] + match["preferred_skills"]["matched"],
+            "missing_skills": match["required_skills"]["missing"],
+        })
+        if truncated:
+            record["truncated"] = True
+    except Exception as e:
+        # One bad file is reported, not allowed to fail the whole ranking.
+        record = {"file": name, "status": "error", "error": str(e) or type(e).__name__}
+    return record
+
+
+def rank(items, description, job_id=None, k=10, workers=BATCH_WORKERS, **thresholds):
+    """Top ``k`` records by rank score (best first) and a summary of the run."""
+    started = time.perf_counter()
+    index = get_job_index(job_id, description)
+    screen = partial(screen_file, job_id=index.job_id, description=description, **thresholds)
+
+    heap = []
+    counts = {"ok": 0, "not_resume": 0, "low_match": 0, "error": 0}
+    for seq, record in enumerate(map_files(screen, items, workers)):
+        counts[record["status"]] += 1
+        if record["status"] != "ok":
+            continue
+        # Ties keep the file seen first; seq also keeps records out of comparisons.
+        entry = (record["rank_score"], -seq, record)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    top = [record for _, _, record in sorted(heap, reverse=True)]
+    elapsed = time.perf_counter() - started
+    files = sum(counts.values())
+    return {
+        "job_id": index.job_id,
+        "top": top,
+        "summary": {
+            "files": files,
+            "scored": counts["ok"],
+            "not_resume": counts["not_resume"],
+            "low_match": counts["low_match"],
+            "failed": counts["error"],
+            "elapsed_s": round(elapsed, 3),
+            "docs_per_sec": round(files / elapsed, 2) if elapsed else 0,
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank a directory of PDF/DOCX resumes against a job description.")
+    parser.add_argument("job", help="text file with the job description")
+    parser.add_argument("directory")
+    parser.add_argument("-k", type=int, default=10, help="number of candidates to return")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS)
+    parser.add_argument("--min-confidence", type=float, default=RANK_MIN_CONFIDENCE)
+    parser.add_argument("--min-match", type=int, default=RANK_MIN_MATCH)
+    args = parser.parse_args(argv)
+
+    with open(args.job) as f:
+        description = f.read()
+    result = rank(iter_directory(args.directory), description, k=args.k, workers=args.workers,
+                  min_confidence=args.min_confidence, min_match=args.min_match)
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,28 @@
-import os
 from datetime import date
-from flask import Blueprint, request, jsonify, render_template, Response, current_app
-from werkzeug.utils import secure_filename
-from parsers import allowed_file, extract_text
-from analysis import analyze_resume
+from flask import Blueprint, current_app, request, jsonify, make_response, render_template, Response, stream_with_context, url_for
+from parsers import EXTRACTION_KEY, NO_TEXT_ERROR, UploadTooLarge, allowed_file
+from analysis import compact_result, score_document
+from cache import ANALYZER_VERSION, digest_stream, digest_text, make_cache
+from batch import iter_batch, iter_jsonl, iter_zip
+from document import ResumeDocument
+from matching import get_job_index
+from ranking import rank
+from metrics import StageTimer, render as render_metrics
+from config import ASYNC_UPLOAD_MIN_BYTES
+from jobs import FINISHED, store as job_store, submit as submit_job, wait_for_change
+from layout import summarize
+from sandbox import ParseFailed, ParsersBusy, extract_text
+from serialization import dumps_text
 
 bp = Blueprint("main", __name__)
 
+text_cache = make_cache("text")
+result_cache = make_cache("result")
+
 
 @bp.route("/")
 def index():
-    return render_template("index.html")
+    return render_template("index.html", async_min_bytes=ASYNC_UPLOAD_MIN_BYTES)
 
 
 @bp.route("/robots.txt")
@@ -34,30 +46,222 @@ def sitemap():
 
 @bp.route("/api/check", methods=["POST"])
 def check_resume():
-    if "resume" not in request.files:
-        return jsonify({"error": "No file uploaded"}), 400
+    timer = StageTimer()
+    with timer.stage("total"):
+        response = make_response(_check_resume(timer))
+    response.headers["Server-Timing"] = timer.server_timing()
+    return response
+
+
+def _get_upload():
+    """The "resume" upload: (file, None) or (None, error response)."""
+    files = request.files
+    if "resume" not in files:
+        return None, (jsonify({"error": "No file uploaded"}), 400)
 
-    file = request.files["resume"]
+    file = files["resume"]
     if file.filename == "":
-        return jsonify({"error": "No file selected"}), 400
+        return None, (jsonify({"error": "No file selected"}), 400)
 
     if not allowed_file(file.filename):
-        return jsonify({"error": "Only PDF and DOCX files are supported"}), 400
+        return None, (jsonify({"error": "Only PDF and DOCX files are supported"}), 400)
+    return file, None
+
+
+def _compact_profile():
+    # "profile=compact" (query string or form) drops info findings and tip descriptions.
+    return request.values.get("profile") == "compact"
+
+
+def _read_resume(timer):
+    """The "resume" upload: ((text, num_pages, file_ext, truncated, layout summary, layout key, cache status), None)
+    or (None, error).
+
+    The text cache holds the layout summary, not the records, with a digest of
+    it for result keys, so neither is rebuilt on a cache hit.
+    """
+    with timer.stage("upload"):
+        file, error = _get_upload()
+    if error:
+        return None, error
+
+    file_ext = file.filename.rsplit(".", 1)[1].lower()
+    try:
+        with timer.stage("digest"):
+            upload_key = f"{digest_stream(file.stream)}:{file_ext}:{EXTRACTION_KEY}"
+            extracted = text_cache.get(upload_key)
+        text_status = "HIT" if extracted else "MISS"
+        if not extracted:
+            with timer.stage("extract"):
+                text, num_pages, truncated, layout = extract_text(file.stream, file_ext, layout=True)
+                layout_summary = summarize(layout)
+            layout_key = digest_text(dumps_text(layout_summary))[:16] if layout_summary else "-"
+            extracted = text, num_pages, truncated, layout_summary, layout_key
+            text_cache.set(upload_key, extracted)
+    except UploadTooLarge as e:
+        return None, (jsonify({"error": str(e)}), 413)
+    except ParsersBusy as e:
+        return None, (jsonify({"error": str(e)}), 503)
+    except ParseFailed as e:
+        return None, (jsonify({"error": str(e)}), 422)
+    finally:
+        file.close()
+    text, num_pages, truncated, layout_summary, layout_key = extracted
+    if not text.strip():
+        return None, (jsonify({"error": NO_TEXT_ERROR}), 400)
+    return (text, num_pages, file_ext, truncated, layout_summary, layout_key, text_status), None
+
+
+def _check_resume(timer):
+    upload, error = _read_resume(timer)
+    if error:
+        return error
+    text, num_pages, file_ext, truncated, layout_summary, layout_key, text_status = upload
+
+    result_key = f"{digest_text(text)}:{layout_key}:{num_pages}:{file_ext}:{ANALYZER_VERSION}"
+    result = result_cache.get(result_key)
+    result_status = "HIT" if result else "MISS"
+    if not result:
+        doc = ResumeDocument(text, num_pages, file_ext, layout_summary)
+        result, _ = score_document(doc, timer)
+        # A check that ran out of time depends on load, not on the document.
+        if "timed_out" not in result:
+            result_cache.set(result_key, result)
 
-    filename = secure_filename(file.filename)
-    filepath = os.path.join(current_app.config["UPLOAD_FOLDER"], filename)
-    file.save(filepath)
+    # Cached results are shared, so per-request fields go on a copy.
+    if truncated:
+        result = {**result, "truncated": True}
+    if current_app.config["DEBUG_TIMINGS"]:
+        result = {**result, "timings": timer.as_dict()}
+    if _compact_profile():
+        result = compact_result(result)
+    response = jsonify(result)
+    response.headers["X-Text-Cache"] = text_status
+    response.headers["X-Result-Cache"] = result_status
+    return response
 
+
+@bp.route("/api/jobs", methods=["POST"])
+def create_job():
+    """Queue a resume for background analysis; poll the returned URL for the result."""
+    file, error = _get_upload()
+    if error:
+        return error
     try:
-        file_ext = filename.rsplit(".", 1)[1].lower()
-        text, num_pages = extract_text(filepath)
-        if not text.strip():
-            return jsonify({"error": "Could not extract text. The file may be image-based — use a text-based resume."}), 400
-        result = analyze_resume(text, num_pages, file_ext)
-        result["file_type"] = file_ext.upper()
-        result["word_count"] = len(text.split())
-        result["page_count"] = num_pages
+        job_id = submit_job(file.filename, file.read())
     finally:
-        os.remove(filepath)
+        file.close()
+    status_url = url_for("main.get_job", job_id=job_id)
+    # Without a job pool the analysis has already run, so report what the store says.
+    response = jsonify({"id": job_id, "status": job_store.get(job_id)["status"], "status_url": status_url,
+                        "events_url": url_for("main.job_events", job_id=job_id)})
+    response.headers["Location"] = status_url
+    return response, 202
+
+
+@bp.route("/api/jobs/<job_id>")
+def get_job(job_id):
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+    return jsonify(job)
+
+
+@bp.route("/api/jobs/<job_id>/events")
+def job_events(job_id):
+    """Server-Sent Events: one "status" event per state change, ending when the job finishes.
+
+    The stream holds a server worker until the job is done, so with plain sync
+    gunicorn workers polling ``/api/jobs/<id>`` is the better choice.
+    """
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+
+    def events(job):
+        yield f"event: status\ndata: {dumps_text(job)}\n\n"
+        while job["status"] not in FINISHED:
+            latest = wait_for_change(job_id, job["status"], timeout=15)
+            if latest is None:
+                return
+            if latest["status"] == job["status"]:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: status\ndata: {dumps_text(latest)}\n\n"
+            job = latest
+
+    return Response(events(job), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@bp.route("/api/match", methods=["POST"])
+def match_resume():
+    """Score a resume against a job description.
+
+    Send ``job_description`` once; later requests for the same posting can send
+    just ``job_id`` while its description is cached (on any worker with the
+    sqlite cache backend).
+    """
+    job_id = request.form.get("job_id") or None
+    description = request.form.get("job_description") or None
+    if not job_id and not description:
+        return jsonify({"error": "Provide a job_description or job_id"}), 400
+    index = get_job_index(job_id, description)
+    if index is None:
+        return jsonify({"error": "Unknown job_id — send the job_description again"}), 404
+
+    timer = StageTimer()
+    upload, error = _read_resume(timer)
+    if error:
+        return error
+    text, num_pages, file_ext, truncated, layout_summary, _, text_status = upload
+    with timer.stage("match"):
+        result = index.score(ResumeDocument(text, num_pages, file_ext, layout_summary))
+    if truncated:
+        result["truncated"] = True
+    response = jsonify(result)
+    response.headers["X-Text-Cache"] = text_status
+    response.headers["Server-Timing"] = timer.server_timing()
+    return response
+
+
+@bp.route("/metrics")
+def metrics():
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
+def _iter_uploads(uploads):
+    # Zip archives are expanded; every other upload is scored as-is.
+    for upload in uploads:
+        if upload.filename.lower().endswith(".zip"):
+            yield from iter_zip(upload.stream, upload.filename)
+        else:
+            yield upload.filename, upload.read()
+
+
+@bp.route("/api/check/batch", methods=["POST"])
+def check_batch():
+    uploads = [f for f in request.files.getlist("resumes") if f.filename]
+    if not uploads:
+        return jsonify({"error": "No files uploaded"}), 400
+    ordered = request.args.get("ordered", "").lower() in ("1", "true", "yes")
+
+    lines = iter_jsonl(iter_batch(_iter_uploads(uploads), ordered=ordered, compact=_compact_profile()))
+    return Response(stream_with_context(lines), mimetype="application/x-ndjson")
+
+
+@bp.route("/api/rank", methods=["POST"])
+def rank_resumes():
+    """Top-k resumes among many uploads (or zips) for one job description."""
+    description = request.form.get("job_description", "").strip()
+    if not description:
+        return jsonify({"error": "No job description provided"}), 400
+    uploads = [f for f in request.files.getlist("resumes") if f.filename]
+    if not uploads:
+        return jsonify({"error": "No files uploaded"}), 400
+    try:
+        k = max(1, int(request.form.get("k", 10)))
+    except ValueError:
+        return jsonify({"error": "k must be a number"}), 400
 
-    return jsonify(result)
+    return jsonify(rank(_iter_uploads(uploads), description, request.form.get("job_id") or None, k))
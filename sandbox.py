@@ -0,0 +1,228 @@
+"""Parse untrusted uploads in recycled subprocesses, away from the web worker.
+
+``extract_text`` hands each upload to one of ``PARSER_WORKERS`` pre-forked
+parser processes. The upload is written once to a file in ``PARSER_SPOOL_DIR``
+(tmpfs when ``/dev/shm`` exists), and the parser maps it instead of receiving
+a copy through the pipe. Each parser:
+
+* has its address space capped at ``PARSER_MAX_MEMORY`` bytes,
+* gets ``PARSER_CPU_SECONDS`` of CPU per document (SIGXCPU ends it),
+* is killed if a document takes longer than ``PARSER_TIMEOUT`` seconds,
+* exits after ``PARSER_MAX_DOCUMENTS`` documents and is replaced,
+
+so a leaking, hanging or runaway parse costs one subprocess, never the web
+worker. Parsers are forked from a forkserver, not from the web worker, so a
+parser restarted mid-request does not inherit the worker's client sockets or
+other open files. The forkserver (``process_context``, also used by the batch
+and job pools) preloads the PDF and DOCX libraries, so no parser spends a
+document's time budget importing them. With
+``PARSER_WORKERS=0``, or where subprocesses are unavailable, parsing runs
+in-process as before.
+"""
+import math
+import mmap
+import multiprocessing
+import os
+import queue
+import resource
+import shutil
+import tempfile
+import threading
+from config import (PARSER_WORKERS, PARSER_MAX_DOCUMENTS, PARSER_CPU_SECONDS, PARSER_TIMEOUT,
+                    PARSER_MAX_MEMORY, PARSER_SPOOL_DIR)
+import parsers
+
+
+class ParseFailed(Exception):
+    """The parser subprocess failed, ran out of a limit or could not read the file."""
+
+
+class ParsersBusy(ParseFailed):
+    """No parser process became free within ``PARSER_TIMEOUT`` seconds."""
+
+
+def process_context():
+    """The multiprocessing context for every pool of processes the server starts.
+
+    Children fork from a forkserver rather than from the web worker, so they
+    hold none of its client sockets or open files. The forkserver preloads the
+    analysis and the PDF and DOCX libraries, so children start warm.
+    """
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(
+        [__name__, "batch", "docx"] + [backend.module for backend in parsers.PDF_BACKENDS])
+    return context
+
+
+def _set_cpu_budget(seconds):
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = math.ceil(usage.ru_utime + usage.ru_stime + seconds)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _parse(path, file_ext, layout):
+    if file_ext != "pdf":
+        # zipfile needs a seekable file object, which mmap is not.
+        return parsers.extract_text(path, file_ext, layout=layout)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return parsers.extract_text(data, file_ext, layout=layout)
+
+
+def _serve(conn, max_documents, cpu_seconds, max_memory):
+    """Parser process main loop: one ``(path, file_ext, layout)`` in, one ``(status, value)`` out."""
+    # A no-op when the forkserver preloaded them; otherwise imported here, not in a document's budget.
+    parsers.load_parsers()
+    if max_memory:
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory, max_memory))
+    handled = 0
+    while not max_documents or handled < max_documents:
+        try:
+            path, file_ext, layout = conn.recv()
+        except EOFError:
+            return
+        if cpu_seconds:
+            _set_cpu_budget(cpu_seconds)
+        try:
+            reply = ("ok", _parse(path, file_ext, layout))
+        except parsers.UploadTooLarge as e:
+            reply = ("too_large", str(e))
+        except MemoryError:
+            # The heap may be in any state now; report and let the pool replace us.
+            conn.send(("exiting", "This file needs too much memory to parse"))
+            return
+        except Exception as e:
+            reply = ("error", str(e) or type(e).__name__)
+        conn.send(reply)
+        handled += 1
+
+
+def _parse_here(source, file_ext, layout):
+    """``parsers.extract_text`` in this process, failing the way a parser process reports it."""
+    try:
+        return parsers.extract_text(source, file_ext, layout=layout)
+    except parsers.UploadTooLarge:
+        raise
+    except Exception as e:
+        raise ParseFailed(str(e) or type(e).__name__) from e
+
+
+class _Parser:
+    def __init__(self, context, pool):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_serve, daemon=True, args=(
+            child, pool.max_documents, pool.cpu_seconds, pool.max_memory))
+        self.process.start()
+        child.close()
+        self.documents = 0
+
+    def stop(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class ParserPool:
+    def __init__(self, workers=PARSER_WORKERS, max_documents=PARSER_MAX_DOCUMENTS, cpu_seconds=PARSER_CPU_SECONDS,
+                 timeout=PARSER_TIMEOUT, max_memory=PARSER_MAX_MEMORY):
+        self.max_documents = max_documents
+        self.cpu_seconds = cpu_seconds
+        self.timeout = timeout
+        self.max_memory = max_memory
+        self._context = process_context()
+        # Idle parsers, and None for a slot whose parser could not be restarted.
+        self._idle = queue.Queue()
+        for _ in range(workers):
+            self._idle.put(_Parser(self._context, self))
+
+    def _start(self):
+        try:
+            return _Parser(self._context, self)
+        except (OSError, ValueError):
+            # e.g. out of memory or processes for now; the slot retries on its next document.
+            return None
+
+    def run(self, path, file_ext, layout=False):
+        """``parsers.extract_text`` of the file at ``path``, in a parser process.
+
+        Raises ``ParsersBusy`` when every parser stays busy for ``timeout``
+        seconds. When a parser cannot be started, the file is parsed in
+        this process instead.
+        """
+        try:
+            parser = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise ParsersBusy("The server is busy parsing other files — try again shortly")
+        if parser is None:
+            parser = self._start()
+        if parser is None:
+            self._idle.put(None)
+            with open(path, "rb") as f:
+                return _parse_here(f, file_ext, layout)
+        replace = True  # unless it answers and has documents left
+        try:
+            try:
+                parser.conn.send((path, file_ext, layout))
+                if not parser.conn.poll(self.timeout):
+                    raise ParseFailed("This file took too long to parse")
+                status, value = parser.conn.recv()
+            except (EOFError, OSError):
+                # Killed by the CPU or memory limit, or crashed outright.
+                raise ParseFailed("This file could not be parsed within the resource limits")
+            parser.documents += 1
+            replace = status == "exiting" or bool(self.max_documents and parser.documents >= self.max_documents)
+            if status == "too_large":
+                raise parsers.UploadTooLarge(value)
+            if status != "ok":
+                raise ParseFailed(value)
+            return value
+        finally:
+            if replace:
+                parser.stop()
+                parser = self._start()
+            self._idle.put(parser)
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """This process's parser pool, or None when parsing should stay in-process."""
+    global _pool, _pool_pid
+    if not PARSER_WORKERS:
+        return None
+    with _pool_lock:
+        # Pools do not survive a fork, so each gunicorn worker creates its own.
+        if _pool_pid != os.getpid():
+            try:
+                _pool = ParserPool()
+            except (OSError, ValueError):
+                # e.g. serverless runtimes that cannot fork.
+                _pool = None
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def start_pool():
+    """Fork this process's parsers now rather than on the first upload."""
+    _get_pool()
+
+
+def extract_text(stream, file_ext, layout=False):
+    """``parsers.extract_text`` of a seekable upload stream, parsed in a sandboxed subprocess.
+
+    Raises ``ParseFailed`` when the file cannot be parsed or the parser hits a
+    limit, and ``parsers.UploadTooLarge``, whether or not it parses in-process.
+    """
+    pool = _get_pool()
+    if pool is None:
+        return _parse_here(stream, file_ext, layout)
+    stream.seek(0)
+    with tempfile.NamedTemporaryFile(dir=PARSER_SPOOL_DIR, suffix=f".{file_ext}") as spool:
+        shutil.copyfileobj(stream, spool)
+        spool.flush()
+        return pool.run(spool.name, file_ext, layout)
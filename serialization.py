@@ -0,0 +1,44 @@
+"""JSON encoding for API responses, batch output and stored records.
+
+``JSON_BACKEND`` picks the encoder: ``orjson`` is several times faster on large
+results, ``json`` is the standard library, and ``auto`` (the default) uses
+orjson when it is installed. Both render findings through ``json_default`` and
+produce compact UTF-8 output, so stored records read back the same either way.
+"""
+import json
+from config import JSON_BACKEND
+from findings import json_default
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps_orjson(obj):
+    return orjson.dumps(obj, default=json_default)
+
+
+def _dumps_json(obj):
+    return json.dumps(obj, default=json_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _select(name):
+    if name == "auto":
+        name = "orjson" if orjson is not None else "json"
+    if name == "orjson":
+        if orjson is None:
+            raise RuntimeError("JSON_BACKEND is 'orjson' but orjson is not installed")
+        return name, _dumps_orjson
+    if name == "json":
+        return name, _dumps_json
+    raise ValueError(f"Unknown JSON_BACKEND {name!r}; use 'auto', 'orjson' or 'json'")
+
+
+# dumps(obj) -> UTF-8 encoded JSON bytes.
+BACKEND, dumps = _select(JSON_BACKEND)
+
+
+def dumps_text(obj):
+    """``obj`` as a JSON string, for text columns and line-oriented output."""
+    return dumps(obj).decode()
@@ -15,6 +15,8 @@ document.getElementById('themeToggle').addEventListener('click', () => {
 /* ===== Upload Logic ===== */
 const dropZone=document.getElementById('dropZone'),fileInput=document.getElementById('fileInput'),fileRow=document.getElementById('fileRow'),fileNameEl=document.getElementById('fileName'),fileExtEl=document.getElementById('fileExt'),removeFile=document.getElementById('removeFile'),btnAnalyze=document.getElementById('btnAnalyze'),uploadView=document.getElementById('uploadView'),loader=document.getElementById('loader'),resultsView=document.getElementById('resultsView'),errorMsg=document.getElementById('errorMsg');
 let selectedFile=null;
+// Uploads this large are analyzed as a background job and polled, instead of one long request (0: never).
+const ASYNC_MIN_BYTES=+(document.currentScript.dataset.asyncMinBytes??1048576);
 
 dropZone.addEventListener('click',()=>fileInput.click());
 dropZone.addEventListener('dragover',e=>{e.preventDefault();dropZone.classList.add('drag-over')});
@@ -46,15 +48,32 @@ btnAnalyze.addEventListener('click',async()=>{
     uploadView.classList.add('hidden');loader.classList.add('visible');resultsView.classList.remove('visible');
     const form=new FormData();form.append('resume',selectedFile);
     try{
-        const res=await fetch('/api/check',{method:'POST',body:form});
-        const data=await res.json();
+        const {ok,data}=await (ASYNC_MIN_BYTES&&selectedFile.size>=ASYNC_MIN_BYTES?checkAsync:checkSync)(form);
         loader.classList.remove('visible');
-        if(!res.ok){showError(data.error||'Something went wrong.');uploadView.classList.remove('hidden');btnAnalyze.disabled=false;return}
+        if(!ok){showError(data.error||'Something went wrong.');uploadView.classList.remove('hidden');btnAnalyze.disabled=false;return}
         renderResults(data);
     }catch{loader.classList.remove('visible');uploadView.classList.remove('hidden');document.getElementById('btnBack').classList.remove('visible');showError('Network error. Please try again.')}
     btnAnalyze.disabled=false;
 });
 
+async function checkSync(form){
+    const res=await fetch('/api/check',{method:'POST',body:form});
+    return{ok:res.ok,data:await res.json()};
+}
+const sleep=ms=>new Promise(r=>setTimeout(r,ms));
+async function checkAsync(form){
+    let res=await fetch('/api/jobs',{method:'POST',body:form});
+    const job=await res.json();
+    if(!res.ok)return{ok:false,data:job};
+    for(let delay=500;;delay=Math.min(delay*1.5,3000)){
+        await sleep(delay);
+        res=await fetch(job.status_url);
+        const data=await res.json();
+        if(!res.ok||data.status==='error')return{ok:false,data};
+        if(data.status==='done')return{ok:true,data:data.result};
+    }
+}
+
 /* Tabs */
 document.querySelectorAll('.tab-btn').forEach(b=>{b.addEventListener('click',()=>{
     document.querySelectorAll('.tab-btn').forEach(x=>x.classList.remove('active'));
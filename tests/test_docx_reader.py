@@ -0,0 +1,144 @@
+"""Tests for the streaming DOCX reader and how parsers falls back from it or rejects a file.
+
+Fixtures are built with python-docx and edited at the zip level where a test
+needs a part python-docx does not write, or a damaged one.
+"""
+import io
+import zipfile
+import pytest
+from docx import Document
+import docx_reader
+import parsers
+from layout import new_record
+from sandbox import ParseFailed, _parse_here
+
+
+def _save(document):
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def _rewrite(data, replace=None, compression=zipfile.ZIP_DEFLATED):
+    """The DOCX ``data`` with parts replaced or added from ``replace`` (name -> bytes)."""
+    replace = dict(replace or {})
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as src, zipfile.ZipFile(out, "w", compression) as dst:
+        for info in src.infolist():
+            dst.writestr(info.filename, replace.pop(info.filename, src.read(info)))
+        for name, part in replace.items():
+            dst.writestr(name, part)
+    return out.getvalue()
+
+
+def _app_xml(pages, words):
+    return (b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            b'<Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">'
+            b"<Pages>%d</Pages><Words>%d</Words></Properties>" % (pages, words))
+
+
+@pytest.fixture
+def resume():
+    document = Document()
+    section = document.sections[0]
+    section.header.paragraphs[0].text = "Jane Doe — Curriculum Vitae"
+    section.footer.paragraphs[0].text = "jane@example.com"
+    document.add_heading("Experience", level=1)
+    document.add_paragraph("Built data pipelines in Python.")
+    table = document.add_table(rows=2, cols=2)
+    for row, cells in zip(table.rows, [("Skill", "Years"), ("SQL", "6")]):
+        for cell, text in zip(row.cells, cells):
+            cell.text = text
+    document.add_paragraph("Education")
+    return _save(document)
+
+
+def _read(data):
+    record = new_record(tables=0)
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        lines = [line for line in docx_reader.paragraphs(archive, record) if line.strip()]
+    return lines, record
+
+
+def test_headers_come_first_and_footers_last(resume):
+    lines, record = _read(resume)
+    assert lines[0] == "Jane Doe — Curriculum Vitae"
+    assert lines[-1] == "jane@example.com"
+    assert record["header"] == ["Jane Doe — Curriculum Vitae"]
+    assert record["footer"] == ["jane@example.com"]
+    assert all(s[4] not in ("Jane Doe — Curriculum Vitae", "jane@example.com") for s in record["spans"])
+
+
+def test_table_cells_are_read_in_document_order(resume):
+    lines, record = _read(resume)
+    body = lines[1:-1]
+    assert body == ["Experience", "Built data pipelines in Python.", "Skill", "Years", "SQL", "6", "Education"]
+    assert record["tables"] == 1
+
+
+def test_text_matches_python_docx_on_body_paragraphs():
+    document = Document()
+    paragraph = document.add_paragraph("Tabs\tand")
+    paragraph.add_run().add_break()
+    paragraph.add_run("line breaks")
+    document.add_paragraph("Second paragraph")
+    data = _save(document)
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        lines = list(docx_reader.paragraphs(archive))
+    assert lines == [p.text for p in Document(io.BytesIO(data)).paragraphs]
+
+
+def test_page_count_comes_from_the_document_properties(resume):
+    data = _rewrite(resume, {"docProps/app.xml": _app_xml(pages=3, words=900)})
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert docx_reader.page_count(archive) == 3
+    assert parsers.extract_text_from_docx(io.BytesIO(data))[1] == 3
+
+
+def test_template_statistics_are_not_trusted(resume):
+    data = _rewrite(resume, {"docProps/app.xml": _app_xml(pages=1, words=0)})
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert docx_reader.page_count(archive) is None
+    words = " ".join(["word"] * 1000)
+    document = Document()
+    document.add_paragraph(words)
+    data = _rewrite(_save(document), {"docProps/app.xml": _app_xml(pages=1, words=0)})
+    assert parsers.extract_text_from_docx(io.BytesIO(data))[1] == 2
+
+
+def test_falls_back_to_python_docx_when_the_stream_reader_fails(resume):
+    # python-docx never reads docProps/app.xml, so only the stream reader trips on it.
+    data = _rewrite(resume, {"docProps/app.xml": b"<Properties"})
+    text, num_pages, truncated, layout = parsers.extract_text_from_docx(io.BytesIO(data), layout=True)
+    assert text.splitlines() == [p.text for p in Document(io.BytesIO(data)).paragraphs]
+    assert "Jane Doe" not in text  # python-docx reads body paragraphs only
+    assert num_pages == 1
+    assert not truncated
+    assert layout is None
+
+
+def test_expanded_size_is_checked_before_reading(resume, monkeypatch):
+    with zipfile.ZipFile(io.BytesIO(resume)) as archive:
+        expanded = sum(info.file_size for info in archive.infolist())
+    monkeypatch.setattr(parsers, "MAX_DECOMPRESSED_BYTES", expanded + 1024)
+    assert parsers.extract_text_from_docx(io.BytesIO(resume))[0]
+    data = _rewrite(resume, {"word/media/padding.bin": b"\0" * 2048})
+    with pytest.raises(parsers.UploadTooLarge):
+        parsers.extract_text_from_docx(io.BytesIO(data))
+
+
+def _damaged(resume):
+    # Stored rather than deflated, so one changed byte of text fails the CRC check.
+    data = _rewrite(resume, compression=zipfile.ZIP_STORED)
+    assert data.count(b"Built data pipelines") == 1
+    return data.replace(b"Built data pipelines", b"Built data pipelinez")
+
+
+@pytest.mark.parametrize("make", [lambda resume: b"not a zip at all", _damaged], ids=["not_zip", "bad_crc"])
+def test_damaged_files_fail_as_unparseable(resume, make):
+    data = make(resume)
+    with pytest.raises(ValueError, match="damaged"):
+        parsers.extract_text_from_docx(io.BytesIO(data))
+    # In-process parsing reports it like a parser process would, so routes answer 422.
+    with pytest.raises(ParseFailed, match="damaged"):
+        _parse_here(io.BytesIO(data), "docx", True)
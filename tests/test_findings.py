@@ -0,0 +1,83 @@
+"""Findings.counts must stay in step with the list however it is changed."""
+from collections import Counter
+import pytest
+from findings import Finding, Findings
+
+
+def _finding(type):
+    return Finding(type, "any.code")
+
+
+def _findings():
+    findings = Findings()
+    findings.add("pass", "any.code")
+    findings.add("fail", "any.code")
+    findings.add("pass", "any.code")
+    return findings
+
+
+def _append(f):
+    f.append(_finding("warning"))
+
+
+def _extend(f):
+    f.extend(_finding(t) for t in ("info", "pass"))
+
+
+def _iadd(f):
+    f += [_finding("fail")]
+
+
+def _insert(f):
+    f.insert(0, _finding("info"))
+
+
+def _set_item(f):
+    f[0] = _finding("warning")
+
+
+def _set_slice(f):
+    f[1:] = [_finding("info")] * 3
+
+
+def _del_item(f):
+    del f[0]
+
+
+def _del_slice(f):
+    del f[:2]
+
+
+def _imul(f):
+    f *= 2
+
+
+def _pop(f):
+    f.pop()
+
+
+def _pop_first(f):
+    f.pop(0)
+
+
+def _remove(f):
+    f.remove(f[1])
+
+
+def _clear(f):
+    f.clear()
+
+
+@pytest.mark.parametrize("mutate", [_append, _extend, _iadd, _insert, _set_item, _set_slice, _del_item,
+                                    _del_slice, _imul, _pop, _pop_first, _remove, _clear],
+                         ids=lambda mutate: mutate.__name__.lstrip("_"))
+def test_counts_follow_every_mutation(mutate):
+    findings = _findings()
+    mutate(findings)
+    assert isinstance(findings, Findings)
+    assert findings.counts == Counter(f.type for f in findings)
+
+
+def test_counts_from_items():
+    findings = Findings([_finding("pass"), _finding("warning")])
+    assert findings.counts == Counter({"pass": 1, "warning": 1})
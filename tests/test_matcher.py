@@ -0,0 +1,109 @@
+"""KeywordAutomaton against the substring and regex searches it replaced.
+
+Skills and weak verbs used to match with ``keyword in text`` and action verbs
+with ``re.search(r"\\b<verb>\\w*\\b", text)``; ``patterns.KEYWORDS`` must find
+exactly the same keywords, in the same order, on any text. The boundary flags
+are also checked on their own against ``(?<!\\w)`` and ``(?!\\w)``, which are
+``\\b`` where the keyword starts or ends with a word character and also cover
+keywords like "c++" and ".net" that do not.
+"""
+import random
+import re
+import pytest
+from benchmarks.corpus import CORPUS
+from constants import ACTION_VERBS_BY_CATEGORY, HARD_SKILLS, SOFT_SKILLS, WEAK_VERBS
+from matcher import KeywordAutomaton
+from patterns import KEYWORDS
+
+EDGE_CASES = [
+    "",
+    "python",
+    "pythonic and jython",
+    "led the team; misled nobody; leading, led.",
+    "managed_team and re-managed 2x",
+    "c++, c#, node.js/nodejs and asp.net core",
+    "r and rust, r\nr ",
+    "teamwork\tcommunication problem-solving",
+    "éled ledé led_ _led",
+    "was responsible for helped with worked on",
+]
+
+# Vocabulary fragments glued together with and without separators, so matches
+# land at text edges and next to word and non-word characters.
+_SEPARATORS = ["", " ", "_", "-", ".", "\n", "1", "s", "ing", "é", "+"]
+
+
+def _random_texts(count=40):
+    rng = random.Random(0)
+    vocabulary = ([skill.lower() for skills in HARD_SKILLS.values() for skill in skills]
+                  + [verb for verbs in ACTION_VERBS_BY_CATEGORY.values() for verb in verbs]
+                  + list(WEAK_VERBS))
+    texts = []
+    for _ in range(count):
+        pieces = []
+        for _ in range(rng.randrange(1, 30)):
+            word = rng.choice(vocabulary)
+            if rng.random() < 0.3:
+                cut = rng.randrange(len(word) + 1)
+                word = word[:cut] if rng.random() < 0.5 else word[cut:]
+            pieces.append(word + rng.choice(_SEPARATORS))
+        texts.append("".join(pieces))
+    return texts
+
+
+TEXTS = EDGE_CASES + ["\n".join(lines).lower() for lines in CORPUS.values()] + _random_texts()
+
+
+def _by_category(vocabulary, matches):
+    found = {}
+    for category, keywords in vocabulary.items():
+        matched = [keyword for keyword in keywords if matches(keyword)]
+        if matched:
+            found[category] = matched
+    return found
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_keywords_match_the_old_searches(text):
+    hits = KEYWORDS.scan(text)
+    lowered = {category: [skill.lower() for skill in skills] for category, skills in HARD_SKILLS.items()}
+    assert hits.by_category("hard_skills") == _by_category(lowered, lambda skill: skill in text)
+    lowered = {category: [skill.lower() for skill in skills] for category, skills in SOFT_SKILLS.items()}
+    assert hits.by_category("soft_skills") == _by_category(lowered, lambda skill: skill in text)
+    assert hits.by_category("action_verbs") == _by_category(
+        ACTION_VERBS_BY_CATEGORY, lambda verb: re.search(r"\b" + verb + r"\w*\b", text))
+    assert hits.matched("weak_verbs") == [phrase for phrase in WEAK_VERBS if phrase in text]
+
+
+BOUNDARY_KEYWORDS = ["go", "led", "node.js", "c++", ".net", "r ", "_id", "é"]
+BOUNDARY_TEXTS = [
+    "go", "golang", "ago", "go_", "go-to", "(go)", "égo", "goé",
+    "led", "misled", "leds", "led1", "1led",
+    "node.js", "node.json", "xnode.js", "c++", "c++x", "ac++", "c++ c+",
+    ".net", "asp.net", "a .net", "r ", "our r language", "r",
+    "_id", "user_id", "_ids", "é", "café", "éa",
+]
+FLAGS = [(False, False), (True, False), (False, True), (True, True)]
+
+
+def _reference(keyword, word_start, word_end):
+    return re.compile(("(?<!\\w)" if word_start else "") + re.escape(keyword) + ("(?!\\w)" if word_end else ""))
+
+
+@pytest.mark.parametrize("word_start, word_end", FLAGS)
+@pytest.mark.parametrize("text", BOUNDARY_TEXTS + EDGE_CASES)
+def test_boundary_flags_match_regex(text, word_start, word_end):
+    automaton = KeywordAutomaton()
+    for keyword in BOUNDARY_KEYWORDS:
+        automaton.add(keyword, "test", word_start=word_start, word_end=word_end)
+    expected = [keyword for keyword in BOUNDARY_KEYWORDS
+                if _reference(keyword, word_start, word_end).search(text)]
+    assert automaton.scan(text).matched("test") == expected
+
+
+def test_boundary_is_checked_per_occurrence():
+    automaton = KeywordAutomaton()
+    automaton.add("led", "verbs", word_start=True, word_end=True)
+    # The first two occurrences are inside words; the last one counts.
+    assert automaton.scan("misled ledger led").matched("verbs") == ["led"]
+    assert automaton.scan("misled ledger").matched("verbs") == []
@@ -0,0 +1,34 @@
+from document import ResumeDocument
+from matching import JobIndex
+
+POSTING = """Senior Python Engineer
+
+Requirements:
+- 5+ years of Python and PostgreSQL
+- JavaScript for internal tools
+
+Nice to have:
+- Docker
+"""
+
+
+def test_posting_skills_are_whole_words():
+    index = JobIndex("job", POSTING)
+    assert sorted(index.required_skills) == ["javascript", "postgresql", "python"]
+    assert index.preferred_skills == ["docker"]
+
+
+def test_resume_skills_are_whole_words():
+    index = JobIndex("job", POSTING)
+    # "senior", "postgresql" and "javascript" must not stand in for r, sql and java.
+    resume = ResumeDocument("Senior engineer. PostgreSQL and JavaScript daily, Docker at home.", 1, "pdf")
+    result = index.score(resume)
+    assert sorted(result["required_skills"]["matched"]) == ["javascript", "postgresql"]
+    assert result["required_skills"]["missing"] == ["python"]
+    assert result["preferred_skills"] == {"matched": ["docker"], "missing": []}
+
+
+def test_skill_names_are_stripped():
+    index = JobIndex("job", "Requirements:\nStatistics in R and SQL")
+    assert "r" in index.required_skills and "sql" in index.required_skills
+    assert all(skill == skill.strip() for skill in index.required_skills)
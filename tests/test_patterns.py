@@ -0,0 +1,109 @@
+"""Fuzz and timing tests for the patterns that must stay linear on hostile text.
+
+Each hostile input is scanned at two sizes. A linear scan takes about four
+times as long on four times the text and a quadratic one sixteen times, so
+the ratio is held under 8. A bound on the absolute time catches the slower
+cases too.
+"""
+import random
+import re
+import time
+import pytest
+from patterns import PATTERNS
+
+SIZE = 200_000
+# Plenty for a linear scan of SIZE characters; a quadratic one takes minutes.
+MAX_SECONDS = 1.0
+MAX_RATIO = 8.0
+
+HOSTILE = [
+    ("phone", "1 "),
+    ("phone", "1"),
+    ("phone", "(-"),
+    ("confidence_phone", "1 "),
+    ("confidence_phone", "1-"),
+    ("confidence_phone", "1 ("),
+    ("improvement_phrase", "increased "),
+    ("improvement_phrase", "increased by some "),
+    ("percentage", "1"),
+    ("percentage", "1."),
+    ("dollars", "1"),
+    ("dollars", "$1"),
+    ("people_metric", "1,"),
+    ("time_metric", "1,"),
+    ("quantity_metric", "1,"),
+    ("email", "a"),
+    ("email_strict", "a."),
+    ("confidence_email", "a"),
+    ("full_date_range", "jan 2020 "),
+    ("year_date_range", "2020 - "),
+    ("job_title", "senior "),
+    ("company", "a "),
+    ("company", "inc "),
+    ("table_layout", " "),
+    ("table_layout", "    x"),
+    ("table_layout", " \t"),
+]
+
+
+def _scan_seconds(pattern, text):
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        pattern.findall(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+@pytest.mark.parametrize("key, unit", HOSTILE)
+def test_hostile_input_scans_in_linear_time(key, unit):
+    pattern = PATTERNS[key]
+    small = unit * (SIZE // 4 // len(unit))
+    large = small * 4
+    short, long = _scan_seconds(pattern, small), _scan_seconds(pattern, large)
+    assert long < MAX_SECONDS, f"{key} took {long:.2f}s on {len(large)} characters"
+    # Below a millisecond the ratio is mostly timer noise.
+    if long > 0.001:
+        assert long / max(short, 1e-6) < MAX_RATIO, f"{key}: {short:.4f}s -> {long:.4f}s"
+
+
+def _random_texts(alphabet, count=2000, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+
+
+@pytest.mark.parametrize("alphabet", [
+    ["increased ", "cut", " ", "1", ".", "x", "by ", "\n"],
+    ["Increased", "SAVED", "grew", "2", "..", "a", " "],
+])
+def test_improvement_phrase_matches_plain_regex(alphabet):
+    pattern = PATTERNS["improvement_phrase"]
+    for text in _random_texts(alphabet):
+        assert pattern.findall(text) == pattern.pattern.findall(text), repr(text)
+
+
+@pytest.mark.parametrize("alphabet", [
+    [" ", "  ", "    ", "\t", "\t\t", "\n", "x", "word"],
+    [" ", "\t", "a"],
+])
+def test_table_layout_matches_plain_regex(alphabet):
+    pattern = PATTERNS["table_layout"]
+    for text in _random_texts(alphabet):
+        assert pattern.findall(text) == pattern.pattern.findall(text), repr(text)
+
+
+@pytest.mark.parametrize("alphabet", [
+    ["Acme ", "Inc", ".", " ", "&", "Labs", "a", "co.", "\n", "x" * 12],
+    ["Group", " ", "b", "LLC", "Software"],
+])
+def test_company_matches_plain_regex(alphabet):
+    pattern = PATTERNS["company"]
+    for text in _random_texts(alphabet):
+        assert pattern.findall(text) == pattern.pattern.findall(text), repr(text)
+
+
+def test_phone_patterns_find_numbers_in_long_digit_runs():
+    text = "Call " + "1 " * (SIZE // 2) + "now"
+    assert PATTERNS["phone"].search(text)
+    assert re.fullmatch(r"[\d ]+", PATTERNS["confidence_phone"].search(text).group())
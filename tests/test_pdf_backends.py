@@ -0,0 +1,247 @@
+"""Tests for the stream decoders behind the PDF inflation guard, and the guard itself.
+
+Each decoder is run on random data encoded for its filter and checked against
+PyPDF2's own decoder, which is what reads the stream when the page is
+extracted. PyPDF2 has no RunLengthDecode, so that one is checked against the
+original data only. The bomb fixtures are small PDFs whose page content
+inflates past ``MAX_DECOMPRESSED_BYTES``, which is lowered for the test.
+"""
+import base64
+import io
+import random
+import zlib
+import pytest
+from PyPDF2 import filters
+from PyPDF2.generic import ArrayObject, DecodedStreamObject, NameObject
+import parsers
+from pdf_backends import (BACKENDS, _ascii_85, _ascii_hex, _decoded_size, _flate, _lzw,
+                          _run_length)
+
+SEEDS = range(5)
+# Chunk sizes for feeding the decoders: single bytes, odd splits and whole streams.
+CHUNK_SIZES = [1, 7, 4096, None]
+
+GUARDED_BACKENDS = [backend for backend in BACKENDS.values()
+                    if backend.inflation_guard and backend.available()]
+
+
+def _random_data(seed):
+    # Half random bytes, half short repeats, so runs and LZW table growth are covered.
+    rng = random.Random(seed)
+    size = rng.randrange(1, 40_000)
+    noise = rng.randbytes(size // 2)
+    repeats = b"".join(rng.choice([b"BT ", b"(Jane Doe) Tj ", b"\0", b"ET\n"]) * rng.randrange(1, 200)
+                       for _ in range(size // 200))
+    return noise + repeats
+
+
+def _chunks(data, size):
+    if size is None:
+        return [data]
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def _decode(decoder, data, size):
+    return b"".join(decoder(_chunks(data, size)))
+
+
+def _run_length_encode(data):
+    out = bytearray()
+    i = 0
+    while i < len(data):
+        run = 1
+        while i + run < len(data) and run < 128 and data[i + run] == data[i]:
+            run += 1
+        if run > 1:
+            out += bytes([257 - run, data[i]])
+            i += run
+        else:
+            literal = data[i:i + 128]
+            out += bytes([len(literal) - 1]) + literal
+            i += len(literal)
+    return bytes(out + b"\x80")
+
+
+def _lzw_encode(data):
+    # EarlyChange 1: the writer widens its codes one entry before the reader's table needs it.
+    codes = [256]
+    table = {bytes([i]): i for i in range(256)}
+    word = b""
+    for byte in data:
+        extended = word + bytes([byte])
+        if extended in table:
+            word = extended
+            continue
+        codes.append(table[word])
+        table[extended] = len(table) + 2
+        word = bytes([byte])
+        if len(table) + 2 >= 4093:
+            codes.append(256)
+            table = {bytes([i]): i for i in range(256)}
+    if word:
+        codes.append(table[word])
+    codes.append(257)
+
+    buffer = bits = 0
+    out = bytearray()
+    width = 9
+    size = 258
+    first = True
+    for code in codes:
+        buffer = (buffer << width) | code
+        bits += width
+        while bits >= 8:
+            bits -= 8
+            out.append(buffer >> bits)
+            buffer &= (1 << bits) - 1
+        if code == 256:
+            width, size, first = 9, 258, True
+            continue
+        if not first:
+            size += 1
+        first = False
+        if size + 1 >= 1 << width and width < 12:
+            width += 1
+    if bits:
+        out.append(buffer << (8 - bits))
+    return bytes(out)
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_flate_matches_pypdf2(seed, size):
+    data = _random_data(seed)
+    encoded = zlib.compress(data)
+    assert _decode(_flate, encoded, size) == filters.FlateDecode.decode(encoded) == data
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_ascii_hex_matches_pypdf2(seed, size):
+    data = _random_data(seed)
+    hex_digits = data.hex()
+    # Whitespace between digit pairs and within them, and junk after the end marker.
+    encoded = (" \n".join(hex_digits[i:i + 61] for i in range(0, len(hex_digits), 61)) + ">zz").encode()
+    expected = filters.ASCIIHexDecode.decode(encoded.decode()).encode("latin-1")
+    assert _decode(_ascii_hex, encoded, size) == expected == data
+
+
+def test_ascii_hex_pads_an_odd_last_digit():
+    # PyPDF2 rejects this; the PDF spec reads the missing digit as 0.
+    assert _decode(_ascii_hex, b"4a 4>", None) == b"J@"
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_ascii_85_matches_pypdf2(seed, size):
+    data = _random_data(seed)
+    # PDF streams end with "~>" but, unlike Adobe's framing, have no "<~" in front.
+    encoded = base64.a85encode(data, wrapcol=75) + b"~>"
+    assert _decode(_ascii_85, encoded, size) == filters.ASCII85Decode.decode(encoded) == data
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_run_length_round_trip(seed, size):
+    data = _random_data(seed)
+    assert _decode(_run_length, _run_length_encode(data), size) == data
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_lzw_matches_pypdf2(seed, size):
+    data = _random_data(seed)
+    encoded = _lzw_encode(data)
+    expected = filters.LZWDecode.decode(encoded).encode("latin-1")
+    assert _decode(_lzw, encoded, size) == expected == data
+
+
+def _stream(data, filter_names):
+    stream = DecodedStreamObject()
+    stream._data = data
+    stream[NameObject("/Filter")] = ArrayObject(NameObject(name) for name in filter_names)
+    return stream
+
+
+def test_decoded_size_follows_filter_chains():
+    data = _random_data(0)
+    encoded = base64.a85encode(zlib.compress(data)) + b"~>"
+    stream = _stream(encoded, ["/A85", "/FlateDecode"])
+    assert _decoded_size(stream, len(data) * 2) == len(data)
+    assert len(data) // 2 < _decoded_size(stream, len(data) // 2) <= len(data)
+
+
+def test_decoded_size_of_unknown_filter_is_over_the_limit():
+    assert _decoded_size(_stream(b"\0" * 10, ["/DCTDecode"]), 100) == 101
+
+
+def _pdf(*contents):
+    """A PDF with one Helvetica page per entry of ``contents``: ``(stream data, filter names)``."""
+    pages = len(contents)
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>",
+               b"<< /Type /Pages /Kids [%s] /Count %d >>"
+               % (b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(pages)), pages),
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    for i, (data, filter_names) in enumerate(contents):
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+                       b"/Resources << /Font << /F1 3 0 R >> >> >>" % (5 + 2 * i))
+        names = b" ".join(name.encode() for name in filter_names)
+        objects.append(b"<< /Length %d /Filter [%s] >>\nstream\n" % (len(data), names) + data + b"\nendstream")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def _page(text, filler=0):
+    return b"BT /F1 12 Tf 72 700 Td (%s) Tj ET\n" % text + b" " * filler
+
+
+MAX_BYTES = 1024 * 1024
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(parsers, "MAX_DECOMPRESSED_BYTES", MAX_BYTES)
+    monkeypatch.setattr(parsers, "MAX_EXTRACTED_CHARS", 1000)
+
+
+@pytest.fixture
+def single_flate_bomb():
+    bomb = zlib.compress(_page(b"Bomb page", 8 * MAX_BYTES), 9)
+    return _pdf((zlib.compress(_page(b"Jane Doe")), ["/FlateDecode"]), (bomb, ["/FlateDecode"]))
+
+
+@pytest.fixture
+def double_flate_bomb():
+    bomb = zlib.compress(zlib.compress(_page(b"Bomb page", 64 * MAX_BYTES), 9), 9)
+    return _pdf((zlib.compress(_page(b"Jane Doe")), ["/FlateDecode"]), (bomb, ["/FlateDecode", "/FlateDecode"]))
+
+
+@pytest.mark.parametrize("backend", GUARDED_BACKENDS, ids=lambda backend: backend.name)
+@pytest.mark.parametrize("bomb", ["single_flate_bomb", "double_flate_bomb"])
+def test_bomb_page_is_not_read(limits, backend, bomb, request):
+    text, num_pages, truncated = parsers.extract_text_from_pdf(io.BytesIO(request.getfixturevalue(bomb)),
+                                                               [backend])
+    assert truncated
+    assert num_pages == 2
+    assert "Jane Doe" in text
+    assert "Bomb" not in text
+    assert len(text) <= parsers.MAX_EXTRACTED_CHARS
+
+
+@pytest.mark.parametrize("backend", GUARDED_BACKENDS, ids=lambda backend: backend.name)
+def test_text_is_capped(limits, backend):
+    pdf = _pdf(*[(zlib.compress(_page(b"Jane Doe " * 20)), ["/FlateDecode"])] * 20)
+    text, _, truncated = parsers.extract_text_from_pdf(io.BytesIO(pdf), [backend])
+    assert truncated
+    assert 0 < len(text) <= parsers.MAX_EXTRACTED_CHARS
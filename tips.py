@@ -1,4 +1,4 @@
-def generate_tips(categories, overall_score, text_lower):
+def generate_tips(categories, overall_score):
     tips = []
 
     category_scores = {c["name"]: c["percentage"] for c in categories}